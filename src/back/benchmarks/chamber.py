@@ -0,0 +1,105 @@
+"""
+Compares the llist backed Chamber with the bitmask backed BitChamber:
+memory per chamber and the latency of the operations a game goes
+through on every click.
+
+usage: python -m src.back.benchmarks.chamber [number]
+"""
+
+import timeit
+import tracemalloc
+from itertools import combinations
+
+from ..game.chamber import Chamber, HandNotStorableError
+from ..game.bit_chamber import BitChamber
+from ..game.utils import main
+
+
+# a dealt hand with a few of every combo in it
+CARDS = [1, 2, 3, 5, 6, 9, 13, 17, 21, 25, 26, 27, 28]
+
+
+def _make_chamber(chamber_class, store_hands: bool = True):
+    chamber = chamber_class(CARDS)
+    if store_hands:
+        for num_cards in range(2, 6):
+            for hand in combinations(CARDS, num_cards):
+                try:
+                    chamber.add_hand(hand)
+                except HandNotStorableError:
+                    pass
+    return chamber
+
+
+def _memory(chamber_class, store_hands: bool) -> float:
+    """
+    Average size of a chamber in KiB.
+    """
+    number = 20
+    tracemalloc.start()
+    chambers = [
+        _make_chamber(chamber_class, store_hands) for _ in range(number)
+    ]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del chambers
+    return size / number / 1024
+
+
+def _click(chamber) -> None:
+    for card in CARDS[:5]:
+        chamber.select_card(card)
+    chamber.deselect_selected()
+
+
+def _remove_and_add(chamber) -> None:
+    chamber.remove_card(28)
+    chamber.add_card(28)
+
+
+BENCHMARKS = {
+    "select/deselect 5": _click,
+    "iterate": lambda chamber: list(chamber),
+    "min/max card": (
+        lambda chamber: (chamber._get_min_card(), chamber._get_max_card())
+    ),
+    "random card": lambda chamber: chamber._get_random_card(),
+    "remove/add card": _remove_and_add,
+}
+
+
+def run(number: int = 10000) -> None:
+    classes = (Chamber, BitChamber)
+    print(f"{'memory':<20}{'Chamber':>12}{'BitChamber':>12}{'ratio':>10}")
+    for store_hands in (False, True):
+        sizes = [
+            _memory(chamber_class, store_hands) for chamber_class in classes
+        ]
+        name = "stored hands" if store_hands else "cards only"
+        print(
+            f"{name:<20}{sizes[0]:>9.2f}KiB{sizes[1]:>9.2f}KiB"
+            f"{sizes[0] / sizes[1]:>9.1f}x"
+        )
+    print(f"{'latency':<20}{'Chamber':>12}{'BitChamber':>12}{'speedup':>10}")
+    for name, benchmark in BENCHMARKS.items():
+        times = list()
+        for chamber_class in classes:
+            chamber = _make_chamber(chamber_class)
+            times.append(
+                min(
+                    timeit.repeat(
+                        lambda: benchmark(chamber), number=number, repeat=5
+                    )
+                )
+                / number
+                * 1e6
+            )
+        print(
+            f"{name:<20}{times[0]:>10.2f}us{times[1]:>10.2f}us"
+            f"{times[0] / times[1]:>9.1f}x"
+        )
+
+
+@main
+def benchmark(number: str = "10000"):
+    run(int(number))
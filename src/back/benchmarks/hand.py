@@ -0,0 +1,77 @@
+"""
+Compares the numpy backed Hand with the bitmask backed BitHand on the
+operations a card click goes through.
+
+usage: python -m src.back.benchmarks.hand [number]
+"""
+
+import timeit
+
+from ..game.hand import Hand
+from ..game.bit_hand import BitHand
+from ..game.utils import main
+
+
+# a straight being clicked together and then taken apart, which is what
+# Chamber.select_card and Chamber.deselect_card do to the current hand
+CARDS = [17, 1, 9, 13, 5]
+
+
+def _click(hand_class) -> None:
+    hand = hand_class()
+    for card in CARDS:
+        hand.add(card)
+    for card in CARDS:
+        hand.remove(card)
+
+
+def _compare(hand1, hand2) -> None:
+    hand1 < hand2
+    hand1 > hand2
+
+
+def _iterate(hand) -> None:
+    for card in hand:
+        card in hand
+
+
+BENCHMARKS = {
+    "construct": lambda hand_class: lambda: hand_class(CARDS),
+    "add/remove 5 cards": lambda hand_class: lambda: _click(hand_class),
+    "copy": (
+        lambda hand_class: lambda hand=hand_class(CARDS): hand_class.copy(hand)
+    ),
+    "compare": (
+        lambda hand_class: lambda hands=(
+            hand_class([1, 5, 9, 13, 17]),
+            hand_class([2, 6, 10, 14, 19]),
+        ): _compare(*hands)
+    ),
+    "iterate/contains": (
+        lambda hand_class: lambda hand=hand_class(CARDS): _iterate(hand)
+    ),
+}
+
+
+def run(number: int = 20000) -> None:
+    print(f"{'benchmark':<20}{'Hand':>12}{'BitHand':>12}{'speedup':>10}")
+    for name, make_benchmark in BENCHMARKS.items():
+        times = [
+            min(
+                timeit.repeat(
+                    make_benchmark(hand_class), number=number, repeat=5
+                )
+            )
+            / number
+            * 1e6
+            for hand_class in (Hand, BitHand)
+        ]
+        print(
+            f"{name:<20}{times[0]:>10.2f}us{times[1]:>10.2f}us"
+            f"{times[0] / times[1]:>9.1f}x"
+        )
+
+
+@main
+def benchmark(number: str = "20000"):
+    run(int(number))
@@ -0,0 +1,114 @@
+"""
+Compares spawn_after (a task per timer) with wheel_after (a timing
+wheel per loop) at numbers of concurrent timers: scheduling then
+cancelling them all, like turn timers that rarely run out, and
+scheduling them all to fire within a second.
+
+usage: python -m src.back.benchmarks.timers [numbers]
+"""
+
+import asyncio
+import random
+import time
+import tracemalloc
+from typing import Callable, List
+
+from ..game.utils import main
+from ..utils import spawn_after, wheel_after
+
+
+async def _noop() -> None:
+    pass
+
+
+def _cancel(timers: List) -> None:
+    for timer in timers:
+        timer.cancel()
+
+
+async def _schedule_cancel(timer: Callable, number: int) -> float:
+    start = time.perf_counter()
+    timers = [timer(5, _noop) for _ in range(number)]
+    _cancel(timers)
+    # let cancelled tasks finish
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    return time.perf_counter() - start
+
+
+async def _fire(timer: Callable, number: int) -> float:
+    """
+    Seconds until all timers have fired past the last deadline, i.e.
+    the overhead of scheduling and firing them.
+    """
+    fired = 0
+    done = asyncio.get_running_loop().create_future()
+
+    def callback():
+        nonlocal fired
+        fired += 1
+        if fired == number:
+            done.set_result(time.perf_counter())
+
+    async def coroutine_callback():
+        callback()
+
+    random.seed(0)
+    delays = [random.random() for _ in range(number)]
+    start = time.perf_counter()
+    for delay in delays:
+        # spawn_after requires coroutine functions
+        timer(
+            delay, coroutine_callback if timer is spawn_after else callback,
+        )
+    return await done - start - max(delays)
+
+
+def _memory(timer: Callable, number: int) -> float:
+    """
+    Size of number scheduled timers in KiB.
+    """
+
+    async def run():
+        tracemalloc.start()
+        timers = [timer(5, _noop) for _ in range(number)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _cancel(timers)
+        await asyncio.sleep(0)
+        return size / 1024
+
+    return asyncio.run(run())
+
+
+def run(numbers: List[int]) -> None:
+    timers = {"spawn_after": spawn_after, "wheel_after": wheel_after}
+    print(
+        f"{'timers':<10}{'':<20}{'spawn_after':>14}{'wheel_after':>14}"
+        f"{'speedup':>10}"
+    )
+    for number in numbers:
+        rows = {
+            "schedule+cancel": [
+                asyncio.run(_schedule_cancel(timer, number))
+                for timer in timers.values()
+            ],
+            "fire lag": [
+                asyncio.run(_fire(timer, number)) for timer in timers.values()
+            ],
+        }
+        for name, (spawn, wheel) in rows.items():
+            print(
+                f"{number:<10,}{name:<20}{spawn * 1e3:>12.1f}ms"
+                f"{wheel * 1e3:>12.1f}ms{spawn / wheel:>9.1f}x"
+            )
+        spawn, wheel = (_memory(timer, number) for timer in timers.values())
+        print(
+            f"{number:<10,}{'memory':<20}{spawn / 1024:>11.1f}MiB"
+            f"{wheel / 1024:>11.1f}MiB{spawn / wheel:>9.1f}x"
+        )
+
+
+@main
+def benchmark(*numbers: str):
+    run([int(number) for number in numbers] or [10000, 100000])
@@ -0,0 +1,119 @@
+"""
+Compares the latency of game actions sent to game god through Kafka with
+those sent directly, in process (see game_god.serve_directly): the p50
+and p99 of round trips of actions asked for concurrently in a number of
+games, from sending an action to getting its reply.
+
+Both modes need the game store (Redis) and kafka mode needs Kafka and a
+running game god worker too.
+
+usage: python -m src.back.benchmarks.transport [modes] [games] [actions]
+"""
+
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from typing import Any, List, Tuple
+
+from ..game.utils import main
+from ..services.game_god import (
+    GameAction,
+    Prayer,
+    ear,
+    game_action_processor,
+    serve_directly,
+)
+
+
+MODES = ("direct", "kafka")
+LOCK = -19  # an action every player can take at any time
+
+
+async def _agents(mode: str) -> Tuple[Any, Any]:
+    if mode == "direct":
+        return await serve_directly()
+    return ear, game_action_processor
+
+
+async def _pray(ear_: Any, game_id: str, prayer: str, **kwargs) -> Any:
+    return await ear_.ask(
+        key=game_id, value=Prayer(prayer=prayer, prayer_kwargs=kwargs)
+    )
+
+
+async def _play(processor: Any, game_id: str, number: int) -> List[float]:
+    """
+    Round trip times of number actions, sent one after the other.
+    """
+    latencies: List[float] = list()
+    for _ in range(number):
+        start = time.perf_counter()
+        await processor.ask(
+            key=game_id,
+            value=GameAction(
+                game_id=game_id,
+                action=LOCK,
+                timestamp=datetime.utcnow(),
+                sid=f"{game_id}-sid",
+            ),
+        )
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _run(mode: str, num_games: int, num_actions: int) -> List[float]:
+    ear_, processor = await _agents(mode)
+    game_ids = [f"benchmark-{mode}-{i}" for i in range(num_games)]
+    for game_id in game_ids:
+        await _pray(
+            ear_,
+            game_id,
+            "add_game",
+            game_id=game_id,
+            name=game_id,
+            turn_time=30,
+            reserve_time=60,
+            trading_time=60,
+            giving_time=10,
+        )
+        await _pray(
+            ear_,
+            game_id,
+            "add_player",
+            game_id=game_id,
+            user_id=game_id,
+            sid=f"{game_id}-sid",
+            username="benchmark",
+        )
+    try:
+        latencies = await asyncio.gather(
+            *(_play(processor, game_id, num_actions) for game_id in game_ids)
+        )
+    finally:
+        # games are removed with their last player
+        for game_id in game_ids:
+            await _pray(ear_, game_id, "remove_player", sid=f"{game_id}-sid")
+    return [latency for game in latencies for latency in game]
+
+
+async def run(modes: List[str], num_games: int, num_actions: int) -> None:
+    # a single loop, as game god's state is bound to the loop it runs in
+    print(f"{num_games:,} games, {num_actions:,} actions each")
+    print(f"{'mode':<10}{'p50':>10}{'p99':>10}")
+    for mode in modes:
+        latencies = await _run(mode, num_games, num_actions)
+        percentiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{mode:<10}{percentiles[49] * 1e3:>8.2f}ms"
+            f"{percentiles[98] * 1e3:>8.2f}ms"
+        )
+
+
+@main
+def benchmark(*args: str):
+    modes = [arg for arg in args if arg in MODES] or list(MODES)
+    num_games, num_actions = (
+        [int(arg) for arg in args if arg not in MODES] + [100, 100]
+    )[:2]
+    asyncio.run(run(modes, num_games, num_actions))
@@ -0,0 +1,212 @@
+"""
+Append-only logs of the actions taken in games, e.g. to recover games
+or to reproduce bugs by replaying them; see Game.action_log and replay.
+
+A log is a header with the game's seed and settings followed by its
+entries, each the action's code (its index in ACTIONS), the time the
+action was taken at (see Game._time) and the action's arguments, in the
+order of their names in ACTIONS however the action was called. The
+seed decides the deals and the spots players are added to, so a game's
+seed, actions and their times decide everything about it.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .frozen_hand import FrozenHand
+from .utils import cards_mask, mask_cards
+
+
+VERSION = 1
+# the logged actions, the struct formats of their arguments and the
+# names of those arguments; formats are None for actions with arguments
+# laid out by ActionLog itself
+ACTIONS: Tuple[Tuple[str, Optional[str], Tuple[str, ...]], ...] = (
+    ("add_player", None, ("name",)),
+    ("remove_player", "B", ("spot",)),
+    # setup, testing and the deck's card masks
+    ("start_round", None, ("setup", "deck", "testing")),
+    ("pause", "", ()),
+    ("resume", "", ()),
+    ("add_or_remove_card", "BB", ("spot", "card")),
+    ("store_hand", "B", ("spot",)),
+    # spot and the hand's 5 cards
+    ("remove_stored_hand", None, ("spot", "hand")),
+    ("maybe_unlock_play", "B", ("spot",)),
+    ("maybe_play_current_hand", "B", ("spot",)),
+    ("maybe_unlock_pass_turn", "B", ("spot",)),
+    ("maybe_pass_turn", "B", ("spot",)),
+    ("maybe_set_selected_asking_option", "BB", ("spot", "value")),
+    ("maybe_unlock_ask", "B", ("spot",)),
+    ("ask_for_card", "B", ("spot",)),
+    ("maybe_unlock_give", "B", ("spot",)),
+    ("give_card", "B", ("spot",)),
+    ("lock", "B", ("spot",)),
+    ("_handle_playing_timeout", "B", ("spot",)),
+    ("_handle_giving_timeout", "B", ("spot",)),
+    ("_handle_trading_timeout", "", ()),
+)
+ACTION_CODES: Dict[str, int] = {
+    name: code for code, (name, _, _) in enumerate(ACTIONS)
+}
+
+_HEADER = struct.Struct("<BQ4d")  # version, seed and the game's times
+_ENTRY = struct.Struct("<Bd")  # action code and time
+_ARGS: List[Optional[struct.Struct]] = [
+    None if format_ is None else struct.Struct(f"<{format_}")
+    for _, format_, _ in ACTIONS
+]
+_START_ROUND = struct.Struct("<??4Q")  # masks are 0 if no deck is given
+_STORED_HAND = struct.Struct("<B5B")
+_LENGTH = struct.Struct("<H")
+
+
+class ActionLogError(RuntimeError):
+    pass
+
+
+class LoggedAction(NamedTuple):
+    time: float
+    name: str
+    # by name, so actions are replayed with action(**arguments)
+    arguments: Dict[str, Any]
+
+
+class ActionLog:
+    """
+    Compact, append-only log of a game's actions; see the module's
+    docstring for the layout. bytes(log) is the whole log, so a log can
+    be stored by appending the bytes added since it was last stored
+    (see tail) and read back with from_bytes.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        turn_time: float,
+        reserve_time: float,
+        trading_time: float,
+        giving_time: float,
+    ) -> None:
+        self.seed: int = seed
+        self.settings: Dict[str, float] = {
+            "turn_time": turn_time,
+            "reserve_time": reserve_time,
+            "trading_time": trading_time,
+            "giving_time": giving_time,
+        }
+        self._data: bytearray = bytearray(
+            _HEADER.pack(
+                VERSION,
+                seed,
+                turn_time,
+                reserve_time,
+                trading_time,
+                giving_time,
+            )
+        )
+        self.num_actions: int = 0
+
+    def __len__(self) -> int:
+        """
+        Size of the log in bytes.
+        """
+        return len(self._data)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self._data)
+
+    def tail(self, offset: int) -> bytes:
+        """
+        Bytes of the log from offset on, e.g. those added since it was
+        last stored.
+        """
+        return bytes(self._data[offset:])
+
+    def append(
+        self, name: str, time: float, arguments: Dict[str, Any]
+    ) -> None:
+        """
+        Logs a call of the action with its arguments by name, however it
+        was called, e.g. as bound by inspect.Signature.bind with their
+        defaults applied; only the arguments named in ACTIONS are logged.
+        """
+        code: int = ACTION_CODES[name]
+        args_struct: Optional[struct.Struct] = _ARGS[code]
+        # packed before anything is added, so a call whose arguments
+        # cannot be logged leaves the log as it was
+        entry: bytes = _ENTRY.pack(code, time)
+        if args_struct is not None:
+            entry += args_struct.pack(
+                *(int(arguments[key]) for key in ACTIONS[code][2])
+            )
+        elif name == "add_player":
+            encoded: bytes = arguments["name"].encode()
+            entry += _LENGTH.pack(len(encoded)) + encoded
+        elif name == "start_round":
+            deck = arguments.get("deck")
+            entry += _START_ROUND.pack(
+                arguments["setup"],
+                arguments.get("testing", False),
+                *((0,) * 4 if deck is None else map(cards_mask, deck)),
+            )
+        else:  # remove_stored_hand
+            entry += _STORED_HAND.pack(
+                arguments["spot"], *FrozenHand(arguments["hand"])[:5]
+            )
+        self._data += entry
+        self.num_actions += 1
+
+    def __iter__(self) -> Iterator[LoggedAction]:
+        return self.actions_from(_HEADER.size)
+
+    def actions_from(self, offset: int) -> Iterator[LoggedAction]:
+        """
+        Actions logged from offset on, where offset is a size the log had
+        (e.g. when a checkpoint was taken; see EmittingGameCheckpoint).
+        """
+        data: bytearray = self._data
+        offset = max(offset, _HEADER.size)
+        while offset < len(data):
+            code, time = _ENTRY.unpack_from(data, offset)
+            offset += _ENTRY.size
+            name, _, keys = ACTIONS[code]
+            values: tuple
+            args_struct: Optional[struct.Struct] = _ARGS[code]
+            if args_struct is not None:
+                values = args_struct.unpack_from(data, offset)
+                offset += args_struct.size
+            elif name == "add_player":
+                (length,) = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                values = (data[offset : offset + length].decode(),)
+                offset += length
+            elif name == "start_round":
+                setup, testing, *masks = _START_ROUND.unpack_from(data, offset)
+                offset += _START_ROUND.size
+                deck = (
+                    [list(mask_cards(mask)) for mask in masks]
+                    if any(masks)
+                    else None
+                )
+                values = (setup, deck, testing)
+            else:  # remove_stored_hand
+                spot, *cards = _STORED_HAND.unpack_from(data, offset)
+                offset += _STORED_HAND.size
+                values = (spot, FrozenHand(cards))
+            yield LoggedAction(time, name, dict(zip(keys, values)))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> ActionLog:
+        version: Optional[int] = data[0] if data else None
+        if version != VERSION:
+            raise ActionLogError(
+                f"cannot read action log of version {version}"
+            )
+        _, seed, *times = _HEADER.unpack_from(data)
+        log: ActionLog = cls(seed, *times)
+        log._data = bytearray(data)
+        log.num_actions = sum(1 for _ in log)
+        return log
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Collection, Dict, Iterator, Optional, Union
+from random import randrange
+
+from .bit_hand import BitHand
+from .chamber import (
+    Chamber,
+    ChamberSnapshot,
+    HandNode,
+    HandNodeDLList,
+    COMBOS,
+)
+from .frozen_hand import FrozenHand
+from .hand import CardNotInHandError
+from .utils import cards_mask, mask_cards
+
+
+class BitChamber(Chamber):
+    """
+    Alternative Chamber backend with the same public API as Chamber.
+    Instead of a 53 slot object array of HandPointerDLLists, the cards
+    in the chamber, the selected cards (i.e. the current hand, which is
+    a BitHand) and each stored hand are int masks (card c is bit c - 1),
+    so card membership, iteration and the min/max/random card are bit
+    operations rather than loops over all 52 cards.
+
+    Stored hands are still kept in order in the combo HandNodeDLLists
+    and indexed by their key and, like Chamber's per card lists, by
+    their cards; their HandNodes also keep their mask. The number of
+    selected cards in a stored hand is not counted on its HandNode but
+    derived from the masks, see _num_cards_selected.
+    """
+
+    def _init_storage(self, cards: Optional[Collection[int]]) -> None:
+        self.hand: BitHand = BitHand()
+        self._mask: int = 0
+        self.num_cards: int = 0
+        # stored hand key (i.e. hash(hand)) to its HandNode
+        self._hand_index: Dict[int, HandNode] = dict()
+        # card to the stored hands with it, by key; only cards in stored
+        # hands have an entry
+        self._card_hands: Dict[int, Dict[int, HandNode]] = dict()
+        self._num_hands: int = 0
+        if cards:
+            for card in cards:
+                self._mask |= 1 << (int(card) - 1)
+            self.num_cards = len(cards)
+        self.doubles: HandNodeDLList = HandNodeDLList()
+        self.triples: HandNodeDLList = HandNodeDLList()
+        self.fullhouses: HandNodeDLList = HandNodeDLList()
+        self.straights: HandNodeDLList = HandNodeDLList()
+        self.bombs: HandNodeDLList = HandNodeDLList()
+
+    def __contains__(self, card_or_hand: Union[int, Collection[int]]) -> bool:
+        # card
+        if not isinstance(card_or_hand, Collection):
+            return bool(self._mask >> (int(card_or_hand) - 1) & 1)
+        # hand
+        else:
+            return super().__contains__(card_or_hand)
+
+    def __iter__(self) -> Iterator[int]:
+        mask = self._mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length()
+            mask ^= low
+
+    def __repr__(self) -> str:
+        return "BitChamber"
+
+    def reset(self) -> None:
+        self.hand.reset()
+        self._mask = 0
+        self.num_cards = 0
+        self.clear_hands()
+
+    def add_card(self, card: int, *, check: bool = True) -> None:
+        if check:
+            self._check_card_not_in(card)
+        self._mask |= 1 << (int(card) - 1)
+        self.num_cards += 1
+
+    def remove_card(self, card: int, *, check: bool = True) -> None:
+        if check:
+            self._check_card_in(card)
+
+        # Cards that are to be removed will not always be in the current
+        # hand, i.e. during trading
+        try:
+            self.hand.remove(card)
+        except CardNotInHandError:
+            pass
+
+        for hand_node in list(self._card_hands.get(int(card), {}).values()):
+            self._remove_hand_node(hand_node)
+        self._mask ^= 1 << (int(card) - 1)
+        self.num_cards -= 1
+
+    def _add_hand_helper(
+        self, hand: FrozenHand, hand_node_class: HandNode, **hnc_kwargs
+    ) -> None:
+        hand_node: HandNode = hand_node_class(hand, list(), **hnc_kwargs)
+        hand_node.mask = cards_mask(hand)
+        getattr(self, f"{hand.id_str}s").add(hand_node)
+        self._index_hand_node(hand_node)
+        for card in mask_cards(hand_node.mask):
+            self._card_hands.setdefault(card, dict())[hash(hand)] = hand_node
+
+    def _remove_hand_node(self, hand_node: HandNode) -> None:
+        self._unindex_hand_node(hand_node)
+        hand_node.owner().remove(hand_node)
+        key: int = hash(hand_node.value)
+        for card in mask_cards(hand_node.mask):
+            card_hands: Dict[int, HandNode] = self._card_hands[card]
+            del card_hands[key]
+            if not card_hands:
+                del self._card_hands[card]
+
+    def _card_hand_nodes(self, card: int) -> Iterator[HandNode]:
+        """
+        The stored hands with the card, in the order they were stored.
+        """
+        return iter(self._card_hands.get(int(card), {}).values())
+
+    def _num_cards_selected(self, hand_node: HandNode) -> int:
+        return bin(hand_node.mask & self.hand._mask).count("1")
+
+    def snapshot(self) -> ChamberSnapshot:
+        return ChamberSnapshot(
+            self._mask,
+            self.hand._mask,
+            tuple(hand_node.value for hand_node in self._hand_nodes),
+        )
+
+    def _select_card(self, card: int) -> None:
+        self.hand.add(card)
+
+    def deselect_card(self, card: int, check: bool = True) -> None:
+        if check:
+            self._check_card_in(card)
+        self.hand.remove(card)
+
+    def clear_hands(self) -> None:
+        for combo in COMBOS:
+            getattr(self, f"{combo}s").clear()
+        self._hand_index.clear()
+        self._card_hands.clear()
+        self._num_hands = 0
+
+    def _get_min_card(self) -> int:
+        return (self._mask & -self._mask).bit_length() or None
+
+    def _get_max_card(self) -> int:
+        return self._mask.bit_length() or None
+
+    def _get_random_card(self) -> int:
+        mask = self._mask
+        for _ in range(randrange(0, self.num_cards)):
+            mask &= mask - 1  # drop the lowest card
+        return (mask & -mask).bit_length()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from numbers import Integral
+from typing import Iterable, Iterator, List, Union
+
+from .hand import (
+    Hand,
+    hand_table,
+    CardNotInHandError,
+    DuplicateCardError,
+    FullHandError,
+)
+from .utils import (
+    mask_hand_key,
+    card_names,
+    combo_ids,
+    STRENGTH_CLASS_SHIFT,
+)
+
+
+class BitHand:
+    """
+    Alternative Hand backend with the same public API as Hand. Instead
+    of a 5 slot numpy array that is shifted on every addition and
+    removal, the cards are stored as the set bits of a single int (card
+    c is bit c - 1) and the id is cached alongside it, so selecting and
+    deselecting a card is a couple of int operations rather than numpy
+    scalar arithmetic.
+
+    Indexing (e.g. hand[4]) keeps Hand's zero-padded, sorted layout so
+    game code that picks out particular cards works with either backend.
+
+    No support for hands with more than 5 cards.
+    """
+
+    __slots__ = ("_mask", "_id", "_num_cards", "_strength")
+
+    def __init__(self, cards: Iterable[int] = None) -> None:
+        self._mask: int = 0
+        self._id: int = 0
+        self._num_cards: int = 0
+        self._strength: int = 0
+        if cards is None:  # default constructor; empty hand
+            return
+        # testing constructor (i.e. BitHand([...])); same requirements
+        # as Hand's: length <= 5, ints between 0 and 52 inclusive,
+        # non-zero values must be unique
+        cards = list(cards)
+        assert len(cards) <= 5, "hands can have up to 5 cards"
+        filtered: List[int] = [card for card in cards if card != 0]
+        assert all(
+            isinstance(card, Integral) and 1 <= card <= 52 for card in filtered
+        ), "cards must be ints between 0 and 52 inclusive"
+        assert len(filtered) == len(set(filtered)), "cards must be unique"
+        for card in filtered:
+            self._mask |= 1 << (int(card) - 1)
+        self._num_cards = len(filtered)
+        self._identify()
+
+    @classmethod
+    def copy(cls, hand: BitHand) -> BitHand:
+        copied = cls.__new__(cls)
+        copied._mask = hand._mask
+        copied._id = hand._id
+        copied._num_cards = hand._num_cards
+        copied._strength = hand._strength
+        return copied
+
+    @classmethod
+    def from_mask(cls, mask: int) -> BitHand:
+        hand = cls.__new__(cls)
+        hand._mask = mask
+        hand._num_cards = bin(mask).count("1")
+        assert hand._num_cards <= 5, "hands can have up to 5 cards"
+        hand._identify()
+        return hand
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, List[int]]:
+        # highest card; by far the most used index (singles, doubles,
+        # straights and giving)
+        if index == 4 or index == -1:
+            return self._mask.bit_length()
+        if isinstance(index, slice):
+            return self._padded()[index]
+        if index < 0:
+            index += 5
+        # padded layout; the first 5 - num_cards slots are empty
+        nth = index - 5 + self._num_cards
+        if not 0 <= nth < self._num_cards:
+            if 0 <= index < 5:
+                return 0
+            raise IndexError("hand index out of range")
+        mask = self._mask
+        for _ in range(nth):
+            mask &= mask - 1  # drop the lowest card
+        return (mask & -mask).bit_length()
+
+    def __hash__(self) -> int:
+        # same hash as Hand so both backends key the same hand the same
+        # way (e.g. the monitor's hand plays)
+        return mask_hand_key(self._mask)
+
+    def __contains__(self, card: int) -> bool:
+        assert 1 <= card <= 52, "invalid card cannot be in hand."
+        return bool(self._mask >> (int(card) - 1) & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        mask = self._mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length()
+            mask ^= low
+
+    def __str__(self) -> str:
+        to_join = [card_names[card] for card in self]
+        return " ".join(to_join) + f": {self.id_desc}"
+
+    def __repr__(self) -> str:
+        return (
+            f"<BitHand {id(self)}; cards: {self.to_list()}; id: {self._id};"
+            f" mask: {self._mask:#x}>"
+        )
+
+    def __len__(self) -> int:
+        return self._num_cards
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BitHand):
+            return self._mask == other._mask
+        if isinstance(other, Hand):
+            return self.to_list() == other.to_list()
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        if not isinstance(other, (BitHand, Hand)):
+            return NotImplemented
+        return not self == other
+
+    # comparability rules and the properties only depend on the id and
+    # the padded indexing, both of which are shared with Hand
+    _is_comparable = Hand._is_comparable
+    __lt__ = Hand.__lt__
+    __gt__ = Hand.__gt__
+    __le__ = Hand.__le__
+    __ge__ = Hand.__ge__
+
+    is_empty = Hand.is_empty
+    is_single = Hand.is_single
+    is_double = Hand.is_double
+    is_triple = Hand.is_triple
+    is_fullhouse = Hand.is_fullhouse
+    is_straight = Hand.is_straight
+    is_bomb = Hand.is_bomb
+    is_valid = Hand.is_valid
+    strength = Hand.strength
+    id_desc = Hand.id_desc
+    id_str = Hand.id_str
+
+    @property
+    def is_full(self) -> bool:
+        return self._num_cards == 5
+
+    def reset(self) -> None:
+        self._mask = 0
+        self._id = 0
+        self._num_cards = 0
+        self._strength = 0
+
+    def to_list(self) -> List[int]:
+        return list(self)
+
+    def _padded(self) -> List[int]:
+        return [0] * (5 - self._num_cards) + list(self)
+
+    def _identify(self) -> None:
+        self._strength = strength = hand_table[mask_hand_key(self._mask)]
+        if strength:
+            self._id = combo_ids[strength >> STRENGTH_CLASS_SHIFT]
+        else:
+            self._id = self._num_cards * 10
+
+    def add(self, card: int) -> None:
+        assert 1 <= card <= 52, "attempting to add invalid card."
+        # cards can come in as numpy ints, e.g. from a dealt deck
+        bit = 1 << (int(card) - 1)
+        if self._mask & bit:
+            raise DuplicateCardError(f"{card} already in hand.")
+        if self._num_cards == 5:
+            raise FullHandError("cannot add any more cards to this hand.")
+        self._mask |= bit
+        self._num_cards += 1
+        self._identify()
+
+    def remove(self, card: int) -> None:
+        if self._id == 0:
+            raise CardNotInHandError(
+                "attempting to remove from an empty hand."
+            )
+        bit = 1 << (int(card) - 1)
+        if not self._mask & bit:
+            raise CardNotInHandError(
+                f"attempting to remove card ({card}) which is not in hand."
+            )
+        self._mask ^= bit
+        self._num_cards -= 1
+        self._identify()
@@ -1,12 +1,35 @@
 from __future__ import annotations
 
-from typing import List, Collection, Optional, Iterator, Iterable, Union, Type
+from typing import (
+    List,
+    Collection,
+    Dict,
+    Optional,
+    Iterator,
+    Iterable,
+    NamedTuple,
+    Tuple,
+    Union,
+    Type,
+)
 import numpy as np
+from copy import copy
 from llist import dllistnode
 from random import randrange
+from bisect import bisect_left, bisect_right
+from itertools import combinations, product
 
 from . import Hand, CardNotInHandError, DuplicateCardError, FullHandError
-from .utils import IterNodesDLList, id_desc_dict
+from .bit_hand import BitHand
+from .frozen_hand import FrozenHand
+from .utils import (
+    IterNodesDLList,
+    id_desc_dict,
+    hand_key,
+    cards_mask,
+    mask_cards,
+    HAND_TABLE_SIZE,
+)
 
 
 # TODO: make high quality representation of what is going on
@@ -32,6 +55,13 @@ class Chamber:
     """
 
     def __init__(self, cards: Collection[int] = None) -> None:
+        self._init_storage(cards)
+
+    def _init_storage(self, cards: Optional[Collection[int]]) -> None:
+        """
+        Makes new (i.e. unshared) storage holding the given cards and no
+        hands; see restore.
+        """
         self.hand: Hand = Hand()
         self._cards: np.ndarray[Optional[HandPointerDLList]] = np.full(
             shape=53, fill_value=None, dtype=np.object
@@ -41,6 +71,9 @@ class Chamber:
             for card in cards:
                 self._cards[card] = HandPointerDLList(card)
             self.num_cards = len(cards)
+        # stored hand key (i.e. hash(hand)) to its HandNode
+        self._hand_index: Dict[int, HandNode] = dict()
+        self._num_hands: int = 0
         self.doubles: HandNodeDLList = HandNodeDLList()
         self.triples: HandNodeDLList = HandNodeDLList()
         self.fullhouses: HandNodeDLList = HandNodeDLList()
@@ -53,49 +86,13 @@ class Chamber:
             for hand_node in getattr(self, f"{combo}s").iter_nodes():
                 yield hand_node
 
-    @property
-    def _num_hands(self):
-        return sum(
-            getattr(self, f"{desc}").size
-            for desc in [
-                "doubles",
-                "triples",
-                "fullhouses",
-                "straights",
-                "bombs",
-            ]
-        )
-
     def __contains__(self, card_or_hand: Union[int, Collection[int]]) -> bool:
         # card
         if not isinstance(card_or_hand, Collection):
             return self._cards[card_or_hand] is not None
         # hand
         else:
-            # no hands or not all cards in hand in chamber
-            if self._num_hands == 0 or not all(
-                card in self for card in card_or_hand
-            ):
-                return False
-
-            card_w_least_hands = min(
-                list(card_or_hand), key=lambda card: self._cards[card].size
-            )
-            for hand_node in self._cards[card_w_least_hands]:
-                hand_pointer_nodes = hand_node.hand_pointer_nodes
-                # don't need to check HandNodes storing off-length hands
-                if len(card_or_hand) != len(hand_pointer_nodes):
-                    continue
-                # if cards in HandNode match hand, then hand is in chamber;
-                # else move onto the next HandNode
-                elif all(
-                    card == hand_pointer_node.owner().card
-                    for card, hand_pointer_node in zip(
-                        card_or_hand, hand_pointer_nodes
-                    )
-                ):
-                    return True
-            return False
+            return _hand_key(card_or_hand) in self._hand_index
 
     @property
     def cards(self):
@@ -120,6 +117,8 @@ class Chamber:
         self.num_cards = 0
         for combo in COMBOS:
             getattr(self, f"{combo}s").clear()
+        self._hand_index.clear()
+        self._num_hands = 0
 
     # check argument should not be used outside of this class; is there
     # any way to enforce this? TODO
@@ -167,6 +166,7 @@ class Chamber:
                     # hand_pointer_node's corresponding
                     # HandPointerDLList
                     hand_pointer_node.owner().remove(hand_pointer_node)
+            self._unindex_hand_node(hand_node)
             hand_node.owner().remove(hand_node)
         # remove only reference to HandPointerDLList
         self._cards[card] = None
@@ -177,11 +177,11 @@ class Chamber:
         for card in cards:
             self.remove_card(card, check=False)  # already checked
 
-    def _hand_check(self, hand) -> Hand:
+    def _hand_check(self, hand) -> FrozenHand:
         """
-        Makes sure hand can be added and returns the hand
+        Makes sure hand can be added and returns the interned hand
         """
-        if not isinstance(hand, Hand):
+        if not isinstance(hand, (Hand, BitHand, FrozenHand)):
             hand = Hand(hand)
         # TODO: this should be a permitted presidents error
         if not hand.is_valid:
@@ -189,13 +189,70 @@ class Chamber:
         # TODO: this should be an unpermitted presidents error
         if hand in self:
             raise HandAlreadyStoredError(f"hand {str(hand)} already stored")
-        return hand
+        return FrozenHand(hand)
 
     def add_hand(self, hand: Collection[int]) -> None:
-        hand = self._hand_check(hand)
+        frozen_hand = self._hand_check(hand)
         if hand is self.hand:
-            self.deselect_cards(hand)
-        self._add_hand_helper(hand, HandNode)
+            self.deselect_cards(frozen_hand)
+        self._add_hand_helper(frozen_hand, HandNode)
+
+    def enumerate_combos(self, store: bool = False) -> List[FrozenHand]:
+        """
+        Every valid combo (doubles, triples, fullhouses, straights and
+        bombs, in that order) that can be made from the cards in the
+        chamber, built from the cards of each rank rather than by
+        identifying every combination of cards.
+
+        If store, also stores the combos that are not already stored
+        and, if cards are selected, that have every selected card, i.e.
+        the combos the selection can be completed to; they are known to
+        be valid and the duplicate check is a lookup in the hand index,
+        so this skips _hand_check. Their stored hands count the selected
+        cards in them, as if those cards were selected after storing.
+        """
+        # cards of each rank; card c has rank (c - 1) // 4
+        ranks: List[List[int]] = [list() for _ in range(13)]
+        for card in self:
+            ranks[(card - 1) // 4].append(card)
+        doubles = [
+            double for cards in ranks for double in combinations(cards, 2)
+        ]
+        triples = [
+            triple for cards in ranks for triple in combinations(cards, 3)
+        ]
+        fullhouses = [
+            triple + double
+            for triple in triples
+            for double in doubles
+            # the double cannot be of the triple's rank
+            if (triple[0] - 1) // 4 != (double[0] - 1) // 4
+        ]
+        straights = [
+            straight
+            for i in range(9)
+            for straight in product(*ranks[i : i + 5])
+        ]
+        bombs = [
+            tuple(cards) + (card,)
+            for cards in ranks
+            if len(cards) == 4
+            for card in self
+            if card not in cards
+        ]
+        combos = [
+            FrozenHand(cards)
+            for combo in (doubles, triples, fullhouses, straights, bombs)
+            for cards in combo
+        ]
+        if store:
+            selected: List[int] = self.hand.to_list()
+            for hand in combos:
+                if hash(hand) not in self._hand_index and all(
+                    card in hand for card in selected
+                ):
+                    self._add_hand_helper(hand, HandNode)
+        return combos
 
     def _add_hand_helper(
         self, hand, hand_node_class: HandNode, **hnc_kwargs
@@ -216,11 +273,91 @@ class Chamber:
             hand_pointer_nodes.append(hand_pointer_node)
             # appending node to HandPointerDLList
             self._cards[card].appendnode(hand_pointer_node)
+            # the hand's cards may already be selected
+            if card in self.hand:
+                hand_node.increment_num_selected_cards()
         getattr(self, f"{hand.id_str}s").add(hand_node)
+        self._index_hand_node(hand_node)
+
+    def remove_hand(self, hand: Collection[int]) -> None:
+        """
+        Removes a stored hand.
+        """
+        try:
+            hand_node: HandNode = self._hand_index[_hand_key(hand)]
+        except KeyError:
+            raise HandNotStoredError(f"hand {str(hand)} not stored")
+        self._remove_hand_node(hand_node)
+
+    def _remove_hand_node(self, hand_node: HandNode) -> None:
+        for hand_pointer_node in hand_node.hand_pointer_nodes:
+            hand_pointer_node.owner().remove(hand_pointer_node)
+        self._unindex_hand_node(hand_node)
+        hand_node.owner().remove(hand_node)
+
+    def _index_hand_node(self, hand_node: HandNode) -> None:
+        self._hand_index[hash(hand_node.value)] = hand_node
+        self._num_hands += 1
+
+    def _unindex_hand_node(self, hand_node: HandNode) -> None:
+        del self._hand_index[hash(hand_node.value)]
+        self._num_hands -= 1
+
+    def snapshot(self) -> ChamberSnapshot:
+        return ChamberSnapshot(
+            cards_mask(self),
+            cards_mask(self.hand),
+            tuple(hand_node.value for hand_node in self._hand_nodes),
+        )
+
+    def restore(self, snapshot: ChamberSnapshot) -> None:
+        """
+        Sets the chamber's cards, stored hands and selection to those of
+        the snapshot. The storage is made anew rather than reset so that
+        chambers copied from one another (see clone) share none of it.
+
+        Nothing is emitted and hands are stored in plain HandNodes, i.e.
+        restoring is meant for simulation and recovery, not for chambers
+        backing a client.
+        """
+        self._init_storage(list(mask_cards(snapshot.cards)))
+        # snapshot hands are interned and already in order
+        for hand in snapshot.hands:
+            self._add_hand_helper(hand, HandNode)
+        for card in mask_cards(snapshot.selected):
+            self._select_card(card)
+
+    def clone(self) -> Chamber:
+        """
+        Copy of the chamber that shares no mutable state with it (other
+        than, for emitting chambers, the server and sid).
+        """
+        chamber: Chamber = copy(self)
+        chamber.restore(self.snapshot())
+        return chamber
+
+    def min_hand_beating(self, hand: Hand) -> Optional[FrozenHand]:
+        """
+        Weakest stored hand that can be played on the given hand, i.e.
+        the weakest stronger hand of the same combo or, failing that,
+        the weakest stronger bomb; None if there is no such hand.
+        """
+        assert hand.is_valid, "stored hands can only beat valid hands"
+        hand_node: Optional[HandNode] = None
+        if not hand.is_single and not hand.is_bomb:
+            hand_node = getattr(self, f"{hand.id_str}s").min_beating(
+                hand._strength
+            )
+        if hand_node is None:
+            hand_node = self.bombs.min_beating(hand._strength)
+        return hand_node.value if hand_node is not None else None
 
     def select_card(self, card: int, check: bool = True) -> None:
         if check:
             self._check_card_in(card)
+        self._select_card(card)
+
+    def _select_card(self, card: int) -> None:
         self.hand.add(card)
         # self._cards[card] is a HandPointerDLList; iterating through
         # it, via the class' own __iter__ (which iterates through the
@@ -259,7 +396,10 @@ class Chamber:
 
     def clear_hands(self) -> None:
         self._reset_card_dllists()
-        self._hands.clear()
+        for combo in COMBOS:
+            getattr(self, f"{combo}s").clear()
+        self._hand_index.clear()
+        self._num_hands = 0
 
     def _reset_card_dllists(self) -> None:
         for card in self:
@@ -322,32 +462,57 @@ class HandPointerNode(dllistnode):
 
 class HandNodeDLList(IterNodesDLList):
     """
-    By default, can only store a single combo type. Insertions done
-    right to left for constant time insertions made by bots who
-    construct combos from lowest to greatest cards.
+    By default, can only store a single combo type. Kept in order of
+    hand strength (ties broken by hand key) so the weakest and strongest
+    hands are the first and last nodes.
+
+    Alongside the linked list, the sort keys and nodes are kept in
+    sorted python lists which are bisected to find where to insert or
+    remove a node and which stored hands beat a given one.
     """
 
     def __init__(self, id_: int = None):
         self._id = id_
+        self._sort_keys: List[int] = list()
+        self._nodes: List[HandNode] = list()
 
     def __repr__(self) -> str:
         return "HandNodeDLList"
 
     def add(self, hand_node):
         """
-        Adds hand node to list while maintaining order. Insertions done
-        right to left.
+        Adds hand node to list while maintaining order.
         """
         assert not self._id or hand_node.value._id == self._id
-        # find ordered insertion spot right to left
-        prev = None
-        curr = self.last
-        while curr is not None and curr.value > hand_node.value:
-            curr, prev = curr.prev, curr  # prev is new curr's next...
-        if not prev:  # greatest
+        sort_key = _sort_key(hand_node.value)
+        i = bisect_right(self._sort_keys, sort_key)
+        if i == len(self._nodes):  # greatest
             self.appendnode(hand_node)
         else:
-            self.insertnode(hand_node, prev)
+            self.insertnode(hand_node, self._nodes[i])
+        self._sort_keys.insert(i, sort_key)
+        self._nodes.insert(i, hand_node)
+
+    def remove(self, hand_node):
+        i = bisect_left(self._sort_keys, _sort_key(hand_node.value))
+        assert self._nodes[i] is hand_node, "hand node not in this list"
+        del self._sort_keys[i]
+        del self._nodes[i]
+        return super().remove(hand_node)
+
+    def clear(self) -> None:
+        super().clear()
+        self._sort_keys.clear()
+        self._nodes.clear()
+
+    def min_beating(self, strength: int) -> Optional[HandNode]:
+        """
+        Weakest stored hand node stronger than the given strength, if
+        any; whether it can actually be played on the hand with that
+        strength depends on the ids, see Chamber.min_hand_beating.
+        """
+        i = bisect_left(self._sort_keys, (strength + 1) * HAND_TABLE_SIZE)
+        return self._nodes[i] if i < len(self._nodes) else None
 
 
 class HandNode(dllistnode):
@@ -358,11 +523,9 @@ class HandNode(dllistnode):
     """
 
     def __init__(
-        self, hand: Hand, hand_pointer_nodes: List[HandPointerNode]
+        self, hand: FrozenHand, hand_pointer_nodes: List[HandPointerNode]
     ) -> None:
-        super().__init__(
-            hand
-        )  # hand object is the value  # TODO: don't store hand objects on hand node
+        super().__init__(hand)  # interned hand is the value
         self.hand_pointer_nodes = hand_pointer_nodes
         self._num_cards_selected: int = 0
 
@@ -370,13 +533,8 @@ class HandNode(dllistnode):
         return "HandNode"
 
     @property
-    def hand(self):
-        return Hand(
-            [
-                hand_pointer_node.owner().card
-                for hand_pointer_node in self.hand_pointer_nodes
-            ]
-        )
+    def hand(self) -> FrozenHand:
+        return self.value
 
     def increment_num_selected_cards(self) -> None:
         self._num_cards_selected += 1
@@ -385,6 +543,18 @@ class HandNode(dllistnode):
         self._num_cards_selected -= 1
 
 
+class ChamberSnapshot(NamedTuple):
+    """
+    Compact, immutable copy of a chamber's state; see Chamber.snapshot.
+    Card sets are int masks (card c is bit c - 1) and the stored hands,
+    which are interned, are in the order the chamber keeps them in.
+    """
+
+    cards: int
+    selected: int
+    hands: Tuple[FrozenHand, ...]
+
+
 class CardAlreadyInChamberError(RuntimeError):
     pass
 
@@ -399,3 +569,19 @@ class HandAlreadyStoredError(RuntimeError):
 
 class HandNotStorableError(RuntimeError):
     pass
+
+
+class HandNotStoredError(RuntimeError):
+    pass
+
+
+def _sort_key(hand: FrozenHand) -> int:
+    # hand keys are less than HAND_TABLE_SIZE
+    return hand._strength * HAND_TABLE_SIZE + hash(hand)
+
+
+def _hand_key(hand: Collection[int]) -> int:
+    # hands hash to their key
+    if isinstance(hand, (Hand, BitHand, FrozenHand)):
+        return hash(hand)
+    return hand_key(sorted(int(card) for card in hand if card))
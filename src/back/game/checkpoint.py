@@ -0,0 +1,371 @@
+"""
+Checkpoints of emitting games and their fixed binary layout, so a game
+can be served from another process, e.g. after a rebalance or restart;
+see EmittingGame.checkpoint and EmittingGame.from_checkpoint.
+
+The layout (little endian) is a fixed size header holding everything
+of a fixed size, i.e. the settings, per spot state, card sets as card
+masks (card c is bit c - 1; ranks are bit r), remaining times, the hand
+in play, the random state, the game's time, the size of its action log,
+the acks and the section counts, followed by the chambers (cards and
+selection masks, then their stored hands as 5 zero-padded cards each),
+the paused timers and the strings (length prefixed UTF-8). None is -1
+for small ints and times (remaining times are never negative, and turn
+times are None between rounds) and NONE_LENGTH for strings.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from .chamber import ChamberSnapshot
+from .frozen_hand import FrozenHand
+from .game import GameSnapshot, base_hand
+from .utils import cards_mask, mask_cards
+
+
+VERSION = 2
+NONE_LENGTH = 0xFFFF
+TIMERS = ("turn", "reserve", "trading")
+_UINT64 = (1 << 64) - 1
+
+_HEADER = struct.Struct(
+    "<"
+    "B"  # version
+    "4d"  # turn, reserve, trading and giving time
+    "?"  # running
+    "B"  # num players
+    "I"  # num consecutive rounds
+    "b"  # current player
+    "bB"  # turn manager's last spot and unfinished spots mask
+    "B"  # num consecutive passes
+    "?"  # finishing last played
+    "?"  # trading
+    "4b"  # positions
+    "4B"  # unlocked, pass unlocked, waiting and open spots masks
+    "4b"  # selected asking options
+    "4H"  # already asked rank masks
+    "4Q"  # giving options
+    "4B"  # gives
+    "4B"  # takes
+    "4Q"  # given
+    "4Q"  # taken
+    "4d"  # turn times
+    "4d"  # reserve times
+    "d"  # trading time remaining
+    "B5B"  # hand in play kind (None, base_hand or FrozenHand) and cards
+    "Q"  # seed
+    "4Q?I"  # PCG64 state and increment (high and low halves) and buffer
+    "d"  # the game's time (see Game._time)
+    "Q"  # action log offset
+    "4Q"  # acked sequence numbers
+    "4q"  # acked results
+    "B"  # num paused timers
+)
+_CHAMBER = struct.Struct("<QQH")  # cards, selected and num hands
+_HAND = struct.Struct("<5B")
+_TIMER = struct.Struct("<Bb")  # which (index in TIMERS) and spot
+_LENGTH = struct.Struct("<H")
+
+
+class CheckpointError(RuntimeError):
+    pass
+
+
+class EmittingGameCheckpoint(NamedTuple):
+    """
+    Everything needed to serve an EmittingGame from another process; see
+    EmittingGame.checkpoint. The snapshot's timers are paused (see
+    Game.snapshot); running is False if the game was paused, i.e. if
+    they are not to be resumed.
+
+    The seed and the random state (see Game._rng) decide the next deals.
+    actions_offset is the size of the game's action log (0 if it has no
+    log) when checkpointed, i.e. the log's actions from there on are not
+    in the checkpoint. acks are the sequence number and result of each
+    sid's last acked action (see EmittingGame.acked_handler).
+    """
+
+    game_id: str
+    name: str
+    turn_time: float
+    reserve_time: float
+    trading_time: float
+    giving_time: float
+    spot_sids: Tuple[Tuple[int, str], ...]
+    user_ids: Tuple[Optional[str], ...]
+    dot_colors: Tuple[str, ...]
+    running: bool
+    snapshot: GameSnapshot
+    seed: int
+    # PCG64 state, increment, whether a 32 bit value is buffered and the
+    # buffered value
+    rng_state: Tuple[int, int, bool, int]
+    time: float
+    actions_offset: int
+    acks: Tuple[Tuple[str, Tuple[int, int]], ...]
+
+    def to_bytes(self) -> bytes:
+        snapshot: GameSnapshot = self.snapshot
+        turn_manager = snapshot.turn_manager or (-1, (False,) * 4)
+        hand_in_play = snapshot.hand_in_play
+        if hand_in_play is None:
+            kind, cards = 0, (0,) * 5
+        elif hand_in_play is base_hand:
+            kind, cards = 1, (0,) * 5
+        else:
+            kind, cards = 2, hand_in_play[:5]
+        state, inc, has_uint32, uinteger = self.rng_state
+        sids = dict(self.spot_sids)
+        acked = dict(self.acks)
+        # by spot; sequence numbers start at 1
+        acks = [acked.get(sids.get(spot), (0, 0)) for spot in range(4)]
+        parts: List[bytes] = [
+            _HEADER.pack(
+                VERSION,
+                self.turn_time,
+                self.reserve_time,
+                self.trading_time,
+                self.giving_time,
+                self.running,
+                snapshot.num_players,
+                snapshot.num_consecutive_rounds,
+                _from_optional(snapshot.current_player),
+                turn_manager[0],
+                _flags_mask(turn_manager[1]),
+                snapshot.num_consecutive_passes,
+                snapshot.finishing_last_played,
+                snapshot.trading,
+                *_padded(snapshot.positions),
+                _flags_mask(snapshot.unlocked),
+                _flags_mask(snapshot.pass_unlocked),
+                _flags_mask(snapshot.waiting),
+                _flags_mask(spot in snapshot.open_spots for spot in range(4)),
+                *map(_from_optional, snapshot.selected_asking_options),
+                *(_ranks_mask(ranks) for ranks in snapshot.already_asked),
+                *map(cards_mask, snapshot.giving_options),
+                *snapshot.gives,
+                *snapshot.takes,
+                *map(cards_mask, snapshot.given),
+                *map(cards_mask, snapshot.taken),
+                *map(_from_optional_time, snapshot.turn_times),
+                *map(_from_optional_time, snapshot.reserve_times),
+                snapshot.trading_time_remaining,
+                kind,
+                *cards,
+                self.seed,
+                state >> 64,
+                state & _UINT64,
+                inc >> 64,
+                inc & _UINT64,
+                has_uint32,
+                uinteger,
+                self.time,
+                self.actions_offset,
+                *(seq for seq, _ in acks),
+                *(result for _, result in acks),
+                len(snapshot.paused_timers),
+            )
+        ]
+        for chamber in snapshot.chambers:
+            parts.append(
+                _CHAMBER.pack(
+                    chamber.cards, chamber.selected, len(chamber.hands)
+                )
+            )
+            parts.extend(_HAND.pack(*hand[:5]) for hand in chamber.hands)
+        parts.extend(
+            _TIMER.pack(TIMERS.index(which), _from_optional(spot))
+            for which, spot in snapshot.paused_timers
+        )
+        for string in (
+            self.game_id,
+            self.name,
+            *snapshot.names,
+            *(sids.get(spot) for spot in range(4)),
+            *self.user_ids,
+            *self.dot_colors,
+        ):
+            if string is None:
+                parts.append(_LENGTH.pack(NONE_LENGTH))
+            else:
+                encoded = string.encode()
+                parts.append(_LENGTH.pack(len(encoded)))
+                parts.append(encoded)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> EmittingGameCheckpoint:
+        version: Optional[int] = data[0] if data else None
+        if version != VERSION:
+            raise CheckpointError(
+                f"cannot read checkpoint of version {version}"
+            )
+        fields = _HEADER.unpack_from(data)
+        offset: int = _HEADER.size
+        (
+            _,
+            turn_time,
+            reserve_time,
+            trading_time,
+            giving_time,
+            running,
+            num_players,
+            num_consecutive_rounds,
+            current_player,
+            turn_manager_last,
+            turn_manager_mask,
+            num_consecutive_passes,
+            finishing_last_played,
+            trading,
+        ) = fields[:14]
+        positions = fields[14:18]
+        unlocked, pass_unlocked, waiting, open_spots = fields[18:22]
+        selected_asking_options = fields[22:26]
+        already_asked = fields[26:30]
+        giving_options = fields[30:34]
+        gives = fields[34:38]
+        takes = fields[38:42]
+        given = fields[42:46]
+        taken = fields[46:50]
+        turn_times = tuple(map(_to_optional_time, fields[50:54]))
+        reserve_times = tuple(map(_to_optional_time, fields[54:58]))
+        trading_time_remaining, kind = fields[58:60]
+        hand_cards = fields[60:65]
+        seed, state_high, state_low, inc_high, inc_low = fields[65:70]
+        has_uint32, uinteger, time, actions_offset = fields[70:74]
+        acked_seqs, acked_results = fields[74:78], fields[78:82]
+        (num_paused_timers,) = fields[82:]
+
+        chambers: List[ChamberSnapshot] = list()
+        for _ in range(4):
+            cards, selected, num_hands = _CHAMBER.unpack_from(data, offset)
+            offset += _CHAMBER.size
+            hands: List[FrozenHand] = list()
+            for _ in range(num_hands):
+                hands.append(FrozenHand(_HAND.unpack_from(data, offset)))
+                offset += _HAND.size
+            chambers.append(ChamberSnapshot(cards, selected, tuple(hands)))
+        paused_timers: List[Tuple[str, Optional[int]]] = list()
+        for _ in range(num_paused_timers):
+            which, spot = _TIMER.unpack_from(data, offset)
+            offset += _TIMER.size
+            paused_timers.append((TIMERS[which], _to_optional(spot)))
+        strings: List[Optional[str]] = list()
+        for _ in range(18):
+            (length,) = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            if length == NONE_LENGTH:
+                strings.append(None)
+            else:
+                strings.append(data[offset : offset + length].decode())
+                offset += length
+        game_id, name = strings[:2]
+        names, sids = strings[2:6], strings[6:10]
+        user_ids, dot_colors = strings[10:14], strings[14:18]
+
+        snapshot = GameSnapshot(
+            chambers=tuple(chambers),
+            hand_in_play=(None, base_hand, FrozenHand(hand_cards))[kind],
+            current_player=_to_optional(current_player),
+            turn_manager=None
+            if turn_manager_last == -1
+            else (turn_manager_last, _mask_flags(turn_manager_mask)),
+            num_consecutive_passes=num_consecutive_passes,
+            finishing_last_played=finishing_last_played,
+            positions=tuple(spot for spot in positions if spot != -1),
+            unlocked=_mask_flags(unlocked),
+            pass_unlocked=_mask_flags(pass_unlocked),
+            trading=trading,
+            selected_asking_options=tuple(
+                map(_to_optional, selected_asking_options)
+            ),
+            already_asked=tuple(
+                frozenset(rank for rank in range(16) if mask >> rank & 1)
+                for mask in already_asked
+            ),
+            waiting=_mask_flags(waiting),
+            giving_options=_mask_sets(giving_options),
+            gives=gives,
+            takes=takes,
+            given=_mask_sets(given),
+            taken=_mask_sets(taken),
+            names=tuple(names),
+            open_spots=frozenset(
+                spot
+                for spot, open_ in enumerate(_mask_flags(open_spots))
+                if open_
+            ),
+            num_players=num_players,
+            num_consecutive_rounds=num_consecutive_rounds,
+            turn_times=turn_times,
+            reserve_times=reserve_times,
+            trading_time_remaining=trading_time_remaining,
+            paused_timers=tuple(paused_timers),
+        )
+        return cls(
+            game_id=game_id,
+            name=name,
+            turn_time=turn_time,
+            reserve_time=reserve_time,
+            trading_time=trading_time,
+            giving_time=giving_time,
+            spot_sids=tuple(
+                (spot, sid) for spot, sid in enumerate(sids) if sid is not None
+            ),
+            user_ids=tuple(user_ids),
+            dot_colors=tuple(dot_colors),
+            running=running,
+            snapshot=snapshot,
+            seed=seed,
+            rng_state=(
+                state_high << 64 | state_low,
+                inc_high << 64 | inc_low,
+                has_uint32,
+                uinteger,
+            ),
+            time=time,
+            actions_offset=actions_offset,
+            acks=tuple(
+                (sid, (seq, result))
+                for sid, seq, result in zip(sids, acked_seqs, acked_results)
+                if seq
+            ),
+        )
+
+
+def _from_optional(value: Optional[int]) -> int:
+    return -1 if value is None else value
+
+
+def _to_optional(value: int) -> Optional[int]:
+    return None if value == -1 else value
+
+
+def _from_optional_time(value: Optional[float]) -> float:
+    return -1.0 if value is None else value
+
+
+def _to_optional_time(value: float) -> Optional[float]:
+    return None if value < 0 else value
+
+
+def _padded(spots: Sequence[int]) -> Tuple[int, ...]:
+    return tuple(spots) + (-1,) * (4 - len(spots))
+
+
+def _flags_mask(flags) -> int:
+    return sum(1 << spot for spot, flag in enumerate(flags) if flag)
+
+
+def _mask_flags(mask: int) -> Tuple[bool, ...]:
+    return tuple(bool(mask >> spot & 1) for spot in range(4))
+
+
+def _ranks_mask(ranks) -> int:
+    return sum(1 << rank for rank in ranks)
+
+
+def _mask_sets(masks: Sequence[int]) -> Tuple[frozenset, ...]:
+    return tuple(frozenset(mask_cards(mask)) for mask in masks)
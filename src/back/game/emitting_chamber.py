@@ -1,62 +1,50 @@
 from __future__ import annotations
 
-from . import Hand, Chamber, HandNode, HandPointerNode
+from . import Chamber, BitChamber, HandNode
+from .frozen_hand import FrozenHand
+from .outbox import Outbox
 
-from socketio import AsyncServer
-from typing import Dict, List, Any, Optional, Iterable
-import numpy as np
-
-from asyncio import gather
-
-# from ..server.server import Server
+from typing import Any, Dict, Collection, Iterable, List, Set
 
 
 # TODO: make repr's more meaningful
-# TODO: type hints
 
 
 class EmittingChamber(Chamber):
     """
-    Chamber that emits socketio events. Allows the base data structure
-    to be debugged without needing an active HTTP request.
+    Chamber that queues the events keeping its player's client in sync
+    with it in an outbox, for its spot; see Outbox. Allows the base data
+    structure to be debugged without needing an active HTTP request.
     """
 
-    def __init__(self, sio, cards: np.ndarray = None) -> None:
+    def __init__(
+        self,
+        outbox: Outbox = None,
+        spot: int = None,
+        cards: Collection[int] = None,
+    ) -> None:
         super().__init__(cards)
-        self._sio = sio
-        self._sid: str = None
+        self._outbox: Outbox = Outbox() if outbox is None else outbox
+        self._spot: int = spot
 
-    async def _emit(self, *args, **kwargs):
-        await self._sio.emit(*args, room=self._sid, **kwargs)
+    def _emit(self, name: str, payload: Dict[str, Any]) -> None:
+        self._outbox.emit(name, payload, self._spot)
 
-    async def reset(self) -> None:
-        await self._emit("clear_cards", {})
-        await self._emit_update_current_hand_str()
-        self.set_sid(None)
+    def set_outbox(self, outbox: Outbox) -> None:
+        self._outbox = outbox
+
+    def reset(self) -> None:
+        self._emit("clear_cards", {})
         # TODO: deal with hands being removed, i.e. the asshole's stored
         #       hands must be removed
         super().reset()
+        self._emit_update_current_hand_str()
 
-    def set_sio(self, sio) -> None:
-        self._sio = sio
-        for hand_node in self._hand_nodes:
-            hand_node.set_sio(sio)
-
-    def set_sid(self, sid: Optional[str]) -> None:
-        self._sid = sid
-        for hand_node in self._hand_nodes:
-            hand_node.set_sid(sid)
-
-    async def add_card(self, card: int, **kwargs) -> None:
+    def add_card(self, card: int, **kwargs) -> None:
         super().add_card(card, **kwargs)
-        await self._emit("add_card", {"card": int(card)})
+        self._emit("add_card", {"card": int(card)})
 
-    async def add_cards(self, cards) -> None:
-        self._check_cards_not_in(cards)
-        # already checked
-        await gather(*[self.add_card(card, check=False) for card in cards])
-
-    async def remove_card(
+    def remove_card(
         self,
         card: int,
         *,
@@ -64,47 +52,62 @@ class EmittingChamber(Chamber):
         update_current_hand_str: bool = True,
     ) -> None:
         super().remove_card(card, check=check)
-        await self._emit("remove_card", {"card": int(card)})
+        self._emit("remove_card", {"card": int(card)})
         if update_current_hand_str:
-            await self._emit_update_current_hand_str()
+            self._emit_update_current_hand_str()
 
-    async def remove_cards(self, cards) -> None:
+    def remove_cards(self, cards: Iterable[int]) -> None:
         self._check_cards_in(cards)
-        # already checked
-        await gather(
-            *[
-                self.remove_card(
-                    card, check=False, update_current_hand_str=False
-                )
-                for card in cards
-            ]
-        )
-        await self._emit_update_current_hand_str()
+        for card in cards:
+            # already checked
+            self.remove_card(card, check=False, update_current_hand_str=False)
+        self._emit_update_current_hand_str()
 
-    async def add_hand(self, hand: Hand) -> None:
+    def add_hand(self, hand: Collection[int]) -> None:
         """
-        Emits hand storage and uses EmittingHandNodes instead of
-        HandNodes.
+        Emits hand storage; stored hands are identified by their hash.
         """
         # TODO: this behavior should be controllable as a player setting
-        self._hand_check()
-        await self.deselect_cards(hand)
-        await self._emit(
-            "store_hand",
-            {
-                "id": xxhash.xxh64().intdigest(),
-                "cards": hand.to_list(),
-                "id_desc": hand.id_desc,
-            },
-        )
-        self._add_hand_helper(hand, EmittingHandNode, sio=self._sio)
+        frozen_hand = self._hand_check(hand)
+        if hand is self.hand:
+            self.deselect_cards(frozen_hand)
+        self._emit_store_hand(frozen_hand)
+        self._add_hand_helper(frozen_hand, HandNode)
 
-    async def select_card(self, card: int, check: bool = True) -> None:
+    def enumerate_combos(self, store: bool = False) -> List[FrozenHand]:
+        """
+        If store, emits the storage of each combo stored, in order, and
+        the selection of those with selected cards in them; they have
+        every selected card, see Chamber.enumerate_combos.
+        """
+        if not store:
+            return super().enumerate_combos()
+        stored: Set[int] = set(self._hand_index)
+        combos: List[FrozenHand] = super().enumerate_combos(store=True)
+        selected: bool = bool(self.hand)
+        for hand in combos:
+            hand_hash: int = hash(hand)
+            if hand_hash in stored or hand_hash not in self._hand_index:
+                continue
+            self._emit_store_hand(hand)
+            if selected:
+                self._emit("select_hand", {"id": hand_hash})
+        return combos
+
+    def remove_hand(self, hand: Collection[int]) -> None:
+        """
+        Emits stored hand removal, with the id the hand was stored with.
+        """
+        super().remove_hand(hand)
+        self._emit("remove_hand", {"id": hash(FrozenHand(hand))})
+
+    def select_card(self, card: int, check: bool = True) -> None:
         super().select_card(card, check)
-        await self._emit("select_card", {"card": card})
-        await self._emit_update_current_hand_str()
+        self._emit("select_card", {"card": int(card)})
+        self._emit_hand_selections(card, "select_hand", 1)
+        self._emit_update_current_hand_str()
 
-    async def deselect_card(
+    def deselect_card(
         self,
         card: int,
         check: bool = True,
@@ -112,60 +115,54 @@ class EmittingChamber(Chamber):
         update_current_hand_str: bool = True,
     ) -> None:
         super().deselect_card(card, check)
-        await self._emit("deselect_card", {"card": int(card)})
+        self._emit("deselect_card", {"card": int(card)})
+        self._emit_hand_selections(card, "deselect_hand", 0)
         # TODO: current hand str shouldn't be lazy loaded
         if update_current_hand_str:
-            await self._emit_update_current_hand_str()
+            self._emit_update_current_hand_str()
 
-    async def deselect_cards(self, cards: Iterable[int]) -> None:
+    def deselect_cards(self, cards: Iterable[int]) -> None:
         self._check_cards_in(cards)
-        await gather(
-            *[
-                self.deselect_card(
-                    card, check=False, update_current_hand_str=False
-                )
-                for card in cards
-            ]
-        )
-        await self._emit_update_current_hand_str()
-
-    async def deselect_selected(self) -> None:
+        for card in list(cards):
+            self.deselect_card(
+                card, check=False, update_current_hand_str=False
+            )
+        self._emit_update_current_hand_str()
+
+    def _emit_hand_selections(
+        self, card: int, event: str, num_cards_selected: int
+    ) -> None:
         """
-        NOTE: logic copy/pasted from base; must update manually
+        Stored hand selections are emitted when the number of selected
+        cards in them goes from 0 to 1 or from 1 to 0.
         """
-        await self.deselect_cards(self.hand)
-
-    async def _emit_update_current_hand_str(self) -> None:
-        await self._emit("update_current_hand_str", {"str": str(self.hand)})
-
-
-class EmittingHandNode(HandNode):
-    def __init__(
-        self, hand, hand_pointer_nodes: List[HandPointerNode], *, sio
-    ) -> None:
-        super().__init__(hand, hand_pointer_nodes)
-        self._sio = sio
-        self._id = None  # TODO: random number or string (which one is better?)
-        self._sid: str = None
-
-    def __repr__(self):
-        return "EmittingHandNode"  # TODO
+        for hand_node in self._cards[card]:
+            if hand_node._num_cards_selected == num_cards_selected:
+                self._emit(event, {"id": hash(hand_node.hand)})
 
-    def _emit(self, *args, **kwargs) -> None:
-        self._sio.emit(*args, {"id": self._sid}, room=self._sid, **kwargs)
+    def _emit_store_hand(self, hand: FrozenHand) -> None:
+        self._emit(
+            "store_hand",
+            {
+                "id": hash(hand),
+                "cards": hand.to_list(),
+                "id_desc": hand.id_desc,
+            },
+        )
 
-    def set_sio(self, sio) -> None:
-        self._sio = sio
+    def _emit_update_current_hand_str(self) -> None:
+        self._emit("update_current_hand_str", {"str": str(self.hand)})
 
-    def set_sid(self, sid: str) -> None:
-        self._sid = sid
 
-    async def increment_num_selected_cards(self) -> None:
-        super().increment_num_selected_cards()
-        if self._num_cards_selected == 1:
-            await self._emit("select_hand")
+class EmittingBitChamber(EmittingChamber, BitChamber):
+    """
+    EmittingChamber backed by a BitChamber; the number of selected cards
+    in stored hands is derived from the masks.
+    """
 
-    async def decrement_num_selected_cards(self) -> None:
-        super().decrement_num_selected_cards()
-        if self._num_cards_selected == 0:
-            await self._emit("deselect_hand")
+    def _emit_hand_selections(
+        self, card: int, event: str, num_cards_selected: int
+    ) -> None:
+        for hand_node in self._card_hand_nodes(card):
+            if self._num_cards_selected(hand_node) == num_cards_selected:
+                self._emit(event, {"id": hash(hand_node.hand)})
@@ -1,32 +1,37 @@
-from typing import Callable, Dict, List, Optional, Set, Union, Iterable
+from __future__ import annotations
+
+from time import monotonic
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
+import numpy as np
 from bidict import bidict
-from socketio import AsyncServer
 
 from asyncio import gather
-import inspect
-import re
-from time import time
-
-from ..game.hand import NotPlayableOnError
-from ..utils import spawn_after
-from ..services.monitor import HandPlay
 
-# from ..server.server import Server
-Server = None
-
-from . import (
-    Hand,
-    DuplicateCardError,
-    FullHandError,
-    CardNotInChamberError,
-    EmittingChamber,
-    Game,
-    base_hand,
-    PresidentsError,
+from ..utils import (
+    GAME_ACTION_DICT,
+    Actor,
+    NoopTimer,
+    players_room,
 )
+from ..services.monitor import HandPlay
 
-from datetime import datetime
+from . import EmittingChamber, Game, PresidentsError
+from .action_log import ActionLog, LoggedAction
+from .checkpoint import CheckpointError, EmittingGameCheckpoint
+from .event_codec import encode_batch, encode_event
+from .hand import Hand
+from .outbox import Event, room_batch
 
 # TODO: decide what to do for the removal of asking options; and whether
 #       or not to remove them
@@ -52,716 +57,395 @@ from datetime import datetime
 #       randomly decide order, e.g. not just
 #       "for sid in spot_sid_bidict.values()"  or "for spot in range(4)"
 # TODO: fix idling on phone bug
-# TODO: make base game class async and agnostic to event emittal
-#       implementation
 # TODO: serialize and store full game state at the start of every round
 #       and store all major game state changing actions in a round (e.g.
 #       this includes valid hand plays but excludes card clicks) so when
 #       assertions are failed (or some other unknown bug), reproduction
 #       can be attempted without accessing game actions table
 
+
 class EmittingGame(Game):
-    def __init__(self, *, name: str, sio, agents: dict, **kwargs):
-        super().__init__(**kwargs)
+    """
+    Game served over socketio. The game itself does no IO: sids are
+    mapped to spots, actions are carried out synchronously and then the
+    events they queued are sent with a single flush, see flush.
+
+    Everything that changes the game, i.e. actions, player changes and
+    timeouts, is sent to the game's actor, which carries it out in order
+    and flushes once per drain; see utils.Actor. The timer must call
+    its function synchronously, e.g. utils.wheel_after.
+
+    If store_checkpoint is given, the game is checkpointed at the start
+    of every round (and on maybe_checkpoint) once the drain's events are
+    sent; it is called with the game id and the checkpoint's bytes (see
+    checkpoint). Likewise, if store_actions is given, the game logs its
+    actions and store_actions is called with the game id and the bytes
+    added to its action log (see game.ActionLog) after every flush.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        sio,
+        agents: dict,
+        timer: Callable = NoopTimer.timer,
+        chamber_class: Type[EmittingChamber] = EmittingChamber,
+        store_checkpoint: Callable[[str, bytes], Awaitable[None]] = None,
+        store_actions: Callable[[str, bytes], Awaitable[None]] = None,
+        **kwargs,
+    ):
+        self._sio = sio
+        self._store_checkpoint = store_checkpoint
+        # set when a round starts; see flush
+        self._checkpoint_due: bool = False
+        # whether events were sent since the last checkpoint
+        self._changed: bool = False
+        self._store_actions = store_actions
+        # size of the part of the action log that has been stored
+        self._actions_stored: int = 0
+        if store_actions is not None:
+            kwargs["log_actions"] = True
+        self.actor: Actor = Actor(self.flush)
+        # timeouts are handled like actions, i.e. sent to the actor; see
+        # _actor_timer
+        self._base_timer: Callable = timer
+        super().__init__(
+            timer=self._actor_timer, chamber_class=chamber_class, **kwargs
+        )
         # TODO: server stuff (including emitting should be entirely handled by the Server, which is an AsyncNamespace)
         self.name = name
-        self._sio = sio
-        self._events_counter = agents.get('events_counter')
-        self._hand_play_processor = agents.get('hand_play_processor')
-        self._chambers: List[EmittingChamber] = [
-            EmittingChamber(self._sio) for _ in range(4)
-        ]
+        self._events_counter = agents.get("events_counter")
+        self._hand_play_processor = agents.get("hand_play_processor")
         self._spot_sid_bidict: bidict = bidict()
         self._user_ids: List[str] = [None for _ in range(4)]
-        self._dot_colors = ["red" for _ in range(4)]
+        # hashes of the hands played since the last flush
+        self._hand_plays: List[int] = list()
+        # the sequence number and result of each sid's last acked action
+        self._acks: Dict[str, Tuple[int, int]] = dict()
         self.num_spectators: int = 0  # TODO
 
-    # properties
-
-    @property
-    def _current_player_sid(self) -> str:
-        return self._get_sid(self._current_player)
-
     # setup related methods
 
+    def _make_chamber(self, spot: int) -> EmittingChamber:
+        return self._chamber_class(self._outbox, spot)
+
     def set_sio(self, sio) -> None:
         self._sio = sio
-        for spot in range(4):
-            self._chambers[spot].set_sio(sio)
 
-    async def _add_player_to_spot(
-        self, name: str, spot: int, sid: str, user_id: str
-    ) -> None:
-        """
-        NOTE: logic copy/pasted from base; must update manually
-              manages sids, user ids, and set name must be awaited
-        """
-        assert self._names[spot] is None, f"player already in spot {spot}"
-
-        self._spot_sid_bidict[spot] = sid
-        self._chambers[spot].set_sid(sid)
-        self._user_ids[spot] = user_id
+    def clone(self) -> EmittingGame:
+        game: EmittingGame = super().clone()
+        for chamber in game._chambers:
+            chamber.set_outbox(game._outbox)
+        game._hand_plays = list()
+        game._store_checkpoint = game._store_actions = None
+        game.actor = Actor(game.flush)
+        game._timer = game._actor_timer
+        return game
 
-        self._open_spots.remove(spot)
-        await self._set_name(spot=spot, name=name)
-        self.num_players += 1
+    # checkpoint related methods
 
-        if self.is_paused:  # player was added to a game that already started
-            await self.emit_full_state(sid)
-
-        # TODO TODO: THIS SHOULD NOT BE HERE. (JUST FOR TESTING)
-        # TODO: add pre game chatting screen with timer to start game
-        #       once 4 bois have joined
-        # if self.num_players == 4:
-        #     await self.start_round(
-        #         setup=True
-        #     )  # , deck=[[1], [2], [3], [4]], testing=True)
-
-    async def remove_player(self, sid: str) -> None:
+    def checkpoint(self) -> EmittingGameCheckpoint:
         """
-        NOTE: logic copy/pasted from base; must update manually
-              manages sids and set name must be awaited
+        Checkpoint of the game as of now, without changing it; running
+        timers are checkpointed as if they were paused now, i.e. with
+        the time they have remaining (see Game.snapshot). Its
+        actions_offset is the size of the action log so far, so
+        checkpoints must be stored only once the log is (see flush).
         """
-        spot: int = self._get_spot(sid)
-        self._open_spots.add(spot)
-        await self._set_name(spot=spot, name=None)
-        self.num_players -= 1
-        self._spot_sid_bidict.pop(spot)
-        self._chambers[spot].set_sid(None)
-        self._user_ids[spot] = None
+        return EmittingGameCheckpoint(
+            game_id=self.game_id,
+            name=self.name,
+            turn_time=self._turn_time,
+            reserve_time=self._reserve_time,
+            trading_time=self._trading_time,
+            giving_time=self._giving_time,
+            spot_sids=tuple(self._spot_sid_bidict.items()),
+            user_ids=tuple(self._user_ids),
+            dot_colors=tuple(self._dot_colors),
+            running=not self.is_paused,
+            snapshot=self.snapshot(),
+            seed=self.seed,
+            rng_state=_rng_state(self._rng),
+            time=self._time(),
+            actions_offset=0
+            if self.action_log is None
+            else len(self.action_log),
+            acks=tuple(
+                (sid, self._acks[sid])
+                for _, sid in sorted(self._spot_sid_bidict.items())
+                if sid in self._acks
+            ),
+        )
 
-    async def _deal_cards(self, *, deck: List[Iterable[int]] = None) -> None:
+    def maybe_checkpoint(self) -> None:
         """
-        Deals cards to all players.
+        Has the game checkpointed on the next flush if it has queued any
+        events since its last checkpoint; e.g. sent to games' actors
+        periodically.
         """
-        await gather(
-            *[
-                self._deal_cards_indiv(spot, sid, cards)
-                for (spot, sid), cards in zip(
-                    self._spot_sid_bidict.items(),
-                    deck or self._make_shuffled_deck(),
-                )
-            ]
-        )
+        if self._changed or len(self._outbox):
+            self._checkpoint_due = True
 
-    async def _deal_cards_indiv(
-        self, spot: int, sid: str, cards: Iterable[int]
-    ):
+    def hand_off(self) -> EmittingGameCheckpoint:
         """
-        Deals cards to an individual player; for utilizing concurrency
-        with asyncio.gather.
+        Returns the game's checkpoint and stops its timers so another
+        game god can serve it; the game must not be used afterwards.
+        See from_checkpoint.
         """
-        chamber = self._chambers[spot]
-        await chamber.reset()
-        chamber.set_sid(sid)
-        # this isn't in the gather because the cards remaining event is
-        # emitted before all the cards have been async added
-        await chamber.add_cards(cards)
-        await gather(
-            self._emit("set_spot", {"spot": spot}, room=sid),
-            self._emit_to_players(
-                "set_cards_remaining",
-                {"spot": spot, "cards_remaining": chamber.num_cards},
-            ),
-        )
-
-    # game flow related methods
+        checkpoint: EmittingGameCheckpoint = self.checkpoint()
+        if not self.is_paused:
+            self._pause_timers()
+        return checkpoint
 
-    async def start_round(
-        self,
+    def close(self) -> None:
+        """
+        Cancels the game's timers and closes its actor, so nothing is
+        handled or sent for the game anymore, e.g. once it is removed;
+        the game must not be used afterwards.
+        """
+        for timer in (*self._timers, self._trading_timer):
+            if timer is not None:
+                timer.cancel()
+        self.actor.close()
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        checkpoint: EmittingGameCheckpoint,
         *,
-        setup: bool,
-        deck: List[Iterable[int]] = None,
-        testing: bool = False,
-    ) -> None:
+        action_log: Optional[ActionLog] = None,
+        clock: Callable[[], float] = monotonic,
+        **kwargs,
+    ) -> EmittingGame:
         """
-        NOTE: logic copy/pasted from base; must update manually;
-              for a gather loop
+        Game restored from checkpoint, with kwargs (e.g. sio and agents)
+        passed to the constructor. The timers that hand_off stopped are
+        restarted; the events doing so are queued for the next flush.
+
+        The game's time goes on from the checkpoint's, so the times of
+        its actions and its deadlines carry on from those of the game
+        checkpointed (see Game._time). If the game logs its actions (see
+        store_actions), action_log is the game's log so far, which it
+        goes on appending to; the actions logged after the checkpoint
+        was taken, e.g. before the game god serving the game crashed,
+        are taken again on top of it (see Game.take_actions) and their
+        events dropped since they were sent already. Raises
+        CheckpointError if the log is missing actions the checkpoint
+        has, i.e. if it was cut off.
         """
-        if setup:
-            await self._setup_round(deck=deck)
-        self._num_consecutive_rounds += 1
-        self._make_and_set_turn_manager(testing)
-        await gather(
-            *[
-                self._set_time("reserve", self._reserve_time, spot)
-                for spot in range(4)
-            ],
-            self._message(f"🏁 round {self._num_consecutive_rounds} has begun"),
-            self._next_player(),
+        game: EmittingGame = cls(
+            game_id=checkpoint.game_id,
+            name=checkpoint.name,
+            turn_time=checkpoint.turn_time,
+            reserve_time=checkpoint.reserve_time,
+            trading_time=checkpoint.trading_time,
+            giving_time=checkpoint.giving_time,
+            seed=checkpoint.seed,
+            clock=_continued_clock(clock, checkpoint.time),
+            **kwargs,
         )
-
-    async def _next_player(self) -> None:
-        try:  # current player is no longer on turn
-            await self._emit(
-                "set_on_turn",
-                {"on_turn": False},
-                room=self._current_player_sid,
+        game.restore(checkpoint.snapshot)
+        _set_rng_state(game._rng, checkpoint.rng_state)
+        game._spot_sid_bidict = bidict(checkpoint.spot_sids)
+        game._user_ids = list(checkpoint.user_ids)
+        game._dot_colors = list(checkpoint.dot_colors)
+        game._acks = dict(checkpoint.acks)
+        if game.action_log is None:
+            if checkpoint.running:
+                game._resume_timers()
+            return game
+        if action_log is not None:
+            game.action_log = action_log
+            game._actions_stored = len(action_log)
+        # a log that is not stored yet only passes if it has no actions
+        if len(game.action_log) < checkpoint.actions_offset:
+            raise CheckpointError(
+                f"action log of game {checkpoint.game_id} is cut off before "
+                "its checkpoint"
             )
-        except KeyError:  # self._current_player is None on round start
-            pass
-        # TODO this mypy error
-        self._current_player = spot = next(self._turn_manager)
-        aws = [
-            self._set_time("turn", self._turn_time, spot, True),
-            self._message(f"🎲 it's {self._names[spot]}'s turn"),
-            self._emit_set_on_turn_handler(spot)
-        ]
-        if self._hand_in_play is None:  # can play anyhand so can't pass
-            aws.append(self._lock_if_pass_unlocked(spot))
-        await gather(*aws)
-
-    async def _emit_set_on_turn_handler(self, spot: int) -> None:
-        await gather(
-            self._emit(
-                "set_on_turn", {"on_turn": True}, room=self._get_sid(spot)
-            ),
-            self._set_dot_color(spot, "green"),
+        tail: List[LoggedAction] = list(
+            game.action_log.actions_from(checkpoint.actions_offset)
         )
-
-    async def _set_time(
-        self, which: str, seconds: float, spot: int = None, start: bool = False
-    ) -> None:
-        kwargs = {
-            "which": which,
-            "time": seconds * 1000,
-            "start": start,
-            # this item accounts for server/client latency
-            "timestamp": time(),  # seconds since epoch
-        }
-        if spot:
-            kwargs["spot"] = spot
-        await self._emit_to_players("set_time", kwargs)
-        super()._set_time(which, seconds, spot, False)
-        # done like this because the "start" item from above takes care
-        # of emitting the start state
-        if start:
-            super()._start_timer(which, spot)
-
-    async def _start_timer(self, which: str, spot: int = None) -> None:
-        await self._set_timer_state(which, True, spot)
-        super()._start_timer(which, spot)
-
-    async def _set_timer_state(
-        self, which: str, state: bool, spot: int = None
+        timer: Callable = game._base_timer
+        if tail:
+            # the tail's timeouts are logged, so the timers started
+            # while taking it must not go off
+            game._base_timer = NoopTimer.timer
+        if checkpoint.running:
+            game._resume_timers()
+        if tail:
+            game.take_actions(tail)
+            game.drain_outbox()
+            game._hand_plays = list()
+            game._clock = _continued_clock(
+                clock, max(checkpoint.time, tail[-1].time)
+            )
+            game._base_timer = timer
+            # restarted with the timer the game was given
+            if not game.is_paused:
+                game._pause_timers()
+                game._resume_timers()
+            game._checkpoint_due = True
+        return game
+
+    def start_round(self, **kwargs) -> None:
+        super().start_round(**kwargs)
+        self._checkpoint_due = True
+
+    def _add_player_to_spot(
+        self, name: str, spot: int, sid: str, user_id: str
     ) -> None:
-        """
-        Helper for timer state emittal to avoid copy paste logic for
-        stop_timer.
-        """
-        payload = {"which": which, "state": state}
-        if spot:
-            payload["spot"] = spot
-        await self._emit_to_players("set_timer_state", payload)
-
-    async def pause(self) -> None:
-        await gather(
-            self._pause_timers(),
-            self._emit_to_players("set_paused", {"paused": True}),
-        )
+        super()._add_player_to_spot(name, spot)
+        self._spot_sid_bidict[spot] = sid
+        self._user_ids[spot] = user_id
 
-    async def resume(self) -> None:
-        await gather(
-            self._emit_to_players("set_paused", {"paused": False}),
-            self._resume_timers(),
-        )
+    def remove_player(self, sid: str) -> None:
+        spot: int = self._get_spot(sid)
+        super().remove_player(spot)
+        self._spot_sid_bidict.pop(spot)
+        self._user_ids[spot] = None
+        self._acks.pop(sid, None)
 
-    async def _resume_timers(self) -> None:
-        await gather(*self._paused_timers)
-        self._paused_timers.clear()
-
-    async def _player_finish(self, spot: int) -> None:
-        assert self._chambers[
-            spot
-        ].is_empty, "only players with no cards remaining can finish"
-        await self._set_dot_color(spot, "purple")
-        self._positions.append(self._current_player)
-        self._turn_manager.remove(self._current_player)
-        num_unfinished_players = self._num_unfinished_players
-        if num_unfinished_players == 3:
-            await gather(
-                self._set_president(spot),
-                self._message(f"🏆 {self._names[spot]} is president 🥇"),
-                self._next_player(),
-            )
-        elif num_unfinished_players == 2:
-            await gather(
-                self._set_vice_president(spot),
-                self._message(f"🏆 {self._names[spot]} is vice president 🥈"),
-                self._next_player(),
-            )
-        else:  # num_unfinished
-            await self._set_vice_asshole(spot)
-            self._current_player = next(self._turn_manager)
-            await self._set_asshole(self._current_player)
-            self._positions.append(self._current_player)
-            await gather(
-                self._message(
-                    f"🏆 {self._names[spot]} is vice asshole 🥉 and {self._names[self._current_player]} is asshole 💩"
-                ),
-                self._set_trading(True),
-            )
+    # timer related methods
 
-    async def emit_full_state(self, sid: str):
-        """
-        NOTE: these are all raw emits and their logic must be updated
-              manually
-        """
-        spot: int = self._get_spot(sid)
-        events = list()
-        events.extend(
-            [
-                self._emit("add_card", {"card": card}, room=sid)
-                for card in self._chambers[spot]
-            ]
-        )
-        events.append(self._emit("set_spot", {"spot": spot}, room=sid))
-        events.append(
-            self._emit(
-                "set_names",
-                {
-                    "names": [
-                        "" if name is None else name for name in self._names
-                    ]
-                },
-                room=sid,
-            )
-        )
-        for spot in range(4):
-            events.extend(
-                [
-                    self._emit(
-                        "set_dot_color",
-                        {"spot": spot, "dot_color": self._dot_colors[spot]},
-                        room=sid,
-                    ),
-                    self._emit(
-                        "set_cards_remaining",
-                        {
-                            "spot": spot,
-                            "cards_remaining": self._chambers[spot].num_cards,
-                        },
-                        room=sid,
-                    ),
-                    self._emit(
-                        "set_time",
-                        {
-                            "spot": spot,
-                            "which": "turn",
-                            "time": self._turn_times[spot] * 1000,
-                            "start": False,
-                        },
-                        room=sid,
-                    ),
-                    self._emit(
-                        "set_time",
-                        {
-                            "spot": spot,
-                            "which": "reserve",
-                            "time": self._reserve_times[spot] * 1000,
-                            "start": False,
-                        },
-                        room=sid,
-                    ),
-                ]
-            )
-        if self._hand_in_play and self._hand_in_play is not base_hand:
-            events.append(
-                self._emit(
-                    "set_hand_in_play",
-                    {
-                        "hand_in_play": self._hand_in_play.to_list(),
-                        "hand_in_play_desc": self._hand_in_play.id_desc,
-                    },
-                    room=sid,
-                )
-            )
-        if self.is_paused:
-            events.append(self._emit("set_paused", {"paused": True}, room=sid))
-        if self.trading:
-            spot: int = self._get_spot(sid)
-            events.extend(
-                [
-                    self._emit("set_trading", {"trading": True}, room=sid),
-                    self._emit(
-                        "set_time",
-                        {
-                            "which": "trading",
-                            "time": self._trading_time_remaining * 1000,
-                            "start": False,
-                        },
-                        room=sid,
-                    ),
-                ]
-            )
-            if self._is_asker(spot):
-                events.append(
-                    self._emit("set_asker", {"asker": True}, room=sid)
-                )
-            else:
-                events.append(
-                    self._emit("set_giver", {"giver": True}, room=sid)
-                )
-                if self._giving_options[spot]:
-                    events.append(
-                        self._emit(
-                            "set_giving_options",
-                            {
-                                "options": list(self._giving_options[spot]),
-                                "highlight": True,
-                            },
-                            room=sid,
-                        )
-                    )
-
-        await gather(*events)
+    def _actor_timer(self, seconds: float, function: Callable, *args):
+        return self._base_timer(seconds, self.actor.tell, function, *args)
 
     # card management related methods
 
-    async def card_handler(self, sid: str, card: int) -> None:
+    def card_handler(self, sid: str, card: int) -> bool:
         spot: int = self._get_spot(sid)
         try:
-            await self.add_or_remove_card(spot, card)
-            # await cast_game_action(...)
+            self.add_or_remove_card(spot, card)
         except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
-
-    # TODO
-    def store_hand(self, spot: int) -> None:
-        ...
+            self._emit_alert(str(e), spot)
+            return False
+        return True
 
     # playing and passing related methods
 
-    async def _maybe_unlock_play_handler(self, spot: int, sid: str) -> None:
+    def play_handler(self, sid: str) -> bool:
+        spot: int = self._get_spot(sid)
         try:
-            await self.maybe_unlock_play(spot)
+            self.maybe_play_current_hand(spot)
         except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
+            self._emit_alert(str(e), spot)
+            return False
+        return True
 
-    async def play_handler(self, sid: str) -> None:
-        try:
-            await self.maybe_play_current_hand(self._get_spot(sid), sid=sid)
-        except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
-
-    async def _play_current_hand(self, spot: int, **kwargs) -> None:
-        assert self._unlocked[spot], "play called without unlocking"
-        await self._stop_timer(
-            which="turn"
-            if not self._is_using_reserve_time(spot)
-            else "reserve",
-            spot=spot,
-        )
-        chamber = self._chambers[spot]
-        hand = Hand.copy(chamber.hand)
-        # this is outside the gather because the num_cards was being
-        # evaluated before the chamber after removed the cards
-        await chamber.remove_cards(hand)
-        await gather(
-            self.cast_hand_play(hash(hand)),
-            self._set_hand_in_play(hand),
-            self._message(f"▶️ {self._names[spot]} played {str(hand)}"),
-            self.lock(spot),
-            self._set_dot_color(spot, "blue"),
-            *[
-                self._set_dot_color(other_spot, "red")
-                for other_spot in self._get_other_spots(
-                    spot, exclude_finished=True
-                )
-            ],
-            self._emit_to_players(
-                "set_cards_remaining",
-                {"spot": spot, "cards_remaining": chamber.num_cards},
-            ),
-        )
-        self._num_consecutive_passes = 0
-        # lock others if their currently unlocked hand should no longer be unlocked
-        for other_spot in self._get_other_spots(spot, exclude_finished=True):
-            if self._unlocked[other_spot]:
-                try:
-                    if self._get_current_hand(other_spot) < self._hand_in_play:
-                        await self.lock(other_spot)
-                # occurs either when base_hand is the hand in play since
-                # anything can be unlocked or when a bomb is played on a
-                # non-bomb that other players have unlocked on
-                except NotPlayableOnError:
-                    await self.lock(other_spot)
-        await self._post_play_handler(spot)
-
-    async def unlock_pass_handler(self, sid: str) -> None:
+    def unlock_pass_handler(self, sid: str) -> bool:
         spot: int = self._get_spot(sid)
         try:
-            await self.maybe_unlock_pass_turn(spot)
+            self.maybe_unlock_pass_turn(spot)
         except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
-
-    async def _unlock_pass(self, spot: int) -> None:
-        await self._lock_if_unlocked(spot)
-        self._pass_unlocked[spot] = True
-        await self._emit(
-            "set_pass_unlocked",
-            {"pass_unlocked": True},
-            room=self._get_sid(spot),
-        )
+            self._emit_alert(str(e), spot)
+            return False
+        return True
 
-    async def _lock_pass(self, spot: int) -> None:
-        super()._lock_pass(spot)
-        await self._emit(
-            "set_pass_unlocked",
-            {"pass_unlocked": False},
-            room=self._get_sid(spot),
-        )
-
-    async def pass_handler(self, sid: str) -> None:
+    def pass_handler(self, sid: str) -> bool:
         spot: int = self._get_spot(sid)
         try:
-            await self.maybe_pass_turn(spot)
+            self.maybe_pass_turn(spot)
         except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
-
-    async def _pass_turn(self, spot: int) -> None:
-        """
-        NOTE: logic copy/pasted from base; must update manually
-              adds dot color setting and a fat gather
-        """
-        assert self._pass_unlocked[spot], "pass called without unlocking"
-        self._num_consecutive_passes += 1
-        await gather(
-            self._stop_timer(
-                "turn" if not self._is_using_reserve_time(spot) else "reserve",
-                spot,
-            ),
-            self._lock_pass(spot),
-            self._message(f"⏭️ {self._names[spot]} passed"),
-            self._set_dot_color(spot, "yellow"),
-            self._post_pass_handler(),
-        )
-
-    async def _clear_hand_in_play(self) -> None:
-        super()._clear_hand_in_play()
-        await self._emit_to_players("clear_hand_in_play", {})
+            self._emit_alert(str(e), spot)
+            return False
+        return True
 
     # trading related methods
 
-    async def _set_trading(
-        self, trading: bool, *, cancel: bool = True
-    ) -> None:
-        """
-        NOTE: logic copy/pasted from base; must update manually
-        cancel: whether to cancel the trading timer; this should be
-                False when the handling trading timeout 
-        """
-        self.trading = trading
-        await self._emit_to_players("set_trading", {"trading": trading})
-        range_4 = range(4)
-        if trading:
-            await gather(
-                *[self._set_dot_color(spot, "red") for spot in range_4],
-                self._emit(
-                    "set_on_turn",
-                    {"on_turn": False},
-                    room=self._current_player_sid,
-                ),
-                self._clear_hand_in_play(),
-                self._setup_round(),
-                self._set_time("trading", self._trading_time, start=True),
-                self._message("💱 trading has begun"),
-            )
-
-            # timer related attributes
-            self._timers = [None for _ in range_4]
-            self._turn_times = [0 for _ in range_4]
-            self._turn_time_use_starts = [None for _ in range_4]
-            self._reserve_times: List[float] = [
-                self._reserve_time for _ in range_4
-            ]
-            self._reserve_time_use_starts: List[datetime] = [
-                None for _ in range_4
-            ]
-
-            # game related attributes
-            self._current_player = None
-            self._hand_in_play = base_hand
-            self._num_consecutive_passes: int = 0
-            self._finishing_last_played: bool = False
-            self._unlocked: List[bool] = [False for _ in range_4]
-            self._pass_unlocked: List[bool] = [False for _ in range_4]
-        else:  # elif not trading
-            await self._stop_timer("trading", cancel=cancel)
-            # trading related attributes
-            self._selected_asking_options: List[Optional[int]] = [
-                None for _ in range_4
-            ]
-            self._already_asked: List[Set[int]] = [set() for _ in range_4]
-            self._waiting: List[bool] = [False for _ in range_4]
-            self._giving_options: List[Optional[Set[int]]] = [
-                set() for _ in range_4
-            ]
-            self._gives: List[int] = [0 for _ in range_4]
-            self._takes: List[int] = [0 for _ in range_4]
-            self._given: List[Set[int]] = [set() for _ in range_4]
-            self._taken: List[Set[int]] = [set() for _ in range_4]
-
-            # game related attributes
-            self._positions.clear()
-            await self.start_round(setup=False)
-
-    async def rank_handler(self, sid: str, rank: int) -> None:
+    def rank_handler(self, sid: str, rank: int) -> bool:
         spot: int = self._get_spot(sid)
         try:
-            await self.maybe_set_selected_asking_option(spot, rank)
-        except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
-
-    async def maybe_unlock_ask_handler(self, spot: int, sid: str) -> None:
-        try:
-            await self.maybe_unlock_ask(spot)
+            self.maybe_set_selected_asking_option(spot, rank)
         except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
+            self._emit_alert(str(e), spot)
+            return False
+        return True
 
-    async def ask_handler(self, sid: str) -> None:
+    def ask_handler(self, sid: str) -> bool:
         spot: int = self._get_spot(sid)
         try:
-            await self.ask_for_card(spot)
+            self.ask_for_card(spot)
         except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
-
-    async def _set_selected_asking_option(self, spot: int, rank: int) -> None:
-        """
-        NOTE: logic copy/pasted from base; must update manually
-              old rank is required for 
-        """
-        old_rank: int = self._selected_asking_options[spot]
-        self._selected_asking_options[spot] = rank
-        if rank:  # selecting asking option
-            await self._chambers[spot].deselect_selected()
-        await self._emit(
-            "set_asking_option",
-            {"old_rank": old_rank, "new_rank": rank},
-            room=self._get_sid(spot),
-        )
+            self._emit_alert(str(e), spot)
+            return False
+        return True
 
-    async def maybe_unlock_give_handler(self, spot: int, sid: str) -> None:
-        try:
-            await self.maybe_unlock_give(spot)
-        except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
-
-    async def give_handler(self, sid: str) -> None:
+    def give_handler(self, sid: str) -> bool:
         spot: int = self._get_spot(sid)
         try:
-            await self.give_card(spot)
+            self.give_card(spot)
         except PresidentsError as e:
-            await self._emit_alert(str(e), sid)
-
-    async def give_card(
-        self, spot: int, *, auto_trading: bool = False
-    ) -> None:
-        """
-        NOTE: logic copy/pasted from base; must update manually
-              added remaining cards emits for giver and receiver and
-              gathers
-        """
-        if not self._unlocked[spot]:
-            # await self.lock(spot)  # TODO doing this should be part of resetting the DOM, say
-            raise PresidentsError(
-                "you must unlock before giving", permitted=False
-            )
-        await self._stop_timer("turn", spot)  # stop giving time
-        card = self._get_current_hand(spot)[4]
-        giver_chamber: Chamber = self._chambers[spot]
-        receiver_spot: int = self._get_opposing_position_spot(spot)
-        receiver_chamber: Chamber = self._chambers[receiver_spot]
-        await gather(
-            giver_chamber.remove_card(card), receiver_chamber.add_card(card)
-        )
-        # separate gathers because chamber must update num_cards
-        await gather(
-            *[
-                self._emit_to_players(
-                    "set_cards_remaining",
-                    {"spot": spot, "cards_remaining": chamber.num_cards},
-                )
-                # list comprehensions evaluate in new frame so orig spot
-                # is not overwritten here
-                for spot, chamber in zip(
-                    [spot, receiver_spot], [giver_chamber, receiver_chamber]
-                )
-            ],
-            self._message(
-                f"🎁 {self._names[spot]} gives {self._names[receiver_spot]} a card"
-            ),
-        )
-        if self._is_asker(spot):
-            self._add_to_given(spot, card)
-            await self._decrement_gives(spot, auto_trading=auto_trading)
-        elif self._is_giver(spot):
-            await gather(
-                self._clear_giving_options(spot),
-                self._decrement_takes(
-                    receiver_spot, auto_trading=auto_trading
-                ),
-            )
-            self._add_to_taken(receiver_spot, card)
-            self._waiting[receiver_spot] = False
-        await self.lock(spot)
-
-    async def _set_giving_options(
-        self, spot: int, giving_options: Set[int]
-    ) -> None:
-        super()._set_giving_options(spot, giving_options)
-        await self._emit(
-            "set_giving_options",
-            {"options": list(giving_options), "highlight": True},
-            room=self._get_sid(spot),
-        )
-
-    async def _clear_giving_options(self, spot: int) -> None:
-        await self._emit(
-            "set_giving_options",
-            {"options": list(self._giving_options[spot]), "highlight": False},
-            room=self._get_sid(spot),
-        )
-        super()._clear_giving_options(spot)
+            self._emit_alert(str(e), spot)
+            return False
+        return True
 
     # misc
 
-    async def unlock_handler(self, sid: str) -> None:
+    def unlock_handler(self, sid: str) -> bool:
         spot: int = self._get_spot(sid)
-        if self.trading:
-            if self._is_asking(spot):
-                await self.maybe_unlock_ask_handler(spot, sid)
+        try:
+            if not self.trading:
+                self.maybe_unlock_play(spot)
+            elif self._is_asking(spot):
+                self.maybe_unlock_ask(spot)
             elif self._is_giving(spot):
-                await self.maybe_unlock_give_handler(spot, sid)
+                self.maybe_unlock_give(spot)
             else:
-                await self._emit_alert(
+                raise PresidentsError(
                     "you must select something before attempting to unlock",
-                    sid,
+                    permitted=True,
                 )
-        else:
-            await self._maybe_unlock_play_handler(spot, sid)
-
-    async def lock_handler(self, sid: str) -> None:
-        await self.lock(self._get_spot(sid))
-
-    async def _unlock(self, spot: int) -> None:
-        await gather(
-            self._emit(
-                "set_unlocked", {"unlocked": True}, room=self._get_sid(spot)
-            ),
-            self._lock_if_pass_unlocked(spot),
-        )
-        self._unlocked[spot] = True
+        except PresidentsError as e:
+            self._emit_alert(str(e), spot)
+            return False
+        return True
 
-    async def lock(self, spot: int) -> None:
-        super().lock(spot)
-        await self._emit(
-            "set_unlocked", {"unlocked": False}, room=self._get_sid(spot)
-        )
+    def lock_handler(self, sid: str) -> bool:
+        self.lock(self._get_spot(sid))
+        return True
 
-    async def _message(self, message: str) -> None:
-        await self._emit_to_players("message", {"message": message})
-        super()._message(message)
+    def actions_handler(self, sid: str, actions: Sequence[int]) -> int:
+        """
+        Handles a frame of actions (codes of GAME_ACTION_DICT), e.g. the
+        cards of a hand followed by unlock and play, in order as a single
+        message, so no other action or timeout is handled between them
+        and their events are sent together.
+
+        The frame stops at the first action that fails, whose alert is
+        emitted as usual; the actions before it stay done and those after
+        it are dropped. Returns the number of actions done, i.e. the
+        frame's length if all of them were.
+        """
+        for num_done, code in enumerate(actions):
+            action, kwargs = GAME_ACTION_DICT[code]
+            if not getattr(self, f"{action}_handler")(sid, **kwargs):
+                return num_done
+        return len(actions)
+
+    def acked_handler(
+        self, sid: str, seq: int, handler: Callable, *args, **kwargs
+    ) -> None:
+        """
+        Calls handler (e.g. card_handler) with sid, args and kwargs for
+        an action sent without waiting for its result; the result is sent
+        to sid as an "ack" event with the action's sequence number
+        instead, together with the action's events.
+
+        Sequence numbers increase with each action a sid sends, so an
+        action whose sequence number is not greater than that of the
+        sid's last acked action is a retry and is not handled again: a
+        retry of the last action is acked again with its result and
+        older ones are dropped.
+        """
+        last_seq, result = self._acks.get(sid, (0, 0))
+        if seq < last_seq:
+            return
+        if seq > last_seq:
+            result = int(handler(sid, *args, **kwargs))
+            self._acks[sid] = (seq, result)
+        self._emit("ack", {"seq": seq, "result": result}, self._get_spot(sid))
 
     # getters
 
@@ -773,116 +457,72 @@ class EmittingGame(Game):
 
     # setters
 
-    async def _set_name(self, **kwargs) -> None:
-        super()._set_name(**kwargs)
-        # TODO: make this emit single name plus the spot after vue 3 :)
-        await self._emit_to_players(
-            "set_names",
-            {"names": ["" if name is None else name for name in self._names]},
-        )
-
-    async def _set_hand_in_play(self, hand: Hand) -> None:
-        if hand.is_empty or not hand.is_valid:
-            raise Exception("hand is empty or invalid wtf ???")  # TODO
+    def _set_hand_in_play(self, hand: Hand) -> None:
         super()._set_hand_in_play(hand)
-        await self._emit_to_players(
-            "set_hand_in_play",
-            {
-                "hand_in_play": hand.to_list(),
-                "hand_in_play_desc": hand.id_desc,
-            },
-        )
-
-    async def _set_asker(
-        self, spot: int, asker: bool, takes_and_gives: int
-    ) -> None:
-        await gather(
-            self._set_takes(spot, takes_and_gives),
-            self._set_gives(spot, takes_and_gives),
-            self._emit(
-                "set_asker", {"asker": asker}, room=self._get_sid(spot)
-            ),
-        )
-
-    async def _set_giver(self, spot: int, giver: bool) -> None:
-        await self._emit(
-            "set_giver", {"giver": giver}, room=self._get_sid(spot)
-        )
-
-    async def _set_takes(self, spot: int, takes: int) -> None:
-        super()._set_takes(spot, takes)
-        await self._emit(
-            "set_takes", {"takes": takes}, room=self._get_sid(spot)
-        )
-
-    async def _set_gives(self, spot: int, gives: int) -> None:
-        super()._set_gives(spot, gives)
-        await self._emit(
-            "set_gives", {"gives": gives}, room=self._get_sid(spot)
-        )
-
-    def _add_to_already_asked(self, spot: int, value: int) -> None:
-        super()._add_to_already_asked(spot, value)
-        # await self._emit('remove_asking_option', {'value': value}, self._get_sid(spot))
-
-    async def _set_dot_color(self, spot: int, dot_color: str) -> None:
-        await self._emit_to_players(
-            "set_dot_color", {"spot": spot, "dot_color": dot_color}
-        )
-        self._dot_colors[spot] = dot_color
+        self._hand_plays.append(hash(hand))
 
     # emitters
 
-    async def _emit(self, *args, **kwargs) -> None:
-        await self._sio.emit(*args, **kwargs)
-
-    async def _emit_to_players(self, *args, **kwargs):
+    async def flush(self) -> None:
         """
-        Emits to all players by default. Pass in skip_sid with a string
-        or a list to skip players.
-
-        The difference between this and _emit_to_server is that the
-        latter emits to spectators as well.
-
-        TODO: to should work instead of room
+        Sends the events queued since the last flush and casts the hands
+        played since then; the game's actor calls this once per drain.
+
+        Each sid gets its events as a single "batch" event whose payload
+        is the events encoded in order as a binary attachment (see
+        event_codec); each event is encoded once however many batches it
+        goes in. The events for all players are broadcast through the
+        game's players room, skipping the sids with events of their own,
+        which get their whole batch individually (see outbox.room_batch);
+        i.e. one publish for the room plus one per sid with private
+        events.
+        Sockets enter the room on the game server before being added as
+        players (see game_server.add_player) and leave it on disconnect.
         """
-        maybe_skip_sid = kwargs.get("skip_sid")
-        if not maybe_skip_sid:
-            await gather(
-                *[
-                    self._emit(*args, room=sid, **kwargs)
-                    for sid in self._spot_sid_bidict.values()
-                ]
+        events: List[Event] = self.drain_outbox()
+        if events:
+            self._changed = True
+        shared, batches = room_batch(
+            (event._replace(payload=encode_event(event)) for event in events),
+            self._spot_sid_bidict,
+        )
+        aws = [
+            self._sio.emit("batch", _encoded_batch(events), room=sid)
+            for sid, events in batches.items()
+        ]
+        if shared:
+            shared_batch: bytes = _encoded_batch(shared)
+            aws.append(
+                self._sio.emit(
+                    "batch",
+                    shared_batch,
+                    room=players_room(self.game_id),
+                    skip_sid=list(batches) or None,
+                )
             )
-        elif isinstance(maybe_skip_sid, str):
-            await gather(
-                *[
-                    self._emit(*args, room=sid, **kwargs)
-                    for sid in self._spot_sid_bidict.values()
-                    if sid != maybe_skip_sid
-                ]
+        aws.extend(
+            self.cast_hand_play(hand_hash) for hand_hash in self._hand_plays
+        )
+        self._hand_plays = list()
+        await gather(*aws)
+        # after sending so storing adds no latency to the events; the
+        # action log first so a stored checkpoint's actions are always
+        # stored (see checkpoint); retried on the next flush if storing
+        # fails
+        if (
+            self._store_actions is not None
+            and len(self.action_log) > self._actions_stored
+        ):
+            size: int = len(self.action_log)
+            await self._store_actions(
+                self.game_id, self.action_log.tail(self._actions_stored)
             )
-        elif isinstance(maybe_skip_sid, list):
-            await gather(
-                *[
-                    self._emit(*args, room=sid, **kwargs)
-                    for sid in self._spot_sid_bidict.values()
-                    if sid not in maybe_skip_sid
-                ]
+            self._actions_stored = size
+        if self._checkpoint_due and self._store_checkpoint is not None:
+            await self._store_checkpoint(
+                self.game_id, self.checkpoint().to_bytes()
             )
-        else:
-            raise AssertionError("skip_sid can only be a string or a list")
-
-    # TODO
-    async def _emit_to_spectators(self, *args, **kwargs):
-        ...
-
-    # TODO
-    async def _emit_to_server(self, *args, **kwargs):
-        """
-        Emits to players and spectators
-        """
-        ...
+            self._checkpoint_due = self._changed = False
 
     async def cast_event(self, event):
         await self._events_counter.cast(event)
@@ -891,10 +531,44 @@ class EmittingGame(Game):
         await self._hand_play_processor.cast(
             HandPlay(game_id=self.game_id, hand_hash=hand_hash)
         )
-    
-
 
     # alerting related methods
 
-    async def _emit_alert(self, alert, sid: str) -> None:
-        await self._emit("alert", {"alert": alert}, room=sid)
+    def _emit_alert(self, alert: str, spot: int) -> None:
+        self._emit("alert", {"alert": alert}, spot)
+
+
+def _encoded_batch(events: List[List[Any]]) -> bytes:
+    # the [name, encoded event] pairs of a batch; see flush
+    return encode_batch(encoded for _, encoded in events)
+
+
+def _continued_clock(
+    clock: Callable[[], float], start: float
+) -> Callable[[], float]:
+    # clock whose time goes on from start, e.g. a checkpoint's time
+    offset: float = start - clock()
+    return lambda: clock() + offset
+
+
+def _rng_state(rng: np.random.Generator) -> Tuple[int, int, bool, int]:
+    # see EmittingGameCheckpoint.rng_state
+    state: Dict[str, Any] = rng.bit_generator.state
+    return (
+        state["state"]["state"],
+        state["state"]["inc"],
+        bool(state["has_uint32"]),
+        state["uinteger"],
+    )
+
+
+def _set_rng_state(
+    rng: np.random.Generator, rng_state: Tuple[int, int, bool, int]
+) -> None:
+    state, inc, has_uint32, uinteger = rng_state
+    rng.bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {"state": state, "inc": inc},
+        "has_uint32": int(has_uint32),
+        "uinteger": uinteger,
+    }
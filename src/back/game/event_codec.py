@@ -0,0 +1,204 @@
+"""
+Compact binary encoding of outbound events, sent to clients as Socket.IO
+binary attachments instead of JSON; see EmittingGame.flush and
+front/utils/event_codec.js, which decodes them.
+
+A batch is the version followed by its events, each the event's code
+(its index in EVENTS), its fixed size fields (little endian, in order)
+and then its strings (length prefixed UTF-8). Cards are single bytes,
+sets of cards (e.g. hands and giving options) are card masks (card c
+is bit c - 1), stored hands are identified by their hash (see
+FrozenHand) and hand descriptions by their hand ids (see id_desc_dict).
+Events are encoded once each, however many batches they go in.
+"""
+
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from .checkpoint import TIMERS
+from .outbox import Event
+from .utils import cards_mask, id_desc_dict, mask_cards
+
+
+VERSION = 1
+# the struct format of each kind of field and how it is encoded and
+# decoded; "spot?" fields are left out of payloads without them and
+# "rank" fields can be None
+FIELD_KINDS: Dict[str, Tuple[str, Callable, Callable]] = {
+    "uint8": ("B", int, int),
+    "uint32": ("I", int, int),
+    "bool": ("?", bool, bool),
+    "float": ("d", float, float),
+    "hand_id": ("I", int, int),
+    "cards": ("Q", cards_mask, lambda mask: list(mask_cards(mask))),
+    "hand_desc": (
+        "B",
+        lambda desc: _DESC_IDS[desc],
+        lambda id_: id_desc_dict[id_],
+    ),
+    "which": ("B", TIMERS.index, TIMERS.__getitem__),
+    "spot?": ("b", lambda spot: -1 if spot is None else spot, int),
+    "rank": (
+        "b",
+        lambda rank: -1 if rank is None else rank,
+        lambda rank: None if rank == -1 else rank,
+    ),
+}
+# string fields follow the fixed size ones; "strings" are lists
+STRING_KINDS = ("string", "strings")
+# the events and their payloads' fields
+EVENTS: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...] = (
+    ("add_card", (("card", "uint8"),)),
+    ("remove_card", (("card", "uint8"),)),
+    ("select_card", (("card", "uint8"),)),
+    ("deselect_card", (("card", "uint8"),)),
+    ("clear_cards", ()),
+    ("update_current_hand_str", (("str", "string"),)),
+    (
+        "store_hand",
+        (("id", "hand_id"), ("cards", "cards"), ("id_desc", "hand_desc")),
+    ),
+    ("select_hand", (("id", "hand_id"),)),
+    ("deselect_hand", (("id", "hand_id"),)),
+    ("set_spot", (("spot", "uint8"),)),
+    ("set_names", (("names", "strings"),)),
+    ("set_dot_color", (("spot", "uint8"), ("dot_color", "string"))),
+    ("set_cards_remaining", (("spot", "uint8"), ("cards_remaining", "uint8"))),
+    (
+        "set_hand_in_play",
+        (("hand_in_play", "cards"), ("hand_in_play_desc", "hand_desc")),
+    ),
+    ("clear_hand_in_play", ()),
+    ("set_on_turn", (("on_turn", "bool"),)),
+    ("set_unlocked", (("unlocked", "bool"),)),
+    ("set_pass_unlocked", (("pass_unlocked", "bool"),)),
+    ("set_paused", (("paused", "bool"),)),
+    ("set_trading", (("trading", "bool"),)),
+    ("set_asker", (("asker", "bool"),)),
+    ("set_giver", (("giver", "bool"),)),
+    ("set_takes", (("takes", "uint8"),)),
+    ("set_gives", (("gives", "uint8"),)),
+    ("set_giving_options", (("options", "cards"), ("highlight", "bool"))),
+    ("set_asking_option", (("old_rank", "rank"), ("new_rank", "rank"))),
+    ("set_time", (("which", "which"), ("spot", "spot?"), ("time", "float"))),
+    (
+        "set_deadline",
+        (("which", "which"), ("spot", "spot?"), ("deadline", "float")),
+    ),
+    ("message", (("message", "string"),)),
+    ("alert", (("alert", "string"),)),
+    ("ack", (("seq", "uint32"), ("result", "uint32"))),
+    ("remove_hand", (("id", "hand_id"),)),
+)
+EVENT_CODES: Dict[str, int] = {
+    name: code for code, (name, _) in enumerate(EVENTS)
+}
+
+_DESC_IDS: Dict[str, int] = {desc: id_ for id_, desc in id_desc_dict.items()}
+_CODE = struct.Struct("<B")
+_LENGTH = struct.Struct("<H")
+_COUNT = struct.Struct("<B")
+# each event's struct of its fixed size fields, those fields and its
+# string fields
+_LAYOUTS: List[
+    Tuple[struct.Struct, List[Tuple[str, str]], List[Tuple[str, str]]]
+] = [
+    (
+        struct.Struct(
+            "<"
+            + "".join(
+                FIELD_KINDS[kind][0]
+                for _, kind in fields
+                if kind not in STRING_KINDS
+            )
+        ),
+        [field for field in fields if field[1] not in STRING_KINDS],
+        [field for field in fields if field[1] in STRING_KINDS],
+    )
+    for _, fields in EVENTS
+]
+
+
+class EventCodecError(RuntimeError):
+    pass
+
+
+def encode_event(event: Event) -> bytes:
+    """
+    The event's code and payload, ready to be joined into batches; the
+    spot it is for is not encoded.
+    """
+    _, name, payload = event
+    code: int = EVENT_CODES[name]
+    fixed, fixed_fields, string_fields = _LAYOUTS[code]
+    parts: List[bytes] = [
+        _CODE.pack(code),
+        fixed.pack(
+            *(
+                FIELD_KINDS[kind][1](payload.get(key))
+                for key, kind in fixed_fields
+            )
+        ),
+    ]
+    for key, kind in string_fields:
+        if kind == "string":
+            _pack_string(parts, payload[key])
+        else:
+            parts.append(_COUNT.pack(len(payload[key])))
+            for string in payload[key]:
+                _pack_string(parts, string)
+    return b"".join(parts)
+
+
+def encode_batch(encoded_events: Iterable[bytes]) -> bytes:
+    """
+    Batch of events already encoded with encode_event, in order.
+    """
+    return bytes((VERSION,)) + b"".join(encoded_events)
+
+
+def decode_batch(data: bytes) -> List[List[Any]]:
+    """
+    The [name, payload] pairs of a batch's events, i.e. what batches
+    were before they were encoded; see outbox.batch.
+    """
+    version = data[0] if data else None
+    if version != VERSION:
+        raise EventCodecError(f"cannot read event batch of version {version}")
+    events: List[List[Any]] = list()
+    offset: int = 1
+    while offset < len(data):
+        (code,) = _CODE.unpack_from(data, offset)
+        offset += _CODE.size
+        fixed, fixed_fields, string_fields = _LAYOUTS[code]
+        payload: Dict[str, Any] = dict()
+        for (key, kind), value in zip(
+            fixed_fields, fixed.unpack_from(data, offset)
+        ):
+            if kind != "spot?" or value != -1:
+                payload[key] = FIELD_KINDS[kind][2](value)
+        offset += fixed.size
+        for key, kind in string_fields:
+            if kind == "string":
+                payload[key], offset = _unpack_string(data, offset)
+            else:
+                (count,) = _COUNT.unpack_from(data, offset)
+                offset += _COUNT.size
+                payload[key] = list()
+                for _ in range(count):
+                    string, offset = _unpack_string(data, offset)
+                    payload[key].append(string)
+        events.append([EVENTS[code][0], payload])
+    return events
+
+
+def _pack_string(parts: List[bytes], string: str) -> None:
+    encoded: bytes = string.encode()
+    parts.append(_LENGTH.pack(len(encoded)))
+    parts.append(encoded)
+
+
+def _unpack_string(data: bytes, offset: int) -> Tuple[str, int]:
+    (length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    return data[offset : offset + length].decode(), offset + length
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from .hand import Hand, hand_table
+from .bit_hand import BitHand
+from .utils import (
+    hand_key,
+    card_names,
+    id_desc_dict,
+    combo_ids,
+    STRENGTH_CLASS_SHIFT,
+)
+
+
+class FrozenHand:
+    """
+    Immutable, interned hand. There is exactly one FrozenHand per card
+    set, i.e. FrozenHand([1, 2]) is FrozenHand(Hand([2, 1])), so they can
+    be shared by every game and compared and hashed by identity. Used
+    for the hands that do not change once made: stored hands, played
+    hands and the hand in play.
+
+    Supports the read only part of Hand's API (indexing uses the same
+    zero-padded, sorted layout) and compares with Hand and BitHand.
+
+    Only valid hands and the empty hand can be frozen; there are only a
+    few thousand of them so the interned hands are never evicted.
+    """
+
+    __slots__ = ("_cards", "_num_cards", "_id", "_strength", "_key", "_str")
+
+    _interned: Dict[int, FrozenHand] = dict()
+
+    def __new__(cls, cards: Iterable[int] = ()) -> FrozenHand:
+        if isinstance(cards, (Hand, BitHand, FrozenHand)):
+            key = hash(cards)
+        else:
+            cards = sorted(int(card) for card in cards if card != 0)
+            key = hand_key(cards)
+        try:
+            return cls._interned[key]
+        except KeyError:
+            pass
+        hand = super().__new__(cls)
+        cards = [int(card) for card in cards]
+        hand._num_cards = len(cards)
+        hand._cards = (0,) * (5 - hand._num_cards) + tuple(cards)
+        hand._key = key
+        hand._strength = strength = hand_table[key]
+        assert strength or not cards, "only valid hands can be frozen"
+        hand._id = combo_ids[strength >> STRENGTH_CLASS_SHIFT]
+        hand._str = (
+            " ".join(card_names[card] for card in cards)
+            + f": {id_desc_dict[hand._id]}"
+        )
+        cls._interned[key] = hand
+        return hand
+
+    @classmethod
+    def copy(cls, hand: FrozenHand) -> FrozenHand:
+        return hand
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, Tuple]:
+        return self._cards[index]
+
+    def __hash__(self) -> int:
+        return self._key
+
+    def __contains__(self, card: int) -> bool:
+        assert 1 <= card <= 52, "invalid card cannot be in hand."
+        return card in self._cards
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._cards[5 - self._num_cards :])
+
+    def __str__(self) -> str:
+        return self._str
+
+    def __repr__(self) -> str:
+        return (
+            f"<FrozenHand {id(self)}; cards: {list(self._cards)}; id:"
+            f" {self._id}>"
+        )
+
+    def __len__(self) -> int:
+        return self._num_cards
+
+    def __reduce__(self) -> Tuple:
+        # unpickled hands are interned too
+        return FrozenHand, (tuple(self),)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenHand):
+            return self is other
+        if isinstance(other, (Hand, BitHand)):
+            return self.to_list() == other.to_list()
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        if not isinstance(other, (FrozenHand, Hand, BitHand)):
+            return NotImplemented
+        return not self == other
+
+    # comparability rules and the properties only depend on the id, the
+    # strength and the padded indexing, all of which are shared with
+    # Hand
+    _is_comparable = Hand._is_comparable
+    __lt__ = Hand.__lt__
+    __gt__ = Hand.__gt__
+    __le__ = Hand.__le__
+    __ge__ = Hand.__ge__
+
+    is_empty = Hand.is_empty
+    is_single = Hand.is_single
+    is_double = Hand.is_double
+    is_triple = Hand.is_triple
+    is_fullhouse = Hand.is_fullhouse
+    is_straight = Hand.is_straight
+    is_bomb = Hand.is_bomb
+    is_valid = Hand.is_valid
+    strength = Hand.strength
+    id_desc = Hand.id_desc
+    id_str = Hand.id_str
+
+    @property
+    def is_full(self) -> bool:
+        return self._num_cards == 5
+
+    def to_list(self) -> List[int]:
+        return list(self)
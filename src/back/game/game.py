@@ -1,22 +1,38 @@
+from __future__ import annotations
+
+import inspect
 import random
-from itertools import cycle
+from copy import copy
+from functools import wraps
+from time import monotonic, time
 from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
     Generator,
     Iterable,
     List,
+    NamedTuple,
     Optional,
     Set,
+    Tuple,
+    Type,
     Union,
 )
-from datetime import datetime
 
 import numpy as np
 
+from .action_log import ActionLog, LoggedAction
 from .hand import Hand, DuplicateCardError, FullHandError, NotPlayableOnError
-from .chamber import Chamber, CardNotInChamberError
+from .frozen_hand import FrozenHand
+from .chamber import (
+    Chamber,
+    ChamberSnapshot,
+    CardNotInChamberError,
+    HandNotStoredError,
+)
+from .outbox import Event, Outbox
 from .utils import rank_articler
 from ..utils import NoopTimer
 import logging
@@ -40,8 +56,35 @@ from uuid import uuid4
 #       from one place it doesn't make sense to check a bunch of things
 #       that must have been true in the first place; or is it?
 # TODO: drop support for eventlet timer; actually maybe don't?
-# TODO: add notes to point out methods that are manually async
-#       overwritten
+
+
+def logged(action: Callable) -> Callable:
+    """
+    Logs the game's calls of action in its action log, if it has one,
+    unless another logged action makes them. The game's time is frozen
+    while the action is taken, see Game._time.
+    """
+    name: str = action.__name__
+    signature: inspect.Signature = inspect.signature(action)
+
+    @wraps(action)
+    def logged_action(self: Game, *args, **kwargs):
+        if self.action_log is None or self._action_time is not None:
+            return action(self, *args, **kwargs)
+        self._action_time = now = self._clock()
+        try:
+            # logged by name however the action is called, and even if
+            # it fails since it fails the same way when replayed
+            bound: inspect.BoundArguments = signature.bind(
+                self, *args, **kwargs
+            )
+            bound.apply_defaults()
+            self.action_log.append(name, now, bound.arguments)
+            return action(self, *args, **kwargs)
+        finally:
+            self._action_time = None
+
+    return logged_action
 
 
 class Game:
@@ -50,6 +93,13 @@ class Game:
     confirmation/allowal of certain moves (e.g. unlocking play,
     unlocking pass, etc.), and then actually carrying out those moves
     and changing the game state as necessary.
+
+    The game does no IO: the events telling players about the changes
+    are queued in its outbox, see drain_outbox.
+
+    Games are seeded, i.e. the seed decides the deals and the spots
+    players are added to; if log_actions, the game's actions are logged
+    in its action_log so that it can be replayed, see replay.
     """
 
     TURN_TIME = 30
@@ -66,6 +116,10 @@ class Game:
         reserve_time: float = RESERVE_TIME,
         trading_time: float = TRADING_TIME,
         giving_time: float = GIVING_TIME,
+        chamber_class: Type[Chamber] = Chamber,
+        seed: int = None,
+        log_actions: bool = False,
+        clock: Callable[[], float] = monotonic,
     ) -> None:
 
         range_4 = range(4)  # software engineering
@@ -75,6 +129,21 @@ class Game:
         self.num_players: int = 0
         self._num_consecutive_rounds: int = 0
         self._times_reset: int = 0
+        # events for the players, drained by whatever serves the game
+        self._outbox: Outbox = Outbox()
+        self.seed: int = random.getrandbits(64) if seed is None else seed
+        self._rng: np.random.Generator = np.random.default_rng(self.seed)
+        self.action_log: Optional[ActionLog] = (
+            ActionLog(
+                self.seed, turn_time, reserve_time, trading_time, giving_time
+            )
+            if log_actions
+            else None
+        )
+        # the time of the logged action being taken; see logged
+        self._action_time: Optional[float] = None
+        # returns the time timer deadlines are in; see _time
+        self._clock: Callable[[], float] = clock
 
         # timer related attributes
         # timer should be function that returns a non-blocking timer
@@ -89,17 +158,22 @@ class Game:
         self._turn_time: float = turn_time
         # these turn time lists are used for both playing and giving
         self._turn_times: List[float] = [0 for _ in range_4]  # remaining
-        self._turn_time_use_starts: List[datetime] = [None for _ in range_4]
+        # deadlines (time.monotonic times) of the running timers; None
+        # for timers that are not running
+        self._turn_deadlines: List[Optional[float]] = [None for _ in range_4]
         self._reserve_time: float = reserve_time
         # remaining
         self._reserve_times: List[float] = [reserve_time for _ in range_4]
-        self._reserve_time_use_starts: List[datetime] = [None for _ in range_4]
+        self._reserve_deadlines: List[Optional[float]] = [
+            None for _ in range_4
+        ]
         self._trading_timer = None
         self._trading_time = trading_time
         self._trading_time_remaining = trading_time
-        self._trading_time_start: datetime = None
+        self._trading_deadline: Optional[float] = None
         self._giving_time = giving_time
-        self._paused_timers = list()
+        # which timers (and for which spots) to restart on resuming
+        self._paused_timers: List[Tuple[str, Optional[int]]] = list()
 
         # setup and ID related attributes
         self._open_spots: Set[int] = {i for i in range_4}
@@ -108,7 +182,12 @@ class Game:
         # game related attributes
         self._turn_manager: TurnManager = None
         self._current_player: int = None
-        self._chambers: List[Chamber] = [Chamber() for _ in range_4]
+        # Chamber or an alternative backend with the same API, e.g.
+        # BitChamber
+        self._chamber_class: Type[Chamber] = chamber_class
+        self._chambers: List[Chamber] = [
+            self._make_chamber(spot) for spot in range_4
+        ]
         # when hand in play is base_hand, only the 3 of clubs can be
         # played on it; when it is None, anyhand can be played on it
         self._hand_in_play: Union[BaseHand, Hand] = base_hand
@@ -117,6 +196,7 @@ class Game:
         self._positions: List[int] = list()
         self._unlocked: List[bool] = [False for _ in range_4]
         self._pass_unlocked: List[bool] = [False for _ in range_4]
+        self._dot_colors: List[str] = ["red" for _ in range_4]
 
         # trading related attributes
         self.trading: bool = False
@@ -152,23 +232,26 @@ class Game:
         self._timers = [None for _ in range_4]
         self._turn_time = turn_time or self._turn_time
         self._turn_times = [None for _ in range_4]
-        self._turn_time_use_starts = [None for _ in range_4]
+        self._turn_deadlines = [None for _ in range_4]
         self._reserve_time = reserve_time or self._reserve_time
         self._reserve_times = [self._reserve_time for _ in range_4]
-        self._reserve_time_use_starts = [None for _ in range_4]
+        self._reserve_deadlines = [None for _ in range_4]
+        # e.g. those of a restored game
+        self._paused_timers = list()
         # setup and ID related attributes
         self._open_spots = {i for i in range_4}
         self._names = [None for _ in range_4]
         # game related attributes
         self._turn_manager = None
         self._current_player = None
-        self._chambers = [Chamber() for _ in range_4]
+        self._chambers = [self._make_chamber(spot) for spot in range_4]
         self._hand_in_play = None
         self._num_consecutive_passes = 0
         self._finishing_last_played = False
         self._positions = list()
         self._unlocked = [False for _ in range_4]
         self._pass_unlocked = [False for _ in range_4]
+        self._dot_colors = ["red" for _ in range_4]
         # trading related attributes
         self.trading = False
         self._selected_asking_options = [None for _ in range_4]
@@ -182,6 +265,166 @@ class Game:
 
         self._times_reset += 1
 
+    # snapshot related methods
+
+    def snapshot(self) -> GameSnapshot:
+        """
+        Captures everything that determines how the game proceeds, i.e.
+        the chambers, turn state, positions and trading state, but not
+        the game's settings. Running timers are captured as if they were
+        paused now, i.e. with the time they have remaining, so snapshots
+        have no deadlines and mean the same in any process; the game is
+        not changed.
+        """
+        now: float = self._time()
+        turn_times: List[float] = list(self._turn_times)
+        reserve_times: List[float] = list(self._reserve_times)
+        trading_time_remaining: float = self._trading_time_remaining
+        paused_timers = list(self._paused_timers)
+        # like _pause_timers
+        for spot in range(4):
+            if (deadline := self._reserve_deadlines[spot]) is not None:
+                reserve_times[spot] = max(0, deadline - now)
+                paused_timers.append(("reserve", spot))
+            elif (deadline := self._turn_deadlines[spot]) is not None:
+                turn_times[spot] = max(0, deadline - now)
+                paused_timers.append(("turn", spot))
+        if self._trading_deadline is not None:
+            trading_time_remaining = max(0, self._trading_deadline - now)
+            paused_timers.append(("trading", None))
+        turn_manager = self._turn_manager
+        return GameSnapshot(
+            chambers=tuple(chamber.snapshot() for chamber in self._chambers),
+            hand_in_play=self._hand_in_play,
+            current_player=self._current_player,
+            turn_manager=turn_manager and turn_manager.state,
+            num_consecutive_passes=self._num_consecutive_passes,
+            finishing_last_played=self._finishing_last_played,
+            positions=tuple(self._positions),
+            unlocked=tuple(self._unlocked),
+            pass_unlocked=tuple(self._pass_unlocked),
+            trading=self.trading,
+            selected_asking_options=tuple(self._selected_asking_options),
+            already_asked=_freeze(self._already_asked),
+            waiting=tuple(self._waiting),
+            giving_options=_freeze(self._giving_options),
+            gives=tuple(self._gives),
+            takes=tuple(self._takes),
+            given=_freeze(self._given),
+            taken=_freeze(self._taken),
+            names=tuple(self._names),
+            open_spots=frozenset(self._open_spots),
+            num_players=self.num_players,
+            num_consecutive_rounds=self._num_consecutive_rounds,
+            turn_times=tuple(turn_times),
+            reserve_times=tuple(reserve_times),
+            trading_time_remaining=trading_time_remaining,
+            paused_timers=tuple(paused_timers),
+        )
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """
+        Sets the game to the snapshot's state. The game's timers are
+        dropped (not cancelled) and the restored game is paused, i.e. the
+        snapshot's timers are restarted on resuming (see _resume_timers);
+        see Chamber.restore for how the chambers are restored.
+        """
+        range_4 = range(4)
+        self.num_players = snapshot.num_players
+        self._num_consecutive_rounds = snapshot.num_consecutive_rounds
+        # timer related attributes
+        self._timers = [None for _ in range_4]
+        self._turn_times = list(snapshot.turn_times)
+        self._turn_deadlines = [None for _ in range_4]
+        self._reserve_times = list(snapshot.reserve_times)
+        self._reserve_deadlines = [None for _ in range_4]
+        self._trading_timer = None
+        self._trading_time_remaining = snapshot.trading_time_remaining
+        self._trading_deadline = None
+        self._paused_timers = list(snapshot.paused_timers)
+        # setup and ID related attributes
+        self._open_spots = set(snapshot.open_spots)
+        self._names = list(snapshot.names)
+        # game related attributes
+        self._turn_manager = (
+            None
+            if snapshot.turn_manager is None
+            else TurnManager.from_state(snapshot.turn_manager)
+        )
+        self._current_player = snapshot.current_player
+        for chamber, chamber_snapshot in zip(
+            self._chambers, snapshot.chambers
+        ):
+            chamber.restore(chamber_snapshot)
+        self._hand_in_play = snapshot.hand_in_play
+        self._num_consecutive_passes = snapshot.num_consecutive_passes
+        self._finishing_last_played = snapshot.finishing_last_played
+        self._positions = list(snapshot.positions)
+        self._unlocked = list(snapshot.unlocked)
+        self._pass_unlocked = list(snapshot.pass_unlocked)
+        # trading related attributes
+        self.trading = snapshot.trading
+        self._selected_asking_options = list(snapshot.selected_asking_options)
+        self._already_asked = [set(asked) for asked in snapshot.already_asked]
+        self._waiting = list(snapshot.waiting)
+        self._giving_options = [
+            set(options) for options in snapshot.giving_options
+        ]
+        self._gives = list(snapshot.gives)
+        self._takes = list(snapshot.takes)
+        self._given = [set(given) for given in snapshot.given]
+        self._taken = [set(taken) for taken in snapshot.taken]
+
+    def clone(self) -> Game:
+        """
+        Copy of the game that shares no game state with it, e.g. for
+        looking ahead or trying moves out. Settings are shared; the
+        clone queues its events in an outbox of its own and is paused
+        like any restored game (see restore).
+        """
+        game: Game = copy(self)
+        game._outbox = Outbox()
+        # the clone's actions are not the game's
+        game.action_log = None
+        game._chambers = [copy(chamber) for chamber in self._chambers]
+        game.restore(self.snapshot())
+        return game
+
+    # action log related methods
+
+    def take_actions(self, actions: Iterable[LoggedAction]) -> None:
+        """
+        Takes logged actions at their logged times (see _time) without
+        logging them again, e.g. those of a log's tail on top of the
+        checkpoint they came after. The errors of failed actions are
+        ignored as they were when logged.
+        """
+        for time_, name, arguments in actions:
+            self._action_time = time_
+            try:
+                getattr(self, name)(**arguments)
+            except PresidentsError:
+                pass
+            finally:
+                self._action_time = None
+
+    # outbox related methods
+
+    def drain_outbox(self) -> List[Event]:
+        """
+        Events queued since the outbox was last drained, in order.
+        """
+        return self._outbox.drain()
+
+    def _emit(
+        self, name: str, payload: Dict[str, Any], spot: int = None
+    ) -> None:
+        """
+        Queues an event for the player in spot or, if spot is None, for
+        all players.
+        """
+        self._outbox.emit(name, payload, spot)
+
     # properties
 
     @property
@@ -244,38 +487,110 @@ class Game:
 
     # setup related methods
 
+    def _make_chamber(self, spot: int) -> Chamber:
+        return self._chamber_class()
+
     def _rand_open_spot(self) -> int:
         """
         Returns random open spot. Should not happen when there are no
         open spots.
         """
         assert self._open_spots
-        return random.choice(tuple(self._open_spots))
+        return int(self._rng.choice(sorted(self._open_spots)))
 
     def _add_player_to_spot(self, name: str, spot: int) -> None:
         assert self._names[spot] is None, f"player already in spot {spot}"
         self._open_spots.remove(spot)
         self._set_name(spot, name)
         self.num_players += 1
+        if self.is_paused:  # player was added to a game that already started
+            self._emit_full_state(spot)
 
+    @logged
     def add_player(self, name: str, **kwargs) -> None:
         self._add_player_to_spot(
             name=name, spot=self._rand_open_spot(), **kwargs
         )
 
+    @logged
     def remove_player(self, spot: int) -> None:
         self._open_spots.add(spot)
         self._set_name(spot, None)
         self.num_players -= 1
 
     def _make_shuffled_deck(self) -> np.ndarray:
-        return np.sort(np.random.permutation(range(1, 53)).reshape(4, 13))
+        return np.sort(self._rng.permutation(np.arange(1, 53)).reshape(4, 13))
+
+    def _emit_full_state(self, spot: int) -> None:
+        """
+        Everything a player needs to catch up, e.g. after joining a game
+        that was paused.
+        """
+        for card in self._chambers[spot]:
+            self._emit("add_card", {"card": int(card)}, spot)
+        self._emit("set_spot", {"spot": spot}, spot)
+        self._emit(
+            "set_names",
+            {"names": ["" if name is None else name for name in self._names]},
+            spot,
+        )
+        for other_spot in range(4):
+            self._emit(
+                "set_dot_color",
+                {
+                    "spot": other_spot,
+                    "dot_color": self._dot_colors[other_spot],
+                },
+                spot,
+            )
+            self._emit(
+                "set_cards_remaining",
+                {
+                    "spot": other_spot,
+                    "cards_remaining": self._chambers[other_spot].num_cards,
+                },
+                spot,
+            )
+            self._emit_time("turn", other_spot, recipient=spot)
+            self._emit_time("reserve", other_spot, recipient=spot)
+        if self._hand_in_play and self._hand_in_play is not base_hand:
+            self._emit(
+                "set_hand_in_play",
+                {
+                    "hand_in_play": self._hand_in_play.to_list(),
+                    "hand_in_play_desc": self._hand_in_play.id_desc,
+                },
+                spot,
+            )
+        if self.is_paused:
+            self._emit("set_paused", {"paused": True}, spot)
+        if self.trading:
+            self._emit("set_trading", {"trading": True}, spot)
+            self._emit_time("trading", recipient=spot)
+            if self._is_asker(spot):
+                self._emit("set_asker", {"asker": True}, spot)
+            else:
+                self._emit("set_giver", {"giver": True}, spot)
+                if self._giving_options[spot]:
+                    self._emit(
+                        "set_giving_options",
+                        {
+                            "options": list(self._giving_options[spot]),
+                            "highlight": True,
+                        },
+                        spot,
+                    )
 
     def _deal_cards(self, *, deck: List[Iterable[int]] = None) -> None:
         for spot, cards in enumerate(deck or self._make_shuffled_deck()):
             chamber: Chamber = self._chambers[spot]
             chamber.reset()
             chamber.add_cards(cards)
+            self._emit("set_spot", {"spot": spot}, spot)
+            self._emit(
+                "set_cards_remaining",
+                {"spot": spot, "cards_remaining": chamber.num_cards},
+            )
 
     def _make_and_set_turn_manager(self, testing: bool = False) -> None:
         decks = self._get_decks_from_chambers(testing)
@@ -290,6 +605,7 @@ class Game:
         assert self.num_players == 4, "four players required to start round"
         self._deal_cards(deck=deck)
 
+    @logged
     def start_round(
         self,
         *,
@@ -307,17 +623,26 @@ class Game:
         self._next_player()
 
     def _next_player(self) -> None:
-        self._current_player = next(self._turn_manager)  # TODO this mypy error
-        self._set_time("turn", self._turn_time, self._current_player, True)
-        self._message(f"🎲 it's {self._names[self._current_player]}'s turn")
+        # current player is no longer on turn; None on round start
+        if self._current_player is not None:
+            self._emit("set_on_turn", {"on_turn": False}, self._current_player)
+        # TODO this mypy error
+        self._current_player = spot = next(self._turn_manager)
+        self._set_time("turn", self._turn_time, spot, True)
+        self._message(f"🎲 it's {self._names[spot]}'s turn")
+        self._emit("set_on_turn", {"on_turn": True}, spot)
+        self._set_dot_color(spot, "green")
+        if self._hand_in_play is None:  # can play anyhand so can't pass
+            self._lock_if_pass_unlocked(spot)
 
     def _set_time(
         self, which: str, seconds: float, spot: int = None, start: bool = False
     ):
         """
         Stores remaining time for turns (includes playing time, reserve
-        time, and giving time) and for trading; does not start the timer
-        by default. Spot must be given if setting turn times.
+        time, and giving time) and for trading and emits it; starts the
+        timer instead if start, see _start_timer. Spot must be given if
+        setting turn times.
         """
         assert which in ["turn", "reserve", "trading"]
         if which == "turn":
@@ -329,19 +654,31 @@ class Game:
         elif which == "trading":
             assert spot is None
             self._trading_time_remaining = seconds
-
         if start:
             self._start_timer(which, spot)
+        else:
+            self._emit_time(which, spot)
+
+    def _time(self) -> float:
+        """
+        The clock's time, except while a logged action is being taken,
+        when it is the time the action was logged at, so the action
+        computes the same deadlines when replayed.
+        """
+        if self._action_time is not None:
+            return self._action_time
+        return self._clock()
 
     def _start_timer(self, which: str, spot: int = None) -> None:
         """
-        Uses the remaining time.
+        Uses the remaining time; the timer's deadline is stored as a
+        time.monotonic time and emitted, see _emit_time.
         """
-        now = datetime.utcnow()
+        now: float = self._time()
         assert which in ["turn", "reserve", "trading"]
         if which == "turn":
             assert spot is not None
-            self._turn_time_use_starts[spot] = now
+            self._turn_deadlines[spot] = now + self._turn_times[spot]
             self._timers[spot] = self._timer(
                 self._turn_times[spot],
                 self._handle_playing_timeout
@@ -351,18 +688,44 @@ class Game:
             )
         elif which == "reserve":
             assert spot is not None
-            self._reserve_time_use_starts[spot] = now
+            self._reserve_deadlines[spot] = now + self._reserve_times[spot]
             self._timers[spot] = self._timer(
                 self._reserve_times[spot], self._handle_playing_timeout, spot
             )
         elif which == "trading":
-            self._trading_time_start = now
+            self._trading_deadline = now + self._trading_time_remaining
             self._trading_timer = self._timer(
                 self._trading_time_remaining, self._handle_trading_timeout
             )
+        self._emit_time(which, spot)
 
-    def _set_timer_state(self, *args):
-        pass  # this does something in EmittingGame
+    def _emit_time(
+        self, which: str, spot: int = None, *, recipient: int = None
+    ) -> None:
+        """
+        Emits a running timer's deadline as milliseconds since the epoch
+        so clients count it down locally, and a stopped timer's
+        remaining time in milliseconds otherwise; to all players unless
+        recipient is given.
+        """
+        if which == "turn":
+            seconds = self._turn_times[spot]
+            deadline = self._turn_deadlines[spot]
+        elif which == "reserve":
+            seconds = self._reserve_times[spot]
+            deadline = self._reserve_deadlines[spot]
+        else:
+            seconds = self._trading_time_remaining
+            deadline = self._trading_deadline
+        payload: Dict[str, Any] = {"which": which}
+        if spot is not None:
+            payload["spot"] = spot
+        if deadline is None:
+            payload["time"] = seconds * 1000
+            self._emit("set_time", payload, recipient)
+        else:
+            payload["deadline"] = (time() + deadline - self._time()) * 1000
+            self._emit("set_deadline", payload, recipient)
 
     def _stop_timer(
         self, which: str, spot: int = None, *, cancel: bool = True
@@ -374,11 +737,11 @@ class Game:
         the reserve timer decreases the reserve time.
 
         Stopping a timer does not store it to be restarted; this
-        behavior is handled by pausing timers. Timer starts are removed.
+        behavior is handled by pausing timers. Timer deadlines are
+        removed.
         """
-        now: datetime = datetime.utcnow()
+        now: float = self._time()
         assert which in ["turn", "reserve", "trading"]
-        self._set_timer_state(which, False, spot)
         if which == "turn":
             assert spot is not None
             # if a timeout handler is calling this, cancelling the timer
@@ -391,35 +754,29 @@ class Game:
             # desired behavior (also the timer won't be garbage
             # collected while it is doing handling)
             self._timers[spot] = None
+            self._turn_deadlines[spot] = None
             self._set_time("turn", 0, spot)
-            self._turn_time_use_starts[spot] = None
         elif which == "reserve":
             assert spot is not None
             if cancel and self._timers[spot] is not None:
                 self._timers[spot].cancel()
             self._timers[spot] = None
-            time_used = (
-                now - self._reserve_time_use_starts[spot]
-            ).total_seconds()
-            self._set_time(
-                # need the max statement since this function is used during
-                # reserve time timeouts
-                "reserve",
-                max(0, self._reserve_times[spot] - time_used),
-                spot,
-            )
-            self._reserve_time_use_starts[spot] = None
+            deadline: float = self._reserve_deadlines[spot]
+            self._reserve_deadlines[spot] = None
+            # need the max statement since this function is used during
+            # reserve time timeouts
+            self._set_time("reserve", max(0, deadline - now), spot)
         elif which == "trading":
             assert spot is None
             if cancel and self._trading_timer is not None:
                 self._trading_timer.cancel()
             self._trading_timer = None
+            self._trading_deadline = None
             self._set_time("trading", self._trading_time)
-            self._trading_time_start = None
 
     def _pause_timers(self) -> None:
         """
-        Pausing all timers is different from stopping them; pausing only 
+        Pausing all timers is different from stopping them; pausing only
         occurs when there is some issue that requires the game to be
         paused, a player leaving in the middle of the game, say. Pausing
         will store the remaining time for all active timers in their
@@ -427,63 +784,48 @@ class Game:
 
         Pausing is global; cannot pause individual timers.
         """
-        now: datetime = datetime.utcnow()
-        if not self.trading:
-            spot: int = self._current_player
-            # assert self._timers[spot]
-            # both turn and reserve timers stored in timers
-            if not (timer := self._timers[spot]):
-                return  # game has not started TODO: store has started attr?
-            timer.cancel()
+        now: float = self._time()
+        # both turn (including giving) and reserve timers are stored in
+        # timers; none are active if the game has not started
+        for spot in range(4):
+            if self._timers[spot] is None:
+                continue
+            self._timers[spot].cancel()
             self._timers[spot] = None
-
             if not self._is_using_reserve_time(spot):
-                time_used = (
-                    now - self._turn_time_use_starts[spot]
-                ).total_seconds()
-                self._turn_time_use_starts[spot] = None
-                self._set_time(
-                    "turn", self._turn_times[spot] - time_used, spot
-                )
-                self._paused_timers.append(self._start_timer("turn", spot))
+                deadline: float = self._turn_deadlines[spot]
+                self._turn_deadlines[spot] = None
+                self._set_time("turn", max(0, deadline - now), spot)
+                self._paused_timers.append(("turn", spot))
             else:
-                time_used = (
-                    now - self._reserve_time_use_starts[spot]
-                ).total_seconds()
-                self._reserve_time_use_starts[spot] = None
-                self._set_time(
-                    "reserve", self._reserve_times[spot] - time_used, spot
-                )
-                self._paused_timers.append(self._start_timer("reserve", spot))
-        else:  # elif self.trading
+                deadline = self._reserve_deadlines[spot]
+                self._reserve_deadlines[spot] = None
+                self._set_time("reserve", max(0, deadline - now), spot)
+                self._paused_timers.append(("reserve", spot))
+        if self._trading_timer is not None:
             self._trading_timer.cancel()
             self._trading_timer = None
-            time_used = (now - self._trading_time_start).total_seconds()
-            self._set_time("trading", self._trading_time_remaining - time_used)
-            self._trading_time_start = None
-            self._paused_timers.append(self._start_timer("trading"))
-
-            # giving timers
-            for spot in self._get_asshole_and_vice_asshole():
-                if not self._timers[spot]:  # no active giving timer
-                    continue
-                self._timers[spot].cancel()
-                self._timers[spot] = None
-                time_used = (
-                    now - self._turn_time_use_starts[spot]
-                ).total_seconds()
-                # turn time objects are used for for giving times
-                self._set_time(
-                    "turn", self._turn_times[spot] - time_used, spot
-                )
-                self._turn_time_use_starts[spot] = None
-                self._paused_timers.append(self._start_timer("turn", spot))
+            deadline = self._trading_deadline
+            self._trading_deadline = None
+            self._set_time("trading", max(0, deadline - now))
+            self._paused_timers.append(("trading", None))
 
     def _resume_timers(self) -> None:
-        for timer in self._paused_timers:
-            timer()
+        for which, spot in self._paused_timers:
+            self._start_timer(which, spot)
         self._paused_timers.clear()
 
+    @logged
+    def pause(self) -> None:
+        self._pause_timers()
+        self._emit("set_paused", {"paused": True})
+
+    @logged
+    def resume(self) -> None:
+        self._emit("set_paused", {"paused": False})
+        self._resume_timers()
+
+    @logged
     def _handle_playing_timeout(self, spot: int) -> None:
         """
         Handles turn time and reserve time timing out.
@@ -500,10 +842,12 @@ class Game:
             self._stop_timer("reserve", spot, cancel=False)
             self._auto_play_or_pass(spot)
 
+    @logged
     def _handle_giving_timeout(self, spot) -> None:
         self._stop_timer("turn", spot, cancel=False)
         self._auto_give(spot)
 
+    @logged
     def _handle_trading_timeout(self) -> None:
         # TODO:
         # account for the number of cards the askers have remaining to
@@ -538,7 +882,7 @@ class Game:
         # min card will be 1 if playing on base hand
         self.add_or_remove_card(spot, chamber._get_min_card())
         self.maybe_unlock_play(spot)
-        self.maybe_play_current_hand(spot, timestamp=datetime.utcnow())
+        self.maybe_play_current_hand(spot)
 
         # reselect spot's selected cards
         for card in currently_selected_cards:  # could be empty list
@@ -648,6 +992,7 @@ class Game:
         assert self._chambers[
             spot
         ].is_empty, "only players with no cards remaining can finish"
+        self._set_dot_color(spot, "purple")
         self._positions.append(self._current_player)
         self._turn_manager.remove(self._current_player)
         num_unfinished_players = self._num_unfinished_players
@@ -671,6 +1016,7 @@ class Game:
 
     # card control related methods
 
+    @logged
     def add_or_remove_card(self, spot: int, card: int) -> None:
         if not self.trading and self._is_finished(spot):
             raise PresidentsError(
@@ -692,6 +1038,7 @@ class Game:
         except FullHandError:
             raise PresidentsError("your current hand is full", permitted=True)
 
+    @logged
     def store_hand(self, spot: int) -> None:
         """
         Stores current hand. Does not deselect cards after storing, but
@@ -707,13 +1054,20 @@ class Game:
         # fullhouse straight, bomb, or selected) to the hands that
         # correspond; so need to
 
-    # TODO: this is specifically for removing a particular stored hand
-    #       and requires additions to the chamber; support by end of 2020
-    def remove_stored_hand(self, spot: int, hand):
-        ...
+    @logged
+    def remove_stored_hand(self, spot: int, hand) -> None:
+        if self._is_finished(spot):
+            raise PresidentsError(
+                "you have already finished this round", permitted=False
+            )
+        try:
+            self._chambers[spot].remove_hand(hand)
+        except HandNotStoredError:
+            raise PresidentsError("this hand is not stored", permitted=False)
 
     # playing and passing related methods
 
+    @logged
     def maybe_unlock_play(self, spot: int):
         """
         Unlocking is allowed as long as one's current hand can be played
@@ -764,7 +1118,8 @@ class Game:
             except NotPlayableOnError as e:
                 raise PresidentsError(str(e), permitted=True)
 
-    def maybe_play_current_hand(self, spot: int, **kwargs) -> None:
+    @logged
+    def maybe_play_current_hand(self, spot: int) -> None:
         if self._is_finished(spot):
             raise PresidentsError(
                 "you have already finished this round", permitted=False
@@ -779,7 +1134,7 @@ class Game:
                 "you can only play a hand on your turn", permitted=True
             )
         else:
-            self._play_current_hand(spot, **kwargs)
+            self._play_current_hand(spot)
 
     def _play_current_hand(self, spot: int) -> Hand:
         """
@@ -790,9 +1145,6 @@ class Game:
         flow related things like moving on to the next player or
         finishing a player (this is taken care of by the post play
         handler.)
-
-        NOTE: this method is kinda copy/pasted in EmittingGame and must
-              be manually updated there if any changes are made here.
         """
         assert self._unlocked[spot], "play called without unlocking"
         self._stop_timer(
@@ -800,11 +1152,18 @@ class Game:
             spot,
         )
         chamber = self._chambers[spot]
-        hand = Hand.copy(chamber.hand)
+        hand = FrozenHand(chamber.hand)
         chamber.remove_cards(hand)
         self._set_hand_in_play(hand)
         self._message(f"▶️ {self._names[spot]} played {str(hand)}")
         self.lock(spot)
+        self._set_dot_color(spot, "blue")
+        for other_spot in self._get_other_spots(spot, exclude_finished=True):
+            self._set_dot_color(other_spot, "red")
+        self._emit(
+            "set_cards_remaining",
+            {"spot": spot, "cards_remaining": chamber.num_cards},
+        )
         self._num_consecutive_passes = 0
         # lock others if their currently unlocked hand should no longer be unlocked
         for other_spot in self._get_other_spots(spot, exclude_finished=True):
@@ -828,6 +1187,7 @@ class Game:
             self._finishing_last_played = False
             self._next_player()
 
+    @logged
     def maybe_unlock_pass_turn(self, spot: int) -> None:
         if self._is_finished(spot):
             raise PresidentsError(
@@ -846,10 +1206,13 @@ class Game:
     def _unlock_pass(self, spot: int) -> None:
         self._lock_if_unlocked(spot)
         self._pass_unlocked[spot] = True
+        self._emit("set_pass_unlocked", {"pass_unlocked": True}, spot)
 
     def _lock_pass(self, spot: int) -> None:
         self._pass_unlocked[spot] = False
+        self._emit("set_pass_unlocked", {"pass_unlocked": False}, spot)
 
+    @logged
     def maybe_pass_turn(self, spot: int) -> None:
         if self._is_finished(spot):
             raise PresidentsError(
@@ -876,6 +1239,7 @@ class Game:
         )
         self._lock_pass(spot)
         self._message(f"⏭️ {self._names[spot]} passed")
+        self._set_dot_color(spot, "yellow")
         self._post_pass_handler()
 
     def _post_pass_handler(self) -> None:
@@ -897,46 +1261,62 @@ class Game:
 
     def _clear_hand_in_play(self) -> None:
         self._hand_in_play = None
+        self._emit("clear_hand_in_play", {})
 
     # trading related methods
 
-    def _set_trading(self, trading: bool) -> None:
+    def _set_trading(self, trading: bool, *, cancel: bool = True) -> None:
         """
         Handles due diligence for both starting and ending trading.
+
+        cancel: whether to cancel the trading timer; this should be False
+                when handling the trading timeout
         """
         self.trading = trading
-        # TODO: the below don't set all the required attributes
+        self._emit("set_trading", {"trading": trading})
+        range_4 = range(4)
         if trading:
-            self._start_timer("trading")
-            self._num_consecutive_passes: int = 0
-            self._finishing_last_played: bool = False
-            self._timers = [None for _ in range(4)]
-            self._selected_asking_options: List[Optional[int]] = [
-                None for _ in range(4)
-            ]
-            # NOTE: only added to already asked if giver has no cards of
-            #       the asked rank, i.e. not added after a single ask
-            self._already_asked: List[Set[int]] = [set() for _ in range(4)]
-            self._giving_options: List[Optional[Set[int]]] = [
-                set() for _ in range(4)
-            ]
-            self._given: List[Set[int]] = [set() for _ in range(4)]
-            self._taken: List[Set[int]] = [set() for _ in range(4)]
-            self._current_player = None
+            for spot in range_4:
+                self._set_dot_color(spot, "red")
+            self._emit("set_on_turn", {"on_turn": False}, self._current_player)
             self._clear_hand_in_play()
-            self._deal_cards()
+            self._setup_round()
+            self._set_time("trading", self._trading_time, start=True)
             self._message("💱 trading has begun")
+
+            # timer related attributes
+            self._timers = [None for _ in range_4]
+            self._turn_times = [0 for _ in range_4]
+            self._turn_deadlines = [None for _ in range_4]
+            self._reserve_times = [self._reserve_time for _ in range_4]
+            self._reserve_deadlines = [None for _ in range_4]
+
+            # game related attributes
+            self._current_player = None
+            self._hand_in_play = base_hand
+            self._num_consecutive_passes = 0
+            self._finishing_last_played = False
+            self._unlocked = [False for _ in range_4]
+            self._pass_unlocked = [False for _ in range_4]
         else:
-            self._stop_timer("trading")
+            self._stop_timer("trading", cancel=cancel)
+            # trading related attributes
+            self._selected_asking_options = [None for _ in range_4]
+            # NOTE: only added to already asked if giver has no cards of
+            #       the asked rank, i.e. not added after a single ask
+            self._already_asked = [set() for _ in range_4]
+            self._waiting = [False for _ in range_4]
+            self._giving_options = [set() for _ in range_4]
+            self._gives = [0 for _ in range_4]
+            self._takes = [0 for _ in range_4]
+            self._given = [set() for _ in range_4]
+            self._taken = [set() for _ in range_4]
+
+            # game related attributes
             self._positions.clear()
-            self._hand_in_play = base_hand
-            # TODO: should be able to do a simple start_round here
-            #       need to define and use setup_round method
-            self._num_consecutive_rounds += 1
-            self._message(f"🏁 round {self._num_consecutive_rounds} has begun")
-            self._make_and_set_turn_manager()
-            self._next_player()
+            self.start_round(setup=False)
 
+    @logged
     def maybe_set_selected_asking_option(self, spot: int, value: int) -> None:
         if not self._is_asker(spot):
             raise PresidentsError("you are not an asker", permitted=False)
@@ -955,6 +1335,7 @@ class Game:
             None if value == self._selected_asking_options[spot] else value,
         )
 
+    @logged
     def maybe_unlock_ask(self, spot: int) -> None:
         if not self.trading:
             raise PresidentsError("trading is not ongoing", permitted=False)
@@ -981,6 +1362,7 @@ class Game:
         else:
             self._unlock(spot)
 
+    @logged
     def ask_for_card(self, spot: int) -> None:
         if not self.trading:
             raise PresidentsError("trading is not ongoing", permitted=False)
@@ -1017,15 +1399,20 @@ class Game:
             self._wait_for_reply(spot, asked_spot)
 
     def _set_selected_asking_option(self, spot: int, rank: int) -> None:
+        old_rank: int = self._selected_asking_options[spot]
         self._selected_asking_options[spot] = rank
         if rank:  # selecting asking option
             self._chambers[spot].deselect_selected()
+        self._emit(
+            "set_asking_option", {"old_rank": old_rank, "new_rank": rank}, spot
+        )
 
     def _wait_for_reply(self, asker_spot: int, asked_spot: int) -> None:
         self._set_time("turn", self._giving_time, asked_spot, True)
         self._set_selected_asking_option(asker_spot, None)
         self._waiting[asker_spot] = True
 
+    @logged
     def maybe_unlock_give(self, spot: int) -> None:
         if not self.trading:
             raise PresidentsError("trading is not ongoing", permitted=False)
@@ -1058,6 +1445,7 @@ class Game:
             else:
                 self._unlock(spot)
 
+    @logged
     def give_card(self, spot: int, *, auto_trading: bool = False) -> None:
         if not self._unlocked[spot]:
             # self.lock(spot)  # TODO doing this should be part of resetting the DOM, say
@@ -1071,6 +1459,14 @@ class Game:
         receiver_chamber: Chamber = self._chambers[receiver_spot]
         giver_chamber.remove_card(card)
         receiver_chamber.add_card(card)
+        for spot_, chamber in [
+            (spot, giver_chamber),
+            (receiver_spot, receiver_chamber),
+        ]:
+            self._emit(
+                "set_cards_remaining",
+                {"spot": spot_, "cards_remaining": chamber.num_cards},
+            )
         self._message(
             f"🎁 {self._names[spot]} gives {self._names[receiver_spot]} a card"
         )
@@ -1086,8 +1482,18 @@ class Game:
 
     def _set_giving_options(self, spot: int, giving_options: Set[int]) -> None:
         self._giving_options[spot] = giving_options
+        self._emit(
+            "set_giving_options",
+            {"options": list(giving_options), "highlight": True},
+            spot,
+        )
 
     def _clear_giving_options(self, spot: int) -> None:
+        self._emit(
+            "set_giving_options",
+            {"options": list(self._giving_options[spot]), "highlight": False},
+            spot,
+        )
         self._giving_options[spot].clear()
 
     def _decrement_takes(
@@ -1108,11 +1514,14 @@ class Game:
     # misc
 
     def _unlock(self, spot: int) -> None:
+        self._emit("set_unlocked", {"unlocked": True}, spot)
         self._lock_if_pass_unlocked(spot)
         self._unlocked[spot] = True
 
+    @logged
     def lock(self, spot: int) -> None:
         self._unlocked[spot] = False
+        self._emit("set_unlocked", {"unlocked": False}, spot)
 
     def _lock_if_unlocked(self, spot: int) -> None:
         if self._unlocked[spot]:
@@ -1127,7 +1536,7 @@ class Game:
         self._lock_if_pass_unlocked(spot)
 
     def _message(self, message: str) -> None:
-        print(message)
+        self._emit("message", {"message": message})
 
     # getters
 
@@ -1179,9 +1588,21 @@ class Game:
 
     def _set_name(self, spot: int, name: str) -> None:
         self._names[spot] = name
+        # TODO: make this emit single name plus the spot after vue 3 :)
+        self._emit(
+            "set_names",
+            {"names": ["" if name is None else name for name in self._names]},
+        )
 
     def _set_hand_in_play(self, hand: Hand) -> None:
         self._hand_in_play = hand
+        self._emit(
+            "set_hand_in_play",
+            {
+                "hand_in_play": hand.to_list(),
+                "hand_in_play_desc": hand.id_desc,
+            },
+        )
 
     def _set_president(self, spot: int) -> None:
         self._set_asker(spot, True, 2)
@@ -1198,15 +1619,22 @@ class Game:
     def _set_asker(self, spot: int, asker: bool, takes_and_gives: int) -> None:
         self._set_takes(spot, takes_and_gives)
         self._set_gives(spot, takes_and_gives)
+        self._emit("set_asker", {"asker": asker}, spot)
 
-    def _set_giver(self, *args) -> None:
-        pass  # this does something in EmittingGame
+    def _set_giver(self, spot: int, giver: bool) -> None:
+        self._emit("set_giver", {"giver": giver}, spot)
 
     def _set_takes(self, spot: int, takes: int) -> None:
         self._takes[spot] = takes
+        self._emit("set_takes", {"takes": takes}, spot)
 
     def _set_gives(self, spot: int, gives: int) -> None:
         self._gives[spot] = gives
+        self._emit("set_gives", {"gives": gives}, spot)
+
+    def _set_dot_color(self, spot: int, dot_color: str) -> None:
+        self._dot_colors[spot] = dot_color
+        self._emit("set_dot_color", {"spot": spot, "dot_color": dot_color})
 
     def _add_to_given(self, spot: int, card: int) -> None:
         self._given[spot].add(card)
@@ -1279,15 +1707,29 @@ class Game:
         """
         Equivalently, is not using turn time as it has expired.
         """
-        return self._reserve_time_use_starts[spot] is not None
+        return self._reserve_deadlines[spot] is not None
 
     def in_players(self, user_id: str):
         return user_id in self._user_ids
 
 
+def replay(log: ActionLog, **kwargs) -> Game:
+    """
+    Game rebuilt by taking the logged actions (at their logged times)
+    in a game with the logged seed and settings, e.g. to recover it or
+    to reproduce a bug; kwargs (e.g. chamber_class) are passed to Game.
+    The errors of failed actions are ignored as they were when logged.
+    """
+    game: Game = Game(seed=log.seed, **log.settings, **kwargs)
+    game.take_actions(log)
+    return game
+
+
 # fmt: off
 class BaseHand:
-    pass
+    def __reduce__(self) -> str:
+        # unpickles as the base_hand singleton
+        return "base_hand"
 # hand at begininning of game; only the 3 of clubs can be played on it
 base_hand = BaseHand()
 # fmt: on
@@ -1299,12 +1741,23 @@ class TurnManager:
     """
 
     def __init__(self, first) -> None:
-        self._cycling_list = cycle([i for i in range(4)])
-        for _ in range(first):
-            next(self._cycling_list)
+        # spot last returned by next; next starts looking after it
+        self._last: int = (first - 1) % 4
         self._not_finished_dict: Dict[int, bool] = {i: True for i in range(4)}
         self._num_unfinished_players = 4
 
+    @property
+    def state(self) -> Tuple[int, Tuple[bool, ...]]:
+        return self._last, tuple(self._not_finished_dict.values())
+
+    @classmethod
+    def from_state(cls, state: Tuple[int, Tuple[bool, ...]]) -> TurnManager:
+        last, not_finished = state
+        turn_manager = cls(last + 1)
+        turn_manager._not_finished_dict = dict(enumerate(not_finished))
+        turn_manager._num_unfinished_players = sum(not_finished)
+        return turn_manager
+
     def __getitem__(self, spot: int) -> bool:
         return self._not_finished_dict[spot]
 
@@ -1312,9 +1765,10 @@ class TurnManager:
         self._not_finished_dict[spot] = not_finished
 
     def __next__(self) -> int:
-        maybe_next = next(self._cycling_list)
+        maybe_next = (self._last + 1) % 4
         while self[maybe_next] is False:
-            maybe_next = next(self._cycling_list)
+            maybe_next = (maybe_next + 1) % 4
+        self._last = maybe_next
         return maybe_next
 
     def remove(self, spot: int) -> None:
@@ -1322,6 +1776,48 @@ class TurnManager:
         self._num_unfinished_players -= 1
 
 
+class GameSnapshot(NamedTuple):
+    """
+    Compact, immutable copy of a game's state; see Game.snapshot. The
+    per spot lists are tuples and their sets frozensets. Timers are
+    paused, i.e. the times are remaining times.
+    """
+
+    chambers: Tuple[ChamberSnapshot, ...]
+    hand_in_play: Union[BaseHand, FrozenHand, None]
+    current_player: Optional[int]
+    # see TurnManager.state
+    turn_manager: Optional[Tuple[int, Tuple[bool, ...]]]
+    num_consecutive_passes: int
+    finishing_last_played: bool
+    positions: Tuple[int, ...]
+    unlocked: Tuple[bool, ...]
+    pass_unlocked: Tuple[bool, ...]
+    trading: bool
+    selected_asking_options: Tuple[Optional[int], ...]
+    already_asked: Tuple[FrozenSet[int], ...]
+    waiting: Tuple[bool, ...]
+    giving_options: Tuple[FrozenSet[int], ...]
+    gives: Tuple[int, ...]
+    takes: Tuple[int, ...]
+    given: Tuple[FrozenSet[int], ...]
+    taken: Tuple[FrozenSet[int], ...]
+    names: Tuple[Optional[str], ...]
+    open_spots: FrozenSet[int]
+    num_players: int
+    num_consecutive_rounds: int
+    turn_times: Tuple[float, ...]
+    reserve_times: Tuple[float, ...]
+    trading_time_remaining: float
+    # the timers (and their spots) to restart on resuming, including
+    # those running when the snapshot was taken
+    paused_timers: Tuple[Tuple[str, Optional[int]], ...]
+
+
+def _freeze(sets: List[Set[int]]) -> Tuple[FrozenSet[int], ...]:
+    return tuple(frozenset(set_) for set_ in sets)
+
+
 class PresidentsError(RuntimeError):
     """
     Represents any violation of the rules expressed in this class;
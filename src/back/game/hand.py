@@ -12,26 +12,37 @@
 from __future__ import annotations
 
 import numpy as np
-import pickle
 
-from .utils import hand_hash, card_names, id_desc_dict
+from .utils import (
+    hand_key,
+    card_names,
+    id_desc_dict,
+    combo_ids,
+    hand_key_offsets,
+    STRENGTH_CLASS_SHIFT,
+    load_hand_table,
+)
 from typing import List, Dict, Union, Optional, Iterator
 from json import dumps, loads
-import os
+from bisect import bisect_right
 
 
-# TODO create the .pkl if it doesn't exist
-# hash table for identifying hands
-try:
-    with open(
-        f"{os.getcwd()}/src/back/game/utils/hand_table.pkl", "rb"
-    ) as file:
-        hand_table = pickle.load(file)
-except FileNotFoundError:
-    with open(
-        f"{os.getcwd()}src/back/game/utils/hand_table.pkl", "rb"
-    ) as file:
-        hand_table = pickle.load(file)
+# dense table for identifying hands; memory-mapped so it is shared by
+# every process on the host. scalar lookups go through a memoryview as
+# indexing it returns python ints, which is much faster than indexing
+# the numpy array
+hand_table = memoryview(load_hand_table())
+
+
+def key_hand_id(key: int) -> int:
+    """
+    Id of the hand with the given key (i.e. hash(hand)).
+    """
+    strength = hand_table[key]
+    if strength:
+        return combo_ids[strength >> STRENGTH_CLASS_SHIFT]
+    # invalid hands are identified by their number of cards
+    return (bisect_right(hand_key_offsets, key) - 1) * 10
 
 
 class Hand:
@@ -62,6 +73,7 @@ class Hand:
         cards: np.ndarray[np.uint8] = None,
         id_: int = None,
         head: int = None,
+        strength: int = 0,
     ) -> None:
         if cards is None:  # default constructor; empty hand
             self._cards: np.ndarray[np.uint8] = np.zeros(
@@ -69,11 +81,13 @@ class Hand:
             )
             self._id: int = 0
             self._head: int = 4  # lowest empty index; -1 if full
+            self._strength: int = 0
         # .copy classmethod constructor; should not be used manually
         elif head is not None:
             self._cards = cards.copy()
             self._id = id_  # type: ignore
             self._head = head
+            self._strength = strength
         # testing constructor (i.e. Hand([...])); auto identifies
         # list requirements: length <= 5, ints between 0 and 52
         #   inclusive, non-zero values must be unique
@@ -103,7 +117,7 @@ class Hand:
 
     @classmethod
     def copy(cls, hand: Hand) -> Hand:
-        return cls(hand._cards, hand._id, hand._head)
+        return cls(hand._cards, hand._id, hand._head, hand._strength)
 
     def __getitem__(self, index: Union[int, slice]) -> np.uint8:
         return self._cards[index]
@@ -112,7 +126,7 @@ class Hand:
         self._cards[index] = card
 
     def __hash__(self) -> int:
-        return hand_hash(self._cards)
+        return hand_key(self)
 
     def __contains__(self, card: int) -> bool:
         assert 1 <= card <= 52, "invalid card cannot be in hand."
@@ -172,32 +186,19 @@ class Hand:
             raise NotPlayableOnError(
                 f"a {self.id_desc} cannot be played on a {other.id_desc}"
             )
-        if self.is_bomb and other.is_bomb:
-            return self[1] < other[1]  # second card is always part of the quad
-        elif self.is_bomb:
-            return False
-        elif self.is_single or self.is_double or self.is_straight:
-            return self[4] < other[4]
-        elif self.is_triple or self.is_fullhouse:
-            return self[2] < other[2]
-        else:
-            raise AssertionError("unidentified hand.")
+        # bombs are stronger than anything else and otherwise only hands
+        # with the same id are comparable so this is just the deciding
+        # card, i.e. the second card for bombs (it is always part of the
+        # quad), the third for triples and fullhouses and the last for
+        # everything else
+        return self._strength < other._strength
 
     def __gt__(self, other: Hand) -> bool:
         if not self._is_comparable(other):
             raise NotPlayableOnError(
                 f"a {self.id_desc} cannot be played on a {other.id_desc}"
             )
-        if self.is_bomb and other.is_bomb:
-            return self[1] > other[1]  # second card is always part of the quad
-        elif self.is_bomb:
-            return True
-        elif self.is_single or self.is_double or self.is_straight:
-            return self[4] > other[4]
-        elif self.is_triple or self.is_fullhouse:
-            return self[2] > other[2]
-        else:
-            raise AssertionError("unidentified hand.")
+        return self._strength > other._strength
 
     def __le__(self, other: Hand) -> bool:
         return self < other or self == other
@@ -241,6 +242,15 @@ class Hand:
     def is_valid(self) -> bool:
         return self._id % 10 > 0
 
+    @property
+    def strength(self) -> int:
+        """
+        Total order key of valid hands (0 for invalid hands); a hand can
+        be played on another if it is stronger and either has the same
+        id or is a bomb.
+        """
+        return self._strength
+
     @property
     def _num_cards(self) -> int:
         return 4 - self._head
@@ -259,6 +269,7 @@ class Hand:
         self._cards = np.zeros(shape=5, dtype=np.uint8)
         self._id = 0
         self._head = 4
+        self._strength = 0
 
     # TODO: remove, __iter__ now converts to int
     def to_list(self) -> List[int]:
@@ -266,9 +277,10 @@ class Hand:
         return list(map(int, self.__iter__()))
 
     def _identify(self) -> None:
-        try:
-            self._id = hand_table[hash(self)]
-        except KeyError:
+        self._strength = strength = hand_table[hash(self)]
+        if strength:
+            self._id = combo_ids[strength >> STRENGTH_CLASS_SHIFT]
+        else:
             self._id = self._num_cards * 10
 
     def _insertion_index(self, card: int) -> int:
@@ -0,0 +1,98 @@
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+
+class Event(NamedTuple):
+    """
+    An outbound event: the spot of the player it is for (None if it is
+    for all players), the event's name and its payload.
+    """
+
+    spot: Optional[int]
+    name: str
+    payload: Dict[str, Any]
+
+
+class Outbox:
+    """
+    Buffer of the events a game queues as its state changes. The game
+    core does no IO; whatever serves the game drains the outbox once per
+    action (or timeout) and sends the events, in order.
+    """
+
+    def __init__(self) -> None:
+        self._events: List[Event] = list()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self._events)
+
+    def emit(
+        self, name: str, payload: Dict[str, Any], spot: Optional[int] = None
+    ) -> None:
+        self._events.append(Event(spot, name, payload))
+
+    def drain(self) -> List[Event]:
+        events, self._events = self._events, list()
+        return events
+
+
+def batch(
+    events: Iterable[Event], recipients: Mapping[int, str]
+) -> Dict[str, List[List[Any]]]:
+    """
+    Groups events into one batch per recipient (e.g. per sid), mapping
+    spots to recipients with recipients. Each batch is the list of its
+    events' [name, payload] pairs in order. Events for all players go
+    in every recipient's batch; events for spots without a recipient
+    are dropped.
+    """
+    batches: Dict[str, List[List[Any]]] = {
+        recipient: list() for recipient in recipients.values()
+    }
+    for spot, name, payload in events:
+        if spot is None:
+            for recipient_batch in batches.values():
+                recipient_batch.append([name, payload])
+        elif spot in recipients:
+            batches[recipients[spot]].append([name, payload])
+    return {
+        recipient: recipient_batch
+        for recipient, recipient_batch in batches.items()
+        if recipient_batch
+    }
+
+
+def room_batch(
+    events: Iterable[Event], recipients: Mapping[int, str]
+) -> Tuple[List[List[Any]], Dict[str, List[List[Any]]]]:
+    """
+    Splits events for sending through a room of all recipients: returns
+    the batch of the events for all players, which the room gets, and
+    the batches (see batch) of the recipients that also have events of
+    their own. Those recipients get their whole batch instead, so must
+    be skipped by the room; each recipient still gets one batch with
+    its events in order.
+    """
+    events = list(events)
+    shared: List[List[Any]] = [
+        [name, payload] for spot, name, payload in events if spot is None
+    ]
+    own = {
+        recipients[spot]
+        for spot, _, _ in events
+        if spot is not None and spot in recipients
+    }
+    batches = batch(events, recipients)
+    return shared, {recipient: batches[recipient] for recipient in own}
@@ -5,6 +5,20 @@ from .utils import (
     ranks,
     rank_articler,
     hand_hash,
+    hand_key,
+    mask_hand_key,
+    cards_mask,
+    mask_cards,
+    hand_keys,
+    hand_key_offsets,
+    combo_ids,
+    HAND_TABLE_SIZE,
+    STRENGTH_CLASS_SHIFT,
     cartesian_product_pp,
     main,
 )
+from .hand_hash_table import (
+    HandTableMissingError,
+    classify_hands,
+    load_hand_table,
+)
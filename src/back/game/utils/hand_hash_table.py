@@ -1,30 +1,83 @@
+"""
+Generates the dense hand table used for identifying hands, i.e. a flat
+uint16 array indexed by hand key (see utils.hand_key) whose entries are
+hand strengths (see utils.STRENGTH_CLASS_SHIFT). The table is generated
+at build time (e.g. by the service Dockerfiles, or `pipenv run
+hand_table`) into a .npy file next to this one and only memory-mapped at
+runtime, so every process on a host shares the same pages and nothing is
+written to the source tree by a running service.
+
+The old hash table (a dict from utils.hand_hash to hand id that used to
+be pickled) is still built alongside it to verify the new one.
+
+usage: python src/back/game/utils/hand_hash_table.py
+"""
+
 import numpy as np
-import pickle
 import os
+import tempfile
 
 
+from functools import lru_cache
 from itertools import combinations as comb
-from typing import Dict
-from utils import hand_hash, cartesian_product_pp, main
+from typing import Dict, Set, Tuple
+
+try:
+    from .utils import (
+        hand_hash,
+        hand_key,
+        hand_keys,
+        hand_key_offsets,
+        combo_ids,
+        cartesian_product_pp,
+        main,
+        HAND_TABLE_SIZE,
+        STRENGTH_CLASS_SHIFT,
+    )
+except ImportError:  # run as a script
+    from utils import (  # type: ignore
+        hand_hash,
+        hand_key,
+        hand_keys,
+        hand_key_offsets,
+        combo_ids,
+        cartesian_product_pp,
+        main,
+        HAND_TABLE_SIZE,
+        STRENGTH_CLASS_SHIFT,
+    )
 
 
+HAND_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "hand_table.npy"
+)
+
 cards = np.arange(1, 53, dtype=np.uint8)
 suits = cards.reshape(13, 4)
 
-# hash table for identifying combos
+# hash table for identifying combos; only used to verify the dense table
 hand_table: Dict[int, int] = {}
+# every hand added to the hash table
+_hands: Set[Tuple[int, ...]] = set()
+# dense table for identifying and comparing combos
+dense_hand_table = np.zeros(shape=HAND_TABLE_SIZE, dtype=np.uint16)
 
+# index of the card deciding comparisons between hands of the same id
+_deciding_indices = {11: 4, 21: 4, 31: 2, 51: 2, 52: 4, 53: 1}
 
-def _save_hand_table() -> None:
-    # TODO: use abs path for this
-    with open(
-        f"{os.getcwd()}/src/back/game/utils/hand_table.pkl", "wb"
-    ) as file:
-        pickle.dump(hand_table, file)
+
+def _strength(hand, id: int) -> int:
+    return (combo_ids.index(id) << STRENGTH_CLASS_SHIFT) | int(
+        hand[_deciding_indices[id]]
+    )
 
 
 def _add_to_hand_table(hand, id: int) -> None:
     hand_table[hand_hash(hand)] = id
+    _hands.add(tuple(hand))
+    dense_hand_table[hand_key(int(card) for card in hand if card)] = _strength(
+        hand, id
+    )
 
 
 def _add_to_hand_table_iter(hands, id: int) -> None:
@@ -120,7 +173,84 @@ def _add_bombs() -> None:
         _add_to_hand_table_iter(bombs, 53)
 
 
+def _verify_hand_table() -> None:
+    """
+    Checks the dense table against the hash table: every hand in the
+    latter must have its id in the former and nothing else may be valid,
+    which also rules out two hands sharing a key.
+    """
+    hands = np.array(list(_hands), dtype=np.uint8)
+    ids = [hand_table[hand_hash(hand)] for hand in hands]
+    strengths = dense_hand_table[hand_keys(hands)]
+    assert np.array_equal(
+        np.array(combo_ids)[strengths >> STRENGTH_CLASS_SHIFT], ids
+    ), "dense hand table does not match the hash table"
+    assert np.count_nonzero(dense_hand_table) == len(
+        hand_table
+    ), "dense hand table has hands missing from the hash table"
+
+
+def make_hand_table() -> np.ndarray:
+    if not hand_table:
+        _add_all()
+        _verify_hand_table()
+    return dense_hand_table
+
+
+def _save_hand_table() -> None:
+    # written to a temporary file first so processes loading the table
+    # concurrently never map a partially written one
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(HAND_TABLE_PATH), suffix=".npy"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            np.save(file, make_hand_table())
+        os.chmod(tmp_path, 0o644)  # mkstemp only lets the owner read
+        os.replace(tmp_path, HAND_TABLE_PATH)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+@lru_cache(maxsize=None)
+def load_hand_table() -> np.ndarray:
+    """
+    Memory-maps the dense hand table, which must have been generated
+    beforehand (see usage). Mapped once per process.
+    """
+    if not os.path.exists(HAND_TABLE_PATH):
+        raise HandTableMissingError(
+            f"hand table not found at {HAND_TABLE_PATH}; generate it with "
+            "`python src/back/game/utils/hand_hash_table.py`"
+        )
+    return np.load(HAND_TABLE_PATH, mmap_mode="r")
+
+
+def classify_hands(hands: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Identifies an (N, 5) array of zero-padded hands (e.g. Hand._cards
+    rows) in one pass without creating any Hands.
+
+    Returns the hand ids (as Hand._id) and strengths; the strength of
+    an invalid hand is 0 and a hand can be played on another if both
+    have the same id and its strength is higher, or if it is a bomb and
+    its strength is higher.
+    """
+    hands = np.asarray(hands)
+    strengths = load_hand_table()[hand_keys(hands)]
+    ids = np.array(combo_ids, dtype=np.uint8)[
+        strengths >> STRENGTH_CLASS_SHIFT
+    ]
+    invalid = strengths == 0
+    ids[invalid] = np.count_nonzero(hands[invalid], axis=1) * 10
+    return ids, strengths
+
+
+class HandTableMissingError(RuntimeError):
+    pass
+
+
 @main
 def generate():
-    _add_all()
     _save_hand_table()
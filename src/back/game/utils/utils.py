@@ -1,7 +1,9 @@
 import inspect
 import sys
 import numpy as np
+from math import comb
 from itertools import accumulate, repeat, chain
+from typing import Iterable, Iterator
 
 
 card_names = [
@@ -107,6 +109,90 @@ def hand_hash(hand: np.ndarray) -> int:
     )
 
 
+# the dense hand table (see hand_hash_table.py) has an entry for every
+# set of up to 5 cards; hands are laid out by size and, within a size,
+# by the colex rank of their sorted cards, i.e. the key of the sorted
+# cards c_1 < ... < c_k is the offset of size k plus the sum of
+# binomial(c_i - 1, i)
+binomials = [[comb(n, i) for n in range(52)] for i in range(6)]
+hand_key_offsets = list(accumulate([0] + [comb(52, k) for k in range(5)]))
+HAND_TABLE_SIZE = hand_key_offsets[5] + comb(52, 5)
+
+# each entry is the strength of the hand: its combo class in the high
+# bits and the card deciding comparisons between hands of the same class
+# in the low 6 bits; invalid hands are 0; bombs are the highest class so
+# they beat everything else
+STRENGTH_CLASS_SHIFT = 6
+# combo class to hand id
+combo_ids = [0, 11, 21, 31, 51, 52, 53]
+
+
+def hand_key(cards: Iterable[int]) -> int:
+    """
+    Dense hand table key for ascending, non-zero cards.
+    """
+    key = 0
+    num_cards = 0
+    for num_cards, card in enumerate(cards, 1):
+        key += binomials[num_cards][card - 1]
+    return hand_key_offsets[num_cards] + key
+
+
+def mask_hand_key(mask: int) -> int:
+    """
+    Dense hand table key for a card mask (card c is bit c - 1).
+    """
+    key = 0
+    num_cards = 0
+    while mask:
+        low = mask & -mask
+        num_cards += 1
+        key += binomials[num_cards][low.bit_length() - 1]
+        mask ^= low
+    return hand_key_offsets[num_cards] + key
+
+
+def cards_mask(cards: Iterable[int]) -> int:
+    """
+    Card mask (card c is bit c - 1) of the non-zero cards.
+    """
+    mask = 0
+    for card in cards:
+        if card:
+            mask |= 1 << (int(card) - 1)
+    return mask
+
+
+def mask_cards(mask: int) -> Iterator[int]:
+    """
+    Cards of a card mask in ascending order.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length()
+        mask ^= low
+
+
+_binomials_array = np.array(binomials, dtype=np.int64)
+_hand_key_offsets_array = np.array(hand_key_offsets, dtype=np.int64)
+
+
+def hand_keys(hands: np.ndarray) -> np.ndarray:
+    """
+    Vectorized hand_key for an (N, 5) array of zero-padded hands, e.g.
+    Hand._cards rows; rows need not be sorted.
+    """
+    hands = np.sort(hands, axis=1).astype(np.int64)
+    present = hands > 0
+    num_cards = present.sum(axis=1)
+    # 1-based position of each card among the cards of its row
+    positions = np.arange(1, 6) - (5 - num_cards)[:, None]
+    positions[~present] = 0
+    terms = _binomials_array[positions, np.maximum(hands - 1, 0)]
+    terms[~present] = 0
+    return _hand_key_offsets_array[num_cards] + terms.sum(axis=1)
+
+
 def cartesian_product_pp(arrays):
     """
     adapted from https://stackoverflow.com/a/49445693/9578116
@@ -1,13 +1,15 @@
 import logging
 
 from socketio import AsyncClient
-from itertools import combinations
-from asyncio import gather, sleep
+from asyncio import sleep
+from inspect import isawaitable
 from random import choice, randrange
+from typing import Dict, List
 from numpy.random import binomial
 
 from ..secrets import BOT_KEY
 from ...game import Chamber, Hand
+from ...game.event_codec import decode_batch
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,10 @@ class Bot:
         self.pass_unlocked = False
         self.paused = False
         self.hands_stored = False
+        # sequence number of the last action sent and the actions sent
+        # that are not acked yet by sequence number; see _send_acked
+        self._seq = 0
+        self._unacked: Dict[int, List[int]] = dict()
 
     async def connect_to_game(self, game_id: str, *, bot_game_server=None):
         self._register_event_handlers()
@@ -51,142 +57,171 @@ class Bot:
         takes = self.takes
         giving_options = self.giving_options
         names = self.names
+        handlers = dict()
+
+        def event(handler):
+            # handlers are also called for the events in batches
+            handlers[handler.__name__] = handler
+            return sio.event(handler)
 
         @sio.event
+        async def batch(data):
+            # the events of a game action, encoded (see event_codec) in
+            # the order they were emitted; events bots do not listen to
+            # are skipped as they would be if sent on their own
+            for name, payload in decode_batch(data):
+                handler = handlers.get(name)
+                if handler is None:
+                    continue
+                result = handler(payload)
+                if isawaitable(result):
+                    await result
+
+        @event
+        def ack(payload):
+            # single actions are acked with whether they were done and
+            # frames with the number of their actions that were done
+            actions = self._unacked.pop(payload["seq"], None)
+            if actions is not None and payload["result"] != len(actions):
+                logger.error(
+                    f"game actions {actions} failed after {payload['result']} actions"
+                )
+
+        @event
         def add_card(payload):
             chamber.add_card(payload["card"])
 
-        @sio.event
+        @event
         def alert(payload):
             self.alert = payload["alert"]
 
-        @sio.event
+        @event
         def clear_cards(payload):
             chamber.reset()
 
-        @sio.event
+        @event
         def clear_hand_in_play(payload):
             hand_in_play.reset()
 
-        @sio.event
+        @event
         def deselect_card(payload):
             chamber.deselect_card(payload["card"])
 
-        @sio.event
+        @event
         def deselect_rank(payload):
             ranks[payload["rank"]] = False
 
-        @sio.event
+        @event
         def message(payload):
             # TODO: decide how to handle messages
             # self.messages.append(payload['message'])  # TODO
             ...
 
-        @sio.event
+        @event
         def remove_card(payload):
             chamber.remove_card(payload["card"])
 
-        @sio.event
+        @event
         def remove_rank(payload):
             del ranks[payload["rank"]]
 
-        @sio.event
+        @event
         def select_card(payload):
             chamber.select_card(payload["card"])
 
-        @sio.event
+        @event
         def select_hand(payload):
             chamber.select_cards(payload["hand"])
 
-        @sio.event
+        @event
         def select_rank(payload):
             ranks[payload["rank"]] = True
 
-        @sio.event
+        @event
         def set_asker(payload):
             ranks.update({i: False for i in range(1, 14)})
 
         # TODO: shouldn't need this one
-        @sio.event
+        @event
         def set_rank(payload):
             ...
 
-        @sio.event
+        @event
         def set_num_cards_remaining(payload):
             num_cards_remaining[payload["spot"]] = payload[
                 "num_cards_remaining"
             ]
 
-        @sio.event
+        @event
+        def set_deadline(payload):
+            ...  # TODO: how to handle timers for bots? redis ttl?
+
+        @event
         def set_dot_color(payload):
             dot_colors[payload["spot"]] = payload["dot_color"]
 
-        @sio.event
+        @event
         def set_giver(payload):
             ...
 
-        @sio.event
+        @event
         def set_gives(payload):
             gives[payload["spot"]] = payload["gives"]
 
-        @sio.event
+        @event
         def set_giving_options(payload):
             giving_options.extend(payload["options"])
 
-        @sio.event
+        @event
         def set_hand_in_play(payload):
             if not hand_in_play.is_empty:
                 hand_in_play.reset()
             for card in payload["hand_in_play"]:
                 hand_in_play.add(card)
 
-        @sio.event
+        @event
         def set_name(payload):
             names[payload["spot"]] = payload["name"]
 
-        @sio.event
+        @event
         async def set_on_turn(payload):
             on_turn = payload["on_turn"]
             self.on_turn = on_turn
             if on_turn:
                 await self.turn_up()
 
-        @sio.event
+        @event
         def set_pass_unlocked(payload):
             self.pass_unlocked = payload["pass_unlocked"]
 
-        @sio.event
+        @event
         def set_paused(payload):
             self.paused = payload["paused"]
 
-        @sio.event
+        @event
         def set_spot(payload):
             pass
 
-        @sio.event
+        @event
         def set_takes(payload):
             takes[payload["spot"]] = payload["takes"]
 
-        @sio.event
+        @event
         def set_time(payload):
-            ...  # TODO: how to handle timers for bots? redis ttl?
+            pass
 
-        @sio.event
+        @event
         def set_trading(payload):
             trading = payload["trading"]
             self.trading = trading
             if not trading and ranks:
                 ranks.clear()
 
-        @sio.event
+        @event
         def set_unlocked(payload):
             self.unlocked = payload["unlocked"]
 
-        @sio.event
-        def set_timer_state(payload):
-            ...
-
-        @sio.event
+        @event
         def update_current_hand_str(payload):
             pass
 
@@ -214,64 +249,43 @@ class Bot:
         elif hand_in_play.is_single:
             # usually pass to increase chance of playing multi card hands
             if binomial(1, 0.85):
-                self.unlock_pass_pass()
+                await self.unlock_pass_pass()
                 return
             hand = Hand([self.chamber._get_random_card()])
+            if not hand > hand_in_play:
+                # a bomb if it has one
+                hand = chamber.min_hand_beating(hand_in_play)
         else:  # is multi card hand
-            if hand_node := getattr(chamber, f"{hand_in_play.id_str}s").last:
-                hand = hand_node.value
-            else:
-                await self.unlock_pass_pass()
-                return
-        if hand > hand_in_play:
+            # weakest stored hand that beats it, of the same combo or
+            # else a bomb
+            hand = chamber.min_hand_beating(hand_in_play)
+        if hand is not None:
             await self.cards_unlock_play(hand)
         else:
             await self.unlock_pass_pass()
 
-    def _on_success_callback_constructor(self, func, *args, **kwargs):
-        async def callback(success):
-            if success:
-                await func(*args, **kwargs)
-            else:
-                logger.error(f"game action {action} failed")
-
-        return callback
-
     async def cards_unlock_play(self, cards):
-        # removes cards in hand first if there are any
-        cards_to_click = list(self.chamber.hand) + list(cards)
-        await gather(*[self.card(card) for card in cards_to_click[:-1]])
-        # TODO: replace this mess with a chaining syntax
-        await self.card(
-            cards_to_click[-1],
-            self._on_success_callback_constructor(
-                self.unlock, self._on_success_callback_constructor(self.play)
-            ),
+        # removes cards in hand first if there are any; everything is sent
+        # as one frame, which stops at the first action that fails
+        await self._game_actions(
+            [*map(int, self.chamber.hand), *map(int, cards), -15, -17]
         )
 
     async def unlock_pass_pass(self):
-        await self.unlock_pass(
-            self._on_success_callback_constructor(self.pass_)
-        )
+        await self._game_actions([-14, -18])
 
     async def store_hands(self):
         """
         Auto stores all available combos.
         """
-        chamber = self.chamber
-        cards = chamber.cards
-        for num_cards in range(2, 6):
-            for cards in combinations(cards, num_cards):
-                hand = Hand(cards)
-                if hand.is_valid:
-                    chamber.add_hand(hand)
+        self.chamber.enumerate_combos(store=True)
         self.hands_stored = True
 
     async def ask(self):
         await self._game_action(-22)
 
-    async def card(self, card: int, callback=None):
-        await self._game_action(card, callback)
+    async def card(self, card: int):
+        await self._game_action(card)
 
     async def give(self):
         await self._game_action(-20)
@@ -288,14 +302,23 @@ class Bot:
     async def rank(self, rank: int):
         await self._game_action(-rank)
 
-    async def unlock(self, callback):
-        await self._game_action(-15, callback)
+    async def unlock(self):
+        await self._game_action(-15)
+
+    async def unlock_pass(self):
+        await self._game_action(-14)
+
+    async def _game_action(self, action: int):
+        await self._send_acked("game_action", {"action": action}, [action])
 
-    async def unlock_pass(self, callback):
-        await self._game_action(-14, callback)
+    async def _game_actions(self, actions: List[int]):
+        await self._send_acked("game_actions", {"actions": actions}, actions)
 
-    async def _game_action(self, action: int, callback=None):
-        await self._emit("game_action", {"action": action}, callback=callback)
+    async def _send_acked(self, event: str, payload: dict, actions: List[int]):
+        # sent without waiting for a reply; acked with the actions' events
+        self._seq += 1
+        self._unacked[self._seq] = actions
+        await self._emit(event, {**payload, "seq": self._seq})
 
     async def _emit(self, *args, **kwargs):
         await self._sio.emit(*args, **kwargs)
@@ -7,18 +7,21 @@ import aioredis
 import socketio
 import traceback
 
-from typing import Union
+from typing import Set, Union
 from asyncio import gather
+from functools import partial
 from aiokafka import helpers
 from datetime import datetime
 from starlette.middleware import cors
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from faust.types import TP
 from faust.models.fields import StringField
 from google.protobuf.timestamp_pb2 import Timestamp
 
 # from ..secrets import EVENTHUB_HOST, EVENTHUB_USERNAME, EVENTHUB_PASSWORD
-from ...game import EmittingGame
-from ...utils import GAME_ACTION_DICT, spawn_after
+from ...game import ActionLog, EmittingGame, EmittingGameCheckpoint, Event
+from ...game.event_codec import encode_batch, encode_event
+from ...utils import GAME_ACTION_DICT, DirectAgent, wheel_after
 from ...utils.game_action_pb2 import GameAction as GameActionProtobuf
 from ..monitor import events_counter, hand_play_processor
 
@@ -39,9 +42,16 @@ logger = logging.getLogger(__name__)
 #     allow_headers=["*"],
 # )
 games = dict()  # from game id to game object
+# from game id to the prayer topic partition the game is served from
+game_partitions = dict()
+# from game id to the task rehydrating the game from its checkpoint
+rehydrating = dict()
+CHECKPOINT_INTERVAL = 10  # seconds
 
 sio = socketio.AsyncRedisManager("redis://socketio_pubsub", write_only=True)
 game_store = None
+# set once connected to the game store
+game_store_connected = asyncio.Event()
 
 
 # game_god = faust.App(
@@ -70,9 +80,98 @@ async def on_started():
     )
     game_store = (await asyncio.wait({task}))[0].pop().result()
     assert await game_store.ping()
+    game_store_connected.set()
     logger.info("connected to redis")
 
 
+async def store_checkpoint(game_id: str, checkpoint: bytes) -> None:
+    await game_store.set(f"{game_id}:checkpoint", checkpoint)
+
+
+async def store_actions(game_id: str, actions: bytes) -> None:
+    """
+    Appends to the game's action log; see game.replay.
+    """
+    await game_store.append(f"{game_id}:actions", actions)
+
+
+async def get_game(game_id: str) -> EmittingGame:
+    """
+    Game with the given id, rehydrated from its checkpoint if this game
+    god is not serving it yet, e.g. after a restart or rebalance. The
+    callers waiting on a rehydration resume in the order they called,
+    so their actions still reach the game's actor in order.
+    """
+    try:
+        return games[game_id]
+    except KeyError:
+        # shielded since cancelling one caller must not cancel the rest
+        return await asyncio.shield(_rehydration(game_id))
+
+
+def _rehydration(game_id: str) -> asyncio.Task:
+    """
+    Task rehydrating the game from its checkpoint; started if there is
+    no such task yet.
+    """
+    if (task := rehydrating.get(game_id)) is None:
+        task = rehydrating[game_id] = asyncio.ensure_future(
+            _rehydrate(game_id)
+        )
+        task.add_done_callback(partial(_rehydrated, game_id))
+    return task
+
+
+def _rehydrated(game_id: str, task: asyncio.Task) -> None:
+    del rehydrating[game_id]
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            f"rehydrating game {game_id} failed with exception: {task.exception()!r}"
+        )
+
+
+async def _rehydrate(game_id: str) -> EmittingGame:
+    # the first actions can come before connecting to the game store
+    await game_store_connected.wait()
+    checkpoint, actions, partition = await gather(
+        game_store.get(f"{game_id}:checkpoint"),
+        game_store.get(f"{game_id}:actions"),
+        game_store.hget(game_id, "partition", encoding="utf-8"),
+    )
+    if checkpoint is None:
+        raise KeyError(f"game {game_id} has no checkpoint")
+    # goes on logging to the game's action log
+    game = EmittingGame.from_checkpoint(
+        EmittingGameCheckpoint.from_bytes(checkpoint),
+        action_log=None if actions is None else ActionLog.from_bytes(actions),
+        sio=sio,
+        agents=AGENTS,
+        timer=wheel_after,
+        store_checkpoint=store_checkpoint,
+        store_actions=store_actions,
+    )
+    # sends the events of the restarted timers before any actions
+    await game.flush()
+    games[game_id] = game
+    game_partitions[game_id] = int(partition)
+    logger.info(f"rehydrated game {game_id}")
+    return game
+
+
+@game_god.timer(interval=CHECKPOINT_INTERVAL)
+async def checkpoint_games():
+    _checkpoint_games()
+
+
+def _checkpoint_games() -> None:
+    """
+    Checkpoints the games that changed since their last checkpoint, on
+    top of the checkpoints at the start of every round.
+    """
+    for game in games.values():
+        game.actor.tell(game.maybe_checkpoint)
+
+
 PRAYER_DICT = {
     "add_game": (
         "game_id",
@@ -88,10 +187,12 @@ PRAYER_DICT = {
     "resume_game": ("game_id",),
 }
 
-# TODO: when multiple game gods, games should be created on round robin,
-#       but then need to somehow guarantee that requests related to that
-#       game go to the same agent; right now, since the game init gens
-#       the id;
+# prayers and game actions are keyed by game id and both topics have the
+# same number of partitions, so the game god assigned a game's partition
+# gets all of the game's prayers and actions; games are handed off to
+# other game gods through the game store when partitions are rebalanced
+# (see on_partitions_revoked and on_partitions_assigned)
+NUM_PARTITIONS = 8
 
 
 class Prayer(faust.Record):
@@ -100,7 +201,7 @@ class Prayer(faust.Record):
 
 
 prayer_topic = game_god.topic(
-    "prayers", value_type=Prayer, partitions=8, internal=True
+    "prayers", value_type=Prayer, partitions=NUM_PARTITIONS, internal=True
 )
 
 
@@ -119,6 +220,11 @@ async def ear(prayers):
                 f"game god got prayer with false kwargs: {prayer, kwargs}"
             )
             continue
+        if prayer == "add_game":
+            kwargs = {
+                **kwargs,
+                "partition": prayers.current_event.message.partition,
+            }
         try:
             yield await eval(prayer)(**kwargs)
         except:
@@ -135,6 +241,7 @@ async def add_game(
     reserve_time: float,
     trading_time: float,
     giving_time: float,
+    partition: int,
 ):
     game_attrs = {
         "game_id": game_id,
@@ -147,13 +254,16 @@ async def add_game(
     game = EmittingGame(
         sio=sio,
         agents=AGENTS,
-        timer=spawn_after,
+        timer=wheel_after,
+        store_checkpoint=store_checkpoint,
+        store_actions=store_actions,
         **game_attrs,
     )
     game_id = game.game_id
     logger.info(f"adding game {game_id} with attributes {game_attrs}")
     try:
         games[game_id] = game
+        game_partitions[game_id] = partition
         game_dict = {
             "game_id": game_id,
             "num_players": 0,
@@ -161,8 +271,11 @@ async def add_game(
             **game_attrs,
         }
         await gather(
-            game_store.hmset_dict(game_id, game_dict),
+            game_store.hmset_dict(
+                game_id, {**game_dict, "partition": partition}
+            ),
             game_store.sadd("game_ids", game_id),
+            game_store.sadd(f"partition:{partition}:game_ids", game_id),
         )
         logger.info(f"added game {game_id}")
         return game_dict
@@ -174,11 +287,34 @@ async def add_game(
 
 
 async def remove_game(game_id):
-    # TODO: incomplete
+    """
+    Removes the game from this game god and everything about it from the
+    game store; the game need not be served here, e.g. if its removal
+    comes right after a rebalance.
+    """
     logger.info(f"removing game {game_id}")
-    await gather(
-        game_store.delete(game_id), game_store.srem("game_ids", game_id)
-    )
+    if (task := rehydrating.get(game_id)) is not None:
+        task.cancel()
+    if (game := games.pop(game_id, None)) is not None:
+        game.close()
+    partition = game_partitions.pop(game_id, None)
+    if partition is None:
+        partition = await game_store.hget(
+            game_id, "partition", encoding="utf-8"
+        )
+    aws = [
+        game_store.delete(
+            game_id,
+            f"{game_id}:checkpoint",
+            f"{game_id}:actions",
+            f"{game_id}:sids",
+        ),
+        game_store.srem("game_ids", game_id),
+    ]
+    # None if the game was removed already
+    if partition is not None:
+        aws.append(game_store.srem(f"partition:{partition}:game_ids", game_id))
+    await gather(*aws)
     logger.info(f"removed game {game_id}")
 
 
@@ -186,11 +322,13 @@ async def add_player(*, game_id: str, user_id: str, sid: str, username: str):
     logger.info(
         f"adding user {user_id} to game {game_id} with sid {sid} and username {username}"
     )
-    game = games[game_id]
+    game = await get_game(game_id)
     assert not game.in_players(user_id), "cannot join game multiple times"
     try:
-        await game.add_player(name=username, sid=sid, user_id=user_id)
         # above not in gather to confirm player was added
+        await game.actor.ask(
+            game.add_player, name=username, sid=sid, user_id=user_id
+        )
         await gather(
             game_store.set(sid, game_id),
             game_store.hincrby(game_id, "num_players"),
@@ -207,6 +345,12 @@ async def add_player(*, game_id: str, user_id: str, sid: str, username: str):
         return 0
 
 
+def _pause_and_remove_player(game: EmittingGame, sid: str) -> None:
+    if game.is_started and not game.is_paused:
+        game.pause()
+    game.remove_player(sid)
+
+
 async def remove_player(*, sid: str):
     """
     Pauses game if not already paused and then removes player.
@@ -214,11 +358,9 @@ async def remove_player(*, sid: str):
     try:
         game_id = await game_store.get(sid, encoding="utf-8")
         logger.info(f"removing sid {sid} from game")
-        game = games[game_id]
-        if game.is_started and not game.is_paused:
-            await game.pause()
-        await game.remove_player(sid)
+        game = await get_game(game_id)
         # above not in gather to confirm player was removed
+        await game.actor.ask(_pause_and_remove_player, game, sid)
         await gather(
             game_store.delete(sid),  # sid no longer tied to game
             # remove game if no players remain; otherwise update num players
@@ -240,9 +382,9 @@ async def remove_player(*, sid: str):
 async def start_game(*, game_id: str):
     logger.info(f"starting game {game_id}")
     try:
-        game = games[game_id]
+        game = await get_game(game_id)
         assert game.num_players == 4
-        await game.start_round(setup=True)
+        await game.actor.ask(game.start_round, setup=True)
         await game_store.hset(game_id, "fresh", "0")
         return 1
     except:
@@ -255,9 +397,9 @@ async def start_game(*, game_id: str):
 async def resume_game(*, game_id: str):
     logger.info(f"resuming game {game_id}")
     try:
-        game = games[game_id]
+        game = await get_game(game_id)
         assert game.num_players == 4
-        await game.resume()
+        await game.actor.ask(game.resume)
         return 1
     except:
         logger.error(
@@ -275,6 +417,10 @@ class game_action_protobuf(faust.Codec):
         for attr in ["sid", "user_id"]:
             if val := obj.get(attr):
                 setattr(game_action, attr, val)
+        if actions := obj.get("actions"):
+            game_action.actions.extend(actions)
+        if seq := obj.get("seq"):
+            game_action.seq = seq
         return game_action.SerializeToString()
 
     def _loads(self, s: bytes) -> Any:
@@ -287,6 +433,10 @@ class game_action_protobuf(faust.Codec):
             # empty string is default string in protobuf
             "sid": getattr(game_action, "sid") or None,
             "user_id": getattr(game_action, "user_id") or None,
+            # empty list is default repeated field in protobuf
+            "actions": list(game_action.actions) or None,
+            # sequence numbers start at 1
+            "seq": game_action.seq or None,
         }
 
 
@@ -304,6 +454,11 @@ class GameAction(
     # TODO: make faust pr so that not assigning None doesn't give validation error
     sid: str = None
     user_id: str = None
+    # frames of actions (see game_action_processor); action is 0 for
+    # frames
+    actions: List[int] = None
+    # sequence number of actions acked asynchronously
+    seq: int = None
 
 
 # TODO
@@ -316,23 +471,163 @@ game_action_topic = game_god.topic(
     "game_actions",
     key_type=str,  # key is game id
     value_type=GameAction,
-    partitions=8,
+    partitions=NUM_PARTITIONS,
     internal=True,
 )
 
 
+# concurrent instances only wait on the games' actors, which carry out
+# each game's actions in the order they were received; actions are put
+# in the actors' mailboxes before the instances' first await (or in
+# order once the game is rehydrated; see get_game)
+#
+# frames of actions are handled as one message (see
+# EmittingGame.actions_handler) and replied to with the number of their
+# actions that were done
+#
+# actions with sequence numbers are cast, i.e. not replied to; they are
+# acked to their sids with their events instead (see
+# EmittingGame.acked_handler) or rejected if handling them failed
 @game_god.agent(game_action_topic, concurrency=50)
 async def game_action_processor(game_actions):
     async for game_action in game_actions:
         logger.info(f"processing game action {game_action}")
-        action, kwargs = GAME_ACTION_DICT[game_action.action]
         try:
-            await getattr(games[game_action.game_id], f"{action}_handler")(
-                game_action.sid, **kwargs
-            )
-            yield 1
+            game = await get_game(game_action.game_id)
+            if game_action.actions:
+                handler = game.actions_handler
+                kwargs = {"actions": game_action.actions}
+            else:
+                action, kwargs = GAME_ACTION_DICT[game_action.action]
+                handler = getattr(game, f"{action}_handler")
+            # the actor sends the events of the actions it drains
+            # together once they are done
+            if game_action.seq is not None:
+                await game.actor.ask(
+                    game.acked_handler,
+                    game_action.sid,
+                    game_action.seq,
+                    handler,
+                    **kwargs,
+                )
+                yield 1
+                continue
+            result = await game.actor.ask(handler, game_action.sid, **kwargs)
+            yield result if game_action.actions else 1
         except:
             logger.error(
                 f"game action {game_action} failed with exception: {traceback.format_exc()}"
             )
+            if game_action.seq is not None:
+                await reject(game_action)
             yield 0
+
+
+async def reject(game_action: GameAction) -> None:
+    """
+    Acks an action with a sequence number as not done when it could not
+    be handled, e.g. because its game does not exist.
+    """
+    ack = Event(None, "ack", {"seq": game_action.seq, "result": 0})
+    await sio.emit(
+        "batch", encode_batch([encode_event(ack)]), room=game_action.sid
+    )
+
+
+def _prayer_partitions(tps: Set) -> Set[int]:
+    topic = prayer_topic.get_topic_name()
+    return {tp.partition for tp in tps if tp.topic == topic}
+
+
+@game_god.on_partitions_revoked.connect
+async def on_partitions_revoked(app, *, revoked: Set, **kwargs):
+    """
+    Hands off the games of the revoked partitions: each game's actor
+    stops its timers after the actions already in its mailbox and the
+    game is checkpointed to the game store for the game god that gets
+    the partition next.
+    """
+    partitions = _prayer_partitions(revoked)
+    game_ids = [
+        game_id
+        for game_id, partition in game_partitions.items()
+        if partition in partitions
+    ]
+    logger.info(f"handing off games {game_ids} of partitions {partitions}")
+    for game_id in game_ids:
+        game = games[game_id]
+        try:
+            checkpoint = await game.actor.ask(game.hand_off)
+            await store_checkpoint(game_id, checkpoint.to_bytes())
+        except:
+            logger.error(
+                f"handing off game {game_id} failed with exception: {traceback.format_exc()}"
+            )
+        finally:
+            # only dropped now so actions still in flight cannot
+            # rehydrate the game from an old checkpoint
+            del games[game_id], game_partitions[game_id]
+            game.actor.close()
+
+
+@game_god.on_partitions_assigned.connect
+async def on_partitions_assigned(app, *, assigned: Set, **kwargs):
+    """
+    Starts rehydrating the games of the assigned partitions in the
+    background, e.g. so their timers run again without waiting for
+    actions; actions for a game wait for its rehydration (see get_game).
+    """
+    # the first assignment can come before connecting to the game store
+    await game_store_connected.wait()
+    for partition in _prayer_partitions(assigned):
+        game_ids = await game_store.smembers(
+            f"partition:{partition}:game_ids", encoding="utf-8"
+        )
+        for game_id in game_ids:
+            if game_id not in games:
+                _rehydration(game_id)
+
+
+async def serve_directly() -> Tuple[DirectAgent, DirectAgent]:
+    """
+    Serves prayers and game actions in this process without Kafka, e.g.
+    in the game server's process for single node deployments and load
+    tests (see game_server.on_startup): does what the game god worker
+    would, i.e. connects to the game store, rehydrates the games and
+    checkpoints them, and returns direct stand-ins for ear and
+    game_action_processor, which run the agents' own code (see
+    DirectAgent). Direct agents have a single partition, 0, which is
+    never revoked.
+    """
+    await on_started()
+    await on_partitions_assigned(
+        game_god, assigned={TP(prayer_topic.get_topic_name(), 0)}
+    )
+    asyncio.ensure_future(_checkpoint_games_periodically())
+    agents = (
+        DirectAgent(ear.fun, concurrency=ear.concurrency),
+        DirectAgent(
+            game_action_processor.fun,
+            concurrency=game_action_processor.concurrency,
+        ),
+    )
+    for agent in agents:
+        agent.start()
+    return agents
+
+
+async def _checkpoint_games_periodically() -> None:
+    # checkpoint_games' timer only runs in the game god worker
+    while True:
+        await asyncio.sleep(CHECKPOINT_INTERVAL)
+        _checkpoint_games()
+
+
+@game_god.page("/actors")
+async def get_actors(web, request):
+    """
+    Queue depth and service time metrics of each game's actor.
+    """
+    return web.json(
+        {game_id: game.actor.metrics for game_id, game in games.items()}
+    )
@@ -43,6 +43,7 @@ from .models import (
 )
 from ...basedata import session
 from ...basedata.models import User#, Username
+from ...utils import players_room
 from ..secrets import JWT_SECRET, BOT_KEY
 from ..monitor import Event, events_counter
 
@@ -146,6 +147,13 @@ async def on_startup():
     # global game_store
     global game_store, GameAction, game_action_processor, Prayer, ear
     GameAction, game_action_processor, Prayer, ear = ga, gap, p, e
+    # single node deployments run game god in this process, without
+    # Kafka
+    if os.getenv("GAME_GOD_TRANSPORT") == "direct":
+        from ..game_god import serve_directly
+
+        logger.info("serving game god directly")
+        ear, game_action_processor = await serve_directly()
 
     # TODO: azure docker compose doesn't support depends so sets 5
     #       connection timeout
@@ -419,6 +427,11 @@ async def connect(sid, environ):
     # else key is valid
 
     await events_counter.cast("connect")
+    # game god broadcasts events for all players through the game's
+    # players room; the socket enters it before being added so it gets
+    # every broadcast from then on and leaves it if it cannot be added
+    # (and on disconnect, which removes the player)
+    await game_server_sio.enter_room(sid, players_room(game_id))
     # do adding to game as background task so socket connection is
     # accepted immediately after validation
     # TODO: prevent garbage collection of this task
@@ -455,6 +468,7 @@ async def add_player(
             prune_expired_game_keys(game_id),
         )
     if not player_added:
+        await game_server_sio.leave_room(sid, players_room(game_id))
         # TODO: on this error (used to be in the connect listener)
         #       should disconnect the socket and client should handle
         #       switching to the game browser on socket disconnect
@@ -503,14 +517,45 @@ async def get_game_id(sid: str):
 
 @game_server_sio.event
 async def game_action(sid, payload):
+    """
+    Replies with 1 once the action is handled; actions with a sequence
+    number ("seq") are not waited for, see send_game_action.
+    """
+    return await send_game_action(
+        sid, action=payload["action"], seq=payload.get("seq")
+    )
+
+
+@game_server_sio.event
+async def game_actions(sid, payload):
+    """
+    Frame of actions, e.g. a hand's cards, unlock and play, handled
+    together; replies with the number of the actions that were done
+    (see EmittingGame.actions_handler) unless the frame has a sequence
+    number.
+    """
+    return await send_game_action(
+        sid,
+        action=0,
+        actions=payload["actions"],
+        seq=payload.get("seq"),
+    )
+
+
+async def send_game_action(sid, **kwargs):
+    """
+    Asks game_god to handle the action and waits for its reply unless it
+    has a sequence number; such actions are only cast, i.e. sent without
+    a reply topic round trip, and game_god acks them to the sid with
+    their events (an "ack" event with the sequence number and result).
+    Clients number their actions from 1 up, so retried actions (with the
+    numbers they were sent with) are not handled twice.
+    """
     timestamp = datetime.utcnow()
     game_id = await get_game_id(sid)
-    return await game_action_processor.ask(
-        key=game_id,
-        value=GameAction(
-            game_id=game_id,
-            action=payload["action"],
-            timestamp=timestamp,
-            sid=sid,
-        ),
+    game_action = GameAction(
+        game_id=game_id, timestamp=timestamp, sid=sid, **kwargs
     )
+    if game_action.seq is None:
+        return await game_action_processor.ask(key=game_id, value=game_action)
+    await game_action_processor.cast(key=game_id, value=game_action)
@@ -88,7 +88,7 @@ async def get_hands(self, request):
     return self.json(hands_dict)
 
 
-from ...game.hand import hand_table
+from ...game.hand import key_hand_id
 
 hand_size_table = monitor.Table(
     "hand_size", default=int, partitions=2
@@ -146,7 +146,7 @@ async def hand_play_processor(hand_plays):
         # makes sure game id and hand hash are unlinked after a sec
         expire_game_id_hand_hash(og_game_id, hand_hash)
 
-        yield hand_table[hand_hash]
+        yield key_hand_id(hand_hash)
 
 
 @monitor.agent()
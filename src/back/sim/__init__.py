@@ -0,0 +1,10 @@
+from .policies import (
+    Policy,
+    MinPolicy,
+    RandomPolicy,
+    POLICIES,
+    make_policies,
+)
+from .sim_game import SimGame
+
+__all__ = ["SimGame", "Policy", "MinPolicy", "RandomPolicy"]
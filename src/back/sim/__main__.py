@@ -0,0 +1,29 @@
+"""
+Plays rounds of a headless SimGame and reports the throughput.
+
+usage: python -m src.back.sim [num_rounds] [min|random] [seed]
+"""
+
+import time
+
+from . import SimGame, POLICIES, make_policies
+from ..game.utils import main
+
+
+def run(num_rounds: int, policy: str, seed: int = None) -> None:
+    policies = make_policies(policy, seed)
+    game = SimGame(policies, seed=seed)
+    start = time.perf_counter()
+    game.run(num_rounds)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{num_rounds} rounds ({policy} policy) in {elapsed:.2f}s:"
+        f" {num_rounds / elapsed:,.0f} rounds/s,"
+        f" {game.num_turns / num_rounds:.1f} turns/round"
+    )
+
+
+@main
+def simulate(num_rounds: str = "10000", policy: str = "min", seed=None):
+    assert policy in POLICIES, f"unknown policy {policy}"
+    run(int(num_rounds), policy, None if seed is None else int(seed))
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from itertools import product
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..game.frozen_hand import FrozenHand
+from ..game.utils import mask_cards
+
+# cards are int masks (card c is bit c - 1), so the cards of rank r (0
+# being the 3s and 12 the 2s) are the 4 bits from bit 4r on
+RANK = 0b1111
+RANKS = (1 << 13) - 1  # mask of every rank, rank r being bit r
+THREE_OF_CLUBS = 1  # mask of card 1
+# lowest card of every rank
+_LOWEST_CARDS = sum(1 << 4 * rank for rank in range(13))
+SINGLE = 11  # hand ids
+BOMB = 53
+
+# submasks of each 4 bit rank mask by number of cards, i.e. the
+# submasks of bits with k cards are _submasks[bits][k]
+_submasks: List[List[List[int]]] = [
+    [
+        [
+            sub
+            for sub in range(16)
+            if sub & bits == sub and bin(sub).count("1") == k
+        ]
+        for k in range(5)
+    ]
+    for bits in range(16)
+]
+
+# the hands of the masks looked up so far
+_hands: Dict[int, FrozenHand] = dict()
+
+
+def mask_hand(mask: int) -> FrozenHand:
+    """
+    Interned hand of a card mask; only valid hands have one.
+    """
+    try:
+        return _hands[mask]
+    except KeyError:
+        hand = _hands[mask] = FrozenHand(list(mask_cards(mask)))
+        return hand
+
+
+def single_masks(cards: int) -> List[int]:
+    masks = list()
+    while cards:
+        low = cards & -cards
+        masks.append(low)
+        cards ^= low
+    return masks
+
+
+def _of_a_kind(ranks: List[int], num_cards: int) -> List[int]:
+    return [
+        sub << 4 * rank
+        for rank, bits in enumerate(ranks)
+        for sub in _submasks[bits][num_cards]
+    ]
+
+
+def _doubles(ranks: List[int], cards: int) -> List[int]:
+    return _of_a_kind(ranks, 2)
+
+
+def _triples(ranks: List[int], cards: int) -> List[int]:
+    return _of_a_kind(ranks, 3)
+
+
+def _fullhouses(ranks: List[int], cards: int) -> List[int]:
+    doubles = _of_a_kind(ranks, 2)
+    return [
+        triple | double
+        for triple in _of_a_kind(ranks, 3)
+        for double in doubles
+        # a triple and a double only overlap if they are of the same rank
+        if not triple & double
+    ]
+
+
+def _straights(ranks: List[int], cards: int) -> List[int]:
+    return [
+        sum(straight)
+        for lowest in range(9)
+        if all(ranks[lowest : lowest + 5])
+        for straight in product(
+            *[
+                [bit << 4 * rank for bit in _submasks[ranks[rank]][1]]
+                for rank in range(lowest, lowest + 5)
+            ]
+        )
+    ]
+
+
+def _bombs(ranks: List[int], cards: int) -> List[int]:
+    return [
+        quad | single
+        for rank, bits in enumerate(ranks)
+        if bits == RANK
+        for quad in [RANK << 4 * rank]
+        for single in single_masks(cards ^ quad)
+    ]
+
+
+# hand id to the function making the masks of the combos with that id
+_combos: Dict[int, Callable[[List[int], int], List[int]]] = {
+    21: _doubles,
+    31: _triples,
+    51: _fullhouses,
+    52: _straights,
+    BOMB: _bombs,
+}
+
+
+def combo_masks(cards: int, id_: Optional[int] = None) -> List[int]:
+    """
+    Masks of the combos that can be made from the cards, i.e. the same
+    hands as Chamber.enumerate_combos, or only those with the given hand
+    id. Combos are grouped by id in the same order.
+    """
+    if id_ == BOMB and not _has_quad(cards):  # most hands have no bombs
+        return list()
+    ranks = [cards >> 4 * rank & RANK for rank in range(13)]
+    if id_ is not None:
+        return _combos[id_](ranks, cards)
+    return [mask for combo in _combos.values() for mask in combo(ranks, cards)]
+
+
+def _has_quad(cards: int) -> bool:
+    return bool(cards & cards >> 1 & cards >> 2 & cards >> 3 & _LOWEST_CARDS)
+
+
+def weakest_beating(masks: List[int], strength: int) -> int:
+    """
+    Mask of the weakest hand stronger than the given strength; 0 if
+    there is none.
+    """
+    weakest = 0
+    weakest_strength = None
+    for mask in masks:
+        mask_strength = mask_hand(mask)._strength
+        if mask_strength > strength and (
+            weakest_strength is None or mask_strength < weakest_strength
+        ):
+            weakest, weakest_strength = mask, mask_strength
+    return weakest
+
+
+def min_beating(cards: int, hand: FrozenHand) -> int:
+    """
+    Mask of the weakest hand made from the cards that can be played on
+    the given valid hand, trying the hand's combo before bombs as
+    Chamber.min_hand_beating does; 0 if there is none.
+    """
+    if hand._id == SINGLE:
+        # cards higher than the single's card
+        card = hand._cards[4]
+        higher = cards >> card << card
+        if higher:
+            return higher & -higher
+    elif hand._id != BOMB:
+        mask = weakest_beating(combo_masks(cards, hand._id), hand._strength)
+        if mask:
+            return mask
+    return weakest_beating(combo_masks(cards, BOMB), hand._strength)
+
+
+class Combos:
+    """
+    The combos that can be made from a spot's cards, by hand id and in
+    order of strength. Each id's combos are made the first time they are
+    needed and then kept as cards are played (see remove), since the
+    combos of the cards left are those without the cards played: they
+    are filtered when next needed rather than made anew every turn.
+    Cards being added, i.e. trading, means making new Combos.
+    """
+
+    __slots__ = ("cards", "_hands")
+
+    def __init__(self, cards: int) -> None:
+        self.cards: int = cards
+        # hand id to the cards its hands were made or last filtered
+        # for, their masks and their strengths, both in order of
+        # strength
+        self._hands: Dict[int, Tuple[int, List[int], List[int]]] = dict()
+
+    def remove(self, cards: int) -> None:
+        """
+        Drops the hands with any of the cards, e.g. those of a hand
+        played.
+        """
+        self.cards ^= cards
+
+    def all(self) -> List[int]:
+        """
+        Masks of every hand, grouped by id with singles first.
+        """
+        return single_masks(self.cards) + [
+            mask for id_ in _combos for mask in self._of(id_)[0]
+        ]
+
+    def beating(self, hand: FrozenHand) -> List[int]:
+        """
+        Masks of the hands that can be played on the given valid hand,
+        i.e. the stronger hands of its combo and then the stronger
+        bombs, each weakest first.
+        """
+        masks, strengths = self._of(BOMB)
+        bombs = masks[bisect_right(strengths, hand._strength) :]
+        if hand._id == SINGLE:
+            card = hand._cards[4]
+            return single_masks(self.cards >> card << card) + bombs
+        if hand._id == BOMB:
+            return bombs
+        masks, strengths = self._of(hand._id)
+        return masks[bisect_right(strengths, hand._strength) :] + bombs
+
+    def _of(self, id_: int) -> Tuple[List[int], List[int]]:
+        cards = self.cards
+        try:
+            made_for, masks, strengths = self._hands[id_]
+        except KeyError:
+            strengths, masks = _by_strength(combo_masks(cards, id_))
+            self._hands[id_] = (cards, masks, strengths)
+            return masks, strengths
+        if made_for != cards:
+            # cards only leave
+            gone = made_for ^ cards
+            kept = [i for i, mask in enumerate(masks) if not mask & gone]
+            masks = [masks[i] for i in kept]
+            strengths = [strengths[i] for i in kept]
+            self._hands[id_] = (cards, masks, strengths)
+        return masks, strengths
+
+
+def _by_strength(masks: List[int]) -> Tuple[List[int], List[int]]:
+    """
+    Strengths of the hands and their masks, both in order of strength.
+    """
+    pairs = sorted((mask_hand(mask)._strength, mask) for mask in masks)
+    return [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+
+
+def set_bits(mask: int) -> List[int]:
+    """
+    Indices of the set bits of a mask, e.g. the ranks in a rank mask.
+    """
+    return [card - 1 for card in mask_cards(mask)]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from random import Random
+from typing import TYPE_CHECKING, Dict, List, Type
+
+from ..game.game import base_hand
+from .moves import THREE_OF_CLUBS, min_beating, set_bits
+
+if TYPE_CHECKING:
+    from .sim_game import SimGame
+
+
+class Policy(ABC):
+    """
+    Decides the moves of a spot in a SimGame. Moves are card masks (card
+    c is bit c - 1), see SimGame. Policies making random choices should
+    use their own (seeded) random number generator.
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        self._rng: Random = Random(seed)
+
+    @abstractmethod
+    def play(self, game: SimGame, spot: int) -> int:
+        """
+        Mask of the hand to play on spot's turn or 0 to pass.
+        """
+
+    @abstractmethod
+    def ask(self, game: SimGame, spot: int, ranks: int) -> int:
+        """
+        Rank (0 being the 3s and 12 the 2s) an asker asks for out of the
+        mask of ranks it can ask for (rank r is bit r).
+        """
+
+    @abstractmethod
+    def give(self, game: SimGame, spot: int, options: int) -> int:
+        """
+        Mask of the single card to give out of the mask of options.
+        """
+
+
+class MinPolicy(Policy):
+    """
+    Plays the 3 of clubs alone to start, leads with the lowest single
+    and otherwise plays the weakest hand that beats the hand in play,
+    passing if there is none. Trades like Game._auto_trade: gives the
+    lowest card it can and asks for the highest rank it can.
+    """
+
+    def play(self, game: SimGame, spot: int) -> int:
+        cards = game.cards[spot]
+        hand_in_play = game.hand_in_play
+        if hand_in_play is base_hand:
+            return THREE_OF_CLUBS
+        if hand_in_play is None:
+            return cards & -cards
+        # one combo's hands are made, which is cheaper than keeping them
+        # all (see Combos) as most turns are singles
+        return min_beating(cards, hand_in_play)
+
+    def ask(self, game: SimGame, spot: int, ranks: int) -> int:
+        return ranks.bit_length() - 1
+
+    def give(self, game: SimGame, spot: int, options: int) -> int:
+        return options & -options
+
+
+class RandomPolicy(Policy):
+    """
+    Makes every move uniformly at random out of the legal ones,
+    including passing when it is allowed.
+    """
+
+    def play(self, game: SimGame, spot: int) -> int:
+        moves = game.legal_plays(spot)
+        if game.can_pass:
+            moves.append(0)
+        return self._rng.choice(moves)
+
+    def ask(self, game: SimGame, spot: int, ranks: int) -> int:
+        return self._rng.choice(set_bits(ranks))
+
+    def give(self, game: SimGame, spot: int, options: int) -> int:
+        return 1 << self._rng.choice(set_bits(options))
+
+
+# policies by name, e.g. for command line arguments
+POLICIES: Dict[str, Type[Policy]] = {"min": MinPolicy, "random": RandomPolicy}
+
+
+def make_policies(name: str, seed: int = None) -> List[Policy]:
+    """
+    A policy of the given name for each spot, seeded with consecutive
+    seeds from the given one.
+    """
+    return [
+        POLICIES[name](None if seed is None else seed + spot)
+        for spot in range(4)
+    ]
@@ -0,0 +1,144 @@
+"""
+Plays rounds of SimGames across processes and writes each round's deal,
+trades, moves and finishing order to columnar .npz chunks.
+
+usage: python -m src.back.sim.self_play num_rounds out_dir [policy]
+           [seed] [num_workers] [chunk_size]
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from .policies import POLICIES, make_policies
+from .sim_game import SimGame
+from ..game.utils import main
+
+
+CHUNK_SIZE = 10000
+# cards traded in a round: the president's 2 gives and 2 takes then the
+# vice president's give and take; zeros in the first round of a chunk
+NUM_TRADED = 6
+
+
+class Chunk(NamedTuple):
+    """
+    A chunk of consecutive rounds of one game; chunks are independent
+    of each other (and of the number of workers) as each one's game is
+    seeded with its own seed.
+    """
+
+    index: int
+    num_rounds: int
+    seed: int
+    policy: str
+
+
+def chunk_seed(seed: int, index: int) -> int:
+    return int(np.random.SeedSequence([seed, index]).generate_state(1)[0])
+
+
+def play_chunk(chunk: Chunk) -> Dict[str, np.ndarray]:
+    """
+    Plays the chunk's rounds; returns its columns:
+        deals: (rounds, 4) uint64, the card mask (card c is bit c - 1)
+            dealt to each spot, i.e. before trading
+        trades: (rounds, NUM_TRADED) uint8, the cards traded in order,
+            see SimGame.trade
+        positions: (rounds, 4) uint8, the finishing order
+        move_offsets: (rounds + 1,) int64, round i's moves are moves
+            [move_offsets[i]:move_offsets[i + 1]]
+        moves: (moves,) uint64, the mask of the hand played; 0 is a pass
+        move_spots: (moves,) uint8, the spot making each move
+    """
+    game = SimGame(
+        make_policies(chunk.policy, chunk.seed), seed=chunk.seed, record=True
+    )
+    num_rounds = chunk.num_rounds
+    deals = np.zeros((num_rounds, 4), dtype=np.uint64)
+    trades = np.zeros((num_rounds, NUM_TRADED), dtype=np.uint8)
+    positions = np.zeros((num_rounds, 4), dtype=np.uint8)
+    move_offsets = np.zeros(num_rounds + 1, dtype=np.int64)
+    moves: List[int] = list()
+    move_spots: List[int] = list()
+    for i in range(num_rounds):
+        positions[i] = game.play_round()
+        deals[i] = game.dealt
+        trades[i, : len(game.traded)] = game.traded
+        moves.extend(game.moves)
+        move_spots.extend(game.move_spots)
+        move_offsets[i + 1] = len(moves)
+    return {
+        "deals": deals,
+        "trades": trades,
+        "positions": positions,
+        "move_offsets": move_offsets,
+        "moves": np.array(moves, dtype=np.uint64),
+        "move_spots": np.array(move_spots, dtype=np.uint8),
+    }
+
+
+def _write_chunk(chunk: Chunk, out_dir: str) -> int:
+    columns = play_chunk(chunk)
+    path = os.path.join(out_dir, f"rounds_{chunk.index:05d}.npz")
+    np.savez_compressed(
+        path, seed=np.uint64(chunk.seed), policy=chunk.policy, **columns
+    )
+    return len(columns["moves"])
+
+
+def self_play(
+    num_rounds: int,
+    out_dir: str,
+    *,
+    policy: str = "min",
+    seed: int = 0,
+    num_workers: int = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Writes num_rounds rounds to out_dir in chunks of chunk_size rounds,
+    played by a pool of num_workers processes (by default, one per
+    CPU); returns the number of moves written.
+    """
+    assert policy in POLICIES, f"unknown policy {policy}"
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = [
+        Chunk(
+            index,
+            min(chunk_size, num_rounds - start),
+            chunk_seed(seed, index),
+            policy,
+        )
+        for index, start in enumerate(range(0, num_rounds, chunk_size))
+    ]
+    with ProcessPoolExecutor(num_workers) as executor:
+        return sum(executor.map(_write_chunk, chunks, [out_dir] * len(chunks)))
+
+
+@main
+def run(
+    num_rounds: str,
+    out_dir: str,
+    policy: str = "min",
+    seed: str = "0",
+    num_workers: str = None,
+    chunk_size: str = str(CHUNK_SIZE),
+):
+    start = time.perf_counter()
+    num_moves = self_play(
+        int(num_rounds),
+        out_dir,
+        policy=policy,
+        seed=int(seed),
+        num_workers=num_workers and int(num_workers),
+        chunk_size=int(chunk_size),
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{num_rounds} rounds ({num_moves} moves) in {elapsed:.2f}s:"
+        f" {int(num_rounds) / elapsed:,.0f} rounds/s"
+    )
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from random import Random
+from typing import Iterable, List, Optional, Sequence, Union
+
+from ..game.frozen_hand import FrozenHand
+from ..game.game import BaseHand, TurnManager, base_hand
+from ..game.utils import cards_mask
+from .moves import RANK, RANKS, THREE_OF_CLUBS, Combos, mask_hand
+from .policies import MinPolicy, Policy
+
+
+class SimGame:
+    """
+    Headless presidents engine for simulating rounds at scale, e.g. for
+    bot tuning and rules regression. Follows Game's rules (the 3 of
+    clubs starts, passing, the finishing order and trading between the
+    president and asshole and the vice president and vice asshole) but
+    has no timers, messages, names or locking; the moves of each spot
+    are decided by its policy.
+
+    Cards are int masks (card c is bit c - 1) and so are moves: a play
+    is the mask of the hand played and a pass is 0. Illegal moves are
+    assertion errors since they can only come from buggy policies.
+
+    The cards dealt and traded in the current round are kept; if
+    record, so are its moves (see self_play.py).
+    """
+
+    def __init__(
+        self,
+        policies: Sequence[Policy] = None,
+        *,
+        seed: int = None,
+        record: bool = False,
+    ) -> None:
+        self._policies: List[Policy] = list(
+            policies or [MinPolicy() for _ in range(4)]
+        )
+        assert len(self._policies) == 4, "four policies required"
+        self._rng: Random = Random(seed)
+        self.num_rounds: int = 0
+        self.num_turns: int = 0
+        # game related attributes
+        self.cards: List[int] = [0 for _ in range(4)]
+        # the hands each spot can make, from the start of the round on
+        self.combos: List[Combos] = list()
+        self._turn_manager: TurnManager = None
+        self.current_player: Optional[int] = None
+        self.hand_in_play: Union[BaseHand, FrozenHand, None] = base_hand
+        self._num_consecutive_passes: int = 0
+        self._finishing_last_played: bool = False
+        # finishing order of the current or, between rounds, last round
+        self.positions: List[int] = list()
+        # round record
+        self._record: bool = record
+        self.dealt: List[int] = list()
+        # cards in the order they were traded, see trade
+        self.traded: List[int] = list()
+        self.moves: List[int] = list()
+        self.move_spots: List[int] = list()
+
+    @property
+    def can_pass(self) -> bool:
+        """
+        Whether the current player can pass, i.e. does not have to play
+        the 3 of clubs or win the last hand.
+        """
+        return self.hand_in_play is not base_hand and (
+            self.hand_in_play is not None
+        )
+
+    def deal(self, deck: Sequence[Iterable[int]] = None) -> None:
+        """
+        Deals the given cards of each spot or a shuffled deck.
+        """
+        if deck is None:
+            cards = list(range(1, 53))
+            self._rng.shuffle(cards)
+            deck = [cards[spot * 13 : (spot + 1) * 13] for spot in range(4)]
+        self.cards = [cards_mask(spot_cards) for spot_cards in deck]
+
+    def run(self, num_rounds: int) -> None:
+        for _ in range(num_rounds):
+            self.play_round()
+
+    def play_round(self, deck: Sequence[Iterable[int]] = None) -> List[int]:
+        """
+        Deals, trades if a round has already been played and plays the
+        round out; returns the finishing order, i.e. the positions.
+        """
+        self.deal(deck)
+        self.dealt = list(self.cards)
+        self.traded = list()
+        if self.positions:
+            self.trade()
+        self.start_round()
+        while self.current_player is not None:
+            self.step()
+        return self.positions
+
+    def start_round(self) -> None:
+        self.num_rounds += 1
+        self.positions = list()
+        self.hand_in_play = base_hand
+        self._num_consecutive_passes = 0
+        self._finishing_last_played = False
+        for spot in range(4):
+            if self.cards[spot] & THREE_OF_CLUBS:
+                break
+        self.combos = [Combos(cards) for cards in self.cards]
+        self._turn_manager = TurnManager(spot)
+        self.current_player = next(self._turn_manager)
+        if self._record:
+            self.moves = list()
+            self.move_spots = list()
+
+    def step(self) -> None:
+        """
+        Makes the current player's move.
+        """
+        spot = self.current_player
+        self.num_turns += 1
+        move = self._policies[spot].play(self, spot)
+        if self._record:
+            self.moves.append(move)
+            self.move_spots.append(spot)
+        if move:
+            self.play(spot, move)
+        else:
+            self.pass_turn(spot)
+
+    def legal_plays(self, spot: int) -> List[int]:
+        """
+        Masks of every hand the current player can play.
+        """
+        assert spot == self.current_player, f"it is not spot {spot}'s turn"
+        combos = self.combos[spot]
+        hand_in_play = self.hand_in_play
+        if hand_in_play is None:
+            return combos.all()
+        if hand_in_play is base_hand:
+            return [mask for mask in combos.all() if mask & THREE_OF_CLUBS]
+        return combos.beating(hand_in_play)
+
+    def is_playable(self, hand: FrozenHand) -> bool:
+        hand_in_play = self.hand_in_play
+        if hand_in_play is base_hand:
+            return 1 in hand  # card 1 is the 3 of clubs
+        if hand_in_play is None:
+            return True
+        return (
+            hand._id == hand_in_play._id or hand.is_bomb
+        ) and hand._strength > hand_in_play._strength
+
+    def play(self, spot: int, mask: int) -> None:
+        assert spot == self.current_player, f"it is not spot {spot}'s turn"
+        assert mask & self.cards[spot] == mask, "cards not in hand"
+        hand = mask_hand(mask)  # only valid hands have one
+        assert self.is_playable(hand), f"{hand} cannot be played"
+        self.cards[spot] ^= mask
+        self.combos[spot].remove(mask)
+        self.hand_in_play = hand
+        self._num_consecutive_passes = 0
+        if not self.cards[spot]:
+            # player_finish takes care of going to the next player
+            self._finishing_last_played = True
+            self._player_finish(spot)
+        else:
+            self._finishing_last_played = False
+            self.current_player = next(self._turn_manager)
+
+    def pass_turn(self, spot: int) -> None:
+        """
+        See Game._post_pass_handler.
+        """
+        assert spot == self.current_player, f"it is not spot {spot}'s turn"
+        assert self.can_pass, "cannot pass on the 3 of clubs or a won hand"
+        self._num_consecutive_passes += 1
+        num_unfinished_players = self._turn_manager._num_unfinished_players
+        # all remaining players passed on a winning hand or all other
+        # players passed on a hand
+        if self._num_consecutive_passes == num_unfinished_players - (
+            not self._finishing_last_played
+        ):
+            self.hand_in_play = None
+            self._finishing_last_played = False
+        self.current_player = next(self._turn_manager)
+
+    def _player_finish(self, spot: int) -> None:
+        self.positions.append(spot)
+        self._turn_manager.remove(spot)
+        if self._turn_manager._num_unfinished_players > 1:
+            self.current_player = next(self._turn_manager)
+        else:  # the last player is the asshole
+            self.positions.append(next(self._turn_manager))
+            self.current_player = None
+
+    def trade(self) -> None:
+        """
+        Using the positions of the last round, the president and vice
+        president give the asshole and vice asshole 2 and 1 cards of
+        their choice respectively and then ask them for as many cards,
+        in the order of Game._auto_trade. Askers cannot be given back
+        cards they gave.
+        """
+        cards = self.cards
+        for position, num_cards in [(0, 2), (1, 1)]:
+            asker = self.positions[position]
+            giver = self.positions[3 - position]
+            asker_policy = self._policies[asker]
+            giver_policy = self._policies[giver]
+            given = 0
+            for _ in range(num_cards):
+                card = asker_policy.give(self, asker, cards[asker])
+                assert _is_single_of(card, cards[asker]), "bad give"
+                cards[asker] ^= card
+                cards[giver] |= card
+                given |= card
+                self.traded.append(card.bit_length())
+            # ranks asked for that the giver had no cards of
+            already_asked = 0
+            for _ in range(num_cards):
+                while True:
+                    rank = asker_policy.ask(
+                        self, asker, RANKS & ~already_asked
+                    )
+                    assert not already_asked >> rank & 1, "bad ask"
+                    options = cards[giver] & ~given & RANK << 4 * rank
+                    if options:
+                        break
+                    already_asked |= 1 << rank
+                card = giver_policy.give(self, giver, options)
+                assert _is_single_of(card, options), "bad give"
+                cards[giver] ^= card
+                cards[asker] |= card
+                self.traded.append(card.bit_length())
+
+
+def _is_single_of(card: int, options: int) -> bool:
+    return card & options == card and card and not card & (card - 1)
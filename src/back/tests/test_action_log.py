@@ -0,0 +1,129 @@
+from ..game.action_log import ActionLog, ActionLogError
+from ..game.game import Game, PresidentsError, replay
+import pytest
+
+
+def clock() -> float:
+    # stopped, so a game's snapshots and those of its replays are taken at
+    # the same time, i.e. with the same times remaining
+    return 0
+
+
+def make_game(**kwargs) -> Game:
+    game: Game = Game(log_actions=True, turn_time=10, clock=clock, **kwargs)
+    for i in range(4):
+        game.add_player(f"player{i}")
+    game.start_round(setup=True)
+    return game
+
+
+def play_min_cards(game: Game, num_turns: int) -> None:
+    # plays the current player's min card or passes, through the logged
+    # actions only
+    for _ in range(num_turns):
+        if game.trading:
+            return
+        spot: int = game._current_player
+        chamber = game._chambers[spot]
+        card: int = chamber._get_min_card()
+        if card not in chamber.hand:
+            game.add_or_remove_card(spot, card)
+        try:
+            game.maybe_unlock_play(spot)
+            game.maybe_play_current_hand(spot)
+        except PresidentsError:
+            game.maybe_unlock_pass_turn(spot)
+            game.maybe_pass_turn(spot)
+
+
+def test_seed():
+    game: Game = make_game(seed=0)
+    same: Game = make_game(seed=0)
+    assert game.snapshot().chambers == same.snapshot().chambers
+    assert game.seed == 0
+    assert make_game().seed != make_game().seed
+
+
+def test_replay():
+    game: Game = make_game()
+    play_min_cards(game, 12)
+    # failed actions are logged too
+    with pytest.raises(PresidentsError):
+        game.maybe_play_current_hand((game._current_player + 1) % 4)
+    log: ActionLog = ActionLog.from_bytes(bytes(game.action_log))
+    assert log.num_actions == game.action_log.num_actions
+    assert replay(log, clock=clock).snapshot() == game.snapshot()
+
+
+def test_replay_trading():
+    game: Game = make_game(seed=1)
+    play_min_cards(game, 1000)
+    assert game.trading
+    game._handle_trading_timeout()
+    play_min_cards(game, 8)
+    assert replay(game.action_log, clock=clock).snapshot() == game.snapshot()
+
+
+def test_keywords():
+    # logged and replayed the same however the actions are called
+    game: Game = Game(log_actions=True, turn_time=10, seed=2, clock=clock)
+    for i in range(4):
+        game.add_player(name=f"player{i}")
+    game.start_round(setup=True)
+    spot: int = game._current_player
+    card: int = game._chambers[spot]._get_min_card()
+    game.add_or_remove_card(spot=spot, card=card)
+    game.maybe_unlock_play(spot=spot)
+    game.maybe_play_current_hand(spot=spot)
+    game.lock(spot=spot)
+    game.pause()
+    game.resume()
+    same: Game = make_game(seed=2)
+    same.add_or_remove_card(spot, card)
+    same.maybe_unlock_play(spot)
+    same.maybe_play_current_hand(spot)
+    same.lock(spot)
+    same.pause()
+    same.resume()
+    assert [action[1:] for action in game.action_log] == [
+        action[1:] for action in same.action_log
+    ]
+    assert game.action_log.num_actions == 11
+    assert replay(game.action_log, clock=clock).snapshot() == game.snapshot()
+
+
+def test_unloggable():
+    # the game's time is not left frozen by calls that cannot be logged
+    game: Game = make_game()
+    num_actions: int = game.action_log.num_actions
+    with pytest.raises(TypeError):
+        game.add_player()
+    assert game._action_time is None
+    assert game.action_log.num_actions == num_actions
+    assert replay(game.action_log, clock=clock).snapshot() == game.snapshot()
+
+
+def test_tail():
+    game: Game = make_game()
+    stored: bytes = bytes(game.action_log)
+    play_min_cards(game, 4)
+    stored += game.action_log.tail(len(stored))
+    assert stored == bytes(game.action_log)
+    assert (
+        replay(ActionLog.from_bytes(stored), clock=clock).snapshot()
+        == game.snapshot()
+    )
+
+
+def test_unlogged():
+    game: Game = make_game()
+    assert game.clone().action_log is None
+    assert Game().action_log is None
+
+
+def test_version():
+    data: bytes = bytes(make_game().action_log)
+    with pytest.raises(ActionLogError, match="version 0"):
+        ActionLog.from_bytes(b"\x00" + data[1:])
+    with pytest.raises(ActionLogError):
+        ActionLog.from_bytes(b"")
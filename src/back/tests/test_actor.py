@@ -0,0 +1,101 @@
+from ..utils.actor import Actor, ActorClosedError
+import asyncio
+import pytest
+
+
+class Recorder:
+    def __init__(self):
+        self.handled = list()
+        # the values handled in each drain
+        self.flushed = list()
+        self._drain = list()
+
+    def handle(self, value):
+        if value is None:
+            raise ValueError("no value")
+        self.handled.append(value)
+        self._drain.append(value)
+        return value
+
+    async def flush(self):
+        self.flushed.append(self._drain)
+        self._drain = list()
+        # gives senders a chance to fill the mailbox
+        await asyncio.sleep(0)
+
+
+def test_ask():
+    async def run():
+        recorder = Recorder()
+        actor = Actor(recorder.flush)
+        assert await actor.ask(recorder.handle, 0) == 0
+        # sent before the first drain so handled in one drain
+        results = await asyncio.gather(
+            *(actor.ask(recorder.handle, value) for value in range(1, 5))
+        )
+        assert results == [1, 2, 3, 4]
+        assert recorder.flushed == [[0], [1, 2, 3, 4]]
+        with pytest.raises(ValueError, match="no value"):
+            await actor.ask(recorder.handle, None)
+        assert actor.metrics["handled"] == 6
+        assert actor.metrics["drains"] == 3
+        assert actor.metrics["max_depth"] == 4
+        assert not len(actor)
+        actor.close()
+
+    asyncio.run(run())
+
+
+def test_backpressure():
+    async def run():
+        recorder = Recorder()
+        actor = Actor(recorder.flush, maxsize=2, max_batch=2)
+        results = await asyncio.gather(
+            *(actor.ask(recorder.handle, value) for value in range(7))
+        )
+        # waiting senders keep their order
+        assert results == recorder.handled == list(range(7))
+        assert recorder.flushed == [[0, 1], [2, 3], [4, 5], [6]]
+        assert actor.metrics["max_depth"] == 2
+        actor.close()
+
+    asyncio.run(run())
+
+
+def test_tell():
+    async def run():
+        recorder = Recorder()
+        actor = Actor(recorder.flush, maxsize=1)
+        for value in range(3):
+            actor.tell(recorder.handle, value)
+        await actor.ask(recorder.handle, 3)
+        assert recorder.handled == [0, 1, 2, 3]
+        actor.close()
+
+    asyncio.run(run())
+
+
+def test_close():
+    async def run():
+        recorder = Recorder()
+        actor = Actor(recorder.flush, maxsize=1)
+        await actor.ask(recorder.handle, 0)
+        # one in the mailbox and one waiting for room
+        asks = [
+            asyncio.ensure_future(actor.ask(recorder.handle, value))
+            for value in (1, 2)
+        ]
+        await asyncio.sleep(0)
+        actor.close()
+        for ask in asks:
+            with pytest.raises(ActorClosedError):
+                await ask
+        # closed actors are not restarted
+        actor.tell(recorder.handle, 3)
+        with pytest.raises(ActorClosedError):
+            await actor.ask(recorder.handle, 4)
+        await asyncio.sleep(0)
+        assert actor._task is None and not len(actor)
+        assert recorder.handled == [0]
+
+    asyncio.run(run())
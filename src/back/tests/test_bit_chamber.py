@@ -0,0 +1,200 @@
+from ..game.bit_chamber import BitChamber
+from ..game.bit_hand import BitHand
+from ..game.chamber import (
+    Chamber,
+    CardAlreadyInChamberError,
+    CardNotInChamberError,
+    HandAlreadyStoredError,
+    HandNotStorableError,
+    HandNotStoredError,
+)
+from ..game.game import Game
+from ..game.hand import DuplicateCardError
+from itertools import combinations
+import random
+import pytest
+
+
+def test_constructor():
+    chamber: BitChamber = BitChamber()
+    assert isinstance(chamber.hand, BitHand)
+    assert chamber.hand.is_empty
+    assert chamber.is_empty
+    assert all(card not in chamber for card in range(1, 53))
+
+    chamber = BitChamber(range(1, 14))
+    assert all(card in chamber for card in range(1, 14))
+    assert all(card not in chamber for card in range(14, 53))
+    assert chamber.num_cards == 13
+    assert chamber._num_hands == 0
+
+
+def test__contains__and__iter__():
+    chamber: BitChamber = BitChamber([52, 1, 27])
+    assert list(chamber) == [1, 27, 52]
+    assert chamber.cards == [1, 27, 52]
+    assert [1, 27] not in chamber
+    chamber = BitChamber(range(1, 14))
+    chamber.add_hand([1, 2])
+    assert [1, 2] in chamber
+    assert BitHand([2, 1]) in chamber
+    assert [1, 3] not in chamber
+
+
+def test_add_and_remove_card():
+    chamber: BitChamber = BitChamber()
+    chamber.add_card(1)
+    assert 1 in chamber
+    assert chamber.num_cards == 1
+    with pytest.raises(CardAlreadyInChamberError):
+        chamber.add_card(1)
+
+    chamber.add_cards([2, 3, 5])
+    chamber.add_hand([1, 2, 3])
+    chamber.add_hand([2, 3])
+    chamber.select_card(1)
+    chamber.remove_card(1)
+    assert 1 not in chamber
+    assert chamber.hand.is_empty
+    assert [1, 2, 3] not in chamber
+    assert [2, 3] in chamber
+    assert chamber.triples.size == 0
+    # only cards in stored hands are indexed
+    assert sorted(chamber._card_hands) == [2, 3]
+    assert chamber.num_cards == 3
+    with pytest.raises(CardNotInChamberError):
+        chamber.remove_card(1)
+
+
+def test_add_hand():
+    chamber: BitChamber = BitChamber(range(1, 14))
+    with pytest.raises(HandNotStorableError):
+        chamber.add_hand([1, 5])
+    chamber.add_hand([4, 3])
+    chamber.add_hand([1, 2])
+    with pytest.raises(HandAlreadyStoredError):
+        chamber.add_hand([1, 2])
+    assert [hand_node.hand.to_list() for hand_node in chamber._hand_nodes] == [
+        [1, 2],
+        [3, 4],
+    ]
+
+    # storing the current hand deselects it
+    chamber.select_cards([5, 6, 7])
+    chamber.add_hand(chamber.hand)
+    assert chamber.hand.is_empty
+    assert [5, 6, 7] in chamber
+
+
+def test_remove_hand():
+    chamber: BitChamber = BitChamber(range(1, 14))
+    chamber.add_hand([1, 2])
+    chamber.add_hand([1, 2, 3])
+    chamber.remove_hand(BitHand([1, 2]))
+    assert [1, 2] not in chamber
+    assert [1, 2, 3] in chamber
+    assert chamber._num_hands == 1
+    assert [
+        hand_node.hand.to_list() for hand_node in chamber._card_hand_nodes(2)
+    ] == [[1, 2, 3]]
+    with pytest.raises(HandNotStoredError):
+        chamber.remove_hand([1, 2])
+    chamber.clear_hands()
+    assert chamber._num_hands == 0
+    assert not chamber._card_hands
+
+
+def test_selection():
+    chamber: BitChamber = BitChamber(range(1, 14))
+    chamber.add_hand([1, 2])
+    chamber.add_hand([1, 2, 3])
+    hand_nodes = list(chamber._hand_nodes)
+    chamber.select_card(1)
+    assert [chamber._num_cards_selected(node) for node in hand_nodes] == [
+        1,
+        1,
+    ]
+    chamber.select_card(3)
+    assert [chamber._num_cards_selected(node) for node in hand_nodes] == [
+        1,
+        2,
+    ]
+    with pytest.raises(DuplicateCardError):
+        chamber.select_card(1)
+    with pytest.raises(CardNotInChamberError):
+        chamber.select_card(52)
+    chamber.deselect_selected()
+    assert chamber.hand.is_empty
+    assert [chamber._num_cards_selected(node) for node in hand_nodes] == [
+        0,
+        0,
+    ]
+
+
+def test_min_max_random_card():
+    chamber: BitChamber = BitChamber([5, 17, 52])
+    assert chamber._get_min_card() == 5
+    assert chamber._get_max_card() == 52
+    assert {chamber._get_random_card() for _ in range(100)} == {5, 17, 52}
+    assert BitChamber()._get_min_card() is None
+
+
+def test_matches_chamber():
+    random.seed(0)
+    for _ in range(20):
+        cards = random.sample(range(1, 53), 13)
+        chamber: Chamber = Chamber(cards)
+        bit_chamber: BitChamber = BitChamber(cards)
+        for num_cards in range(2, 6):
+            for hand in combinations(sorted(cards), num_cards):
+                try:
+                    chamber.add_hand(hand)
+                except HandNotStorableError:
+                    continue
+                bit_chamber.add_hand(hand)
+        for card in random.sample(cards, 5):
+            chamber.remove_card(card)
+            bit_chamber.remove_card(card)
+        assert list(chamber) == list(bit_chamber)
+        assert [node.hand for node in chamber._hand_nodes] == [
+            node.hand for node in bit_chamber._hand_nodes
+        ]
+        assert chamber._get_min_card() == bit_chamber._get_min_card()
+        assert chamber._get_max_card() == bit_chamber._get_max_card()
+
+
+def test_game_chamber_class():
+    game: Game = Game(chamber_class=BitChamber)
+    assert all(isinstance(chamber, BitChamber) for chamber in game._chambers)
+    game.reset()
+    assert all(isinstance(chamber, BitChamber) for chamber in game._chambers)
+
+
+def test_enumerate_combos():
+    cards = [1, 2, 3, 4, 5, 6, 9, 13, 17, 18, 30, 50, 51]
+    bit_chamber: BitChamber = BitChamber(cards)
+    combos = bit_chamber.enumerate_combos(store=True)
+    assert combos == Chamber(cards).enumerate_combos()
+    assert bit_chamber._num_hands == len(combos)
+
+
+def test_snapshot_and_clone():
+    cards = [1, 2, 3, 5, 6, 9, 13, 17, 21, 25, 26, 27, 28]
+    chamber: Chamber = Chamber(cards)
+    bit_chamber: BitChamber = BitChamber(cards)
+    for each in (chamber, bit_chamber):
+        each.enumerate_combos(store=True)
+        each.select_cards([1, 5])
+    snapshot = bit_chamber.snapshot()
+    assert snapshot == chamber.snapshot()
+
+    clone: BitChamber = bit_chamber.clone()
+    assert isinstance(clone, BitChamber)
+    clone.remove_card(1)
+    clone.deselect_selected()
+    assert bit_chamber.snapshot() == snapshot
+    clone.restore(snapshot)
+    assert clone.snapshot() == snapshot
+    assert [clone._num_cards_selected(node) for node in clone._hand_nodes][
+        :2
+    ] == [1, 1]
@@ -0,0 +1,168 @@
+from ..game.bit_hand import BitHand
+from ..game.hand import (
+    Hand,
+    CardNotInHandError,
+    DuplicateCardError,
+    FullHandError,
+    NotPlayableOnError,
+)
+from itertools import combinations
+import random
+import pytest
+
+
+def test_default_constructor():
+    hand: BitHand = BitHand()
+    assert hand._mask == 0
+    assert hand._id == 0
+    assert len(hand) == 0
+    assert hand.is_empty
+
+
+def test_testing_constructor():
+    hand = BitHand([0, 0, 1])
+    assert hand._mask == 0b1
+    assert hand._id == 11
+
+    hand = BitHand([52, 1])
+    assert hand._mask == 1 << 51 | 1
+    assert hand.to_list() == [1, 52]
+    assert hand._id == 20
+
+    hand = BitHand([5, 4, 3, 2, 1])
+    assert hand.to_list() == [1, 2, 3, 4, 5]
+    assert hand._id == 53
+    assert hand.is_full
+
+    with pytest.raises(AssertionError, match=r"up to 5"):
+        BitHand([1, 2, 3, 4, 5, 6])
+
+    with pytest.raises(AssertionError, match=r"must be ints"):
+        BitHand([1, "hello", 3, "world", 5])
+
+    with pytest.raises(AssertionError, match=r"unique"):
+        BitHand([0, 1, 0, 1, 0])
+
+
+def test_copy_constructor():
+    hand: BitHand = BitHand([1, 2, 3, 4, 5])
+    hand_copy = BitHand.copy(hand)
+    assert hand == hand_copy
+    hand_copy.remove(1)
+    assert hand != hand_copy
+
+
+def test__getitem__():
+    hand: BitHand = BitHand([1, 5, 9])
+    assert hand[4] == 9
+    assert hand[2] == 1
+    assert hand[0] == 0
+    assert hand[2:] == [1, 5, 9]
+
+
+def test__contains__and__iter__():
+    hand: BitHand = BitHand([52, 1, 27])
+    assert all(card in hand for card in [1, 27, 52])
+    assert 2 not in hand
+    assert list(hand) == [1, 27, 52]
+
+
+def test__eq__():
+    assert BitHand([1, 2]) == BitHand([2, 1])
+    assert BitHand([1, 2]) == Hand([1, 2])
+    assert Hand([1, 2]) == BitHand([1, 2])
+    assert BitHand([1, 2]) != BitHand([1, 3])
+
+
+def test__hash__():
+    assert hash(BitHand([1, 5, 9, 13, 17])) == hash(Hand([1, 5, 9, 13, 17]))
+
+
+def test_identify_matches_hand():
+    # every 1, 2 and 3 card hand plus a sample of 4 and 5 card hands
+    hands = [
+        cards for n in range(1, 4) for cards in combinations(range(1, 53), n)
+    ]
+    random.seed(0)
+    hands.extend(
+        random.sample(range(1, 53), random.choice([4, 5])) for _ in range(5000)
+    )
+    # make sure every kind of five card hand shows up
+    hands.extend(
+        [
+            [1, 2, 3, 5, 6],
+            [1, 5, 9, 13, 17],
+            [1, 2, 3, 4, 52],
+            [33, 37, 41, 45, 49],
+        ]
+    )
+    for cards in hands:
+        assert BitHand(cards)._id == Hand(list(cards))._id, cards
+
+
+def test_comparisons():
+    hand1: BitHand = BitHand([1, 2])
+    hand2: BitHand = BitHand([3])
+
+    with pytest.raises(NotPlayableOnError):
+        hand1 < hand2
+
+    hand2 = BitHand([3, 4])
+    assert hand1 < hand2
+    assert hand2 > hand1
+    assert hand1 <= BitHand([1, 2])
+
+    # bombs are played on anything, nothing is played on bombs
+    bomb: BitHand = BitHand([5, 6, 7, 8, 9])
+    assert bomb > hand2
+    with pytest.raises(NotPlayableOnError):
+        hand2 < bomb
+    assert BitHand([1, 2, 3, 4, 52]) < bomb
+
+    # triples and fullhouses are decided by the triple
+    assert BitHand([1, 2, 3, 51, 52]) < BitHand([5, 6, 7, 9, 10])
+
+
+def test_add():
+    hand: BitHand = BitHand()
+    hand.add(1)
+    assert hand._id == 11
+    hand.add(2)
+    assert hand._id == 21
+    hand.add(52)
+    assert hand.to_list() == [1, 2, 52]
+    assert hand._id == 30
+
+    with pytest.raises(AssertionError, match=r"invalid card"):
+        hand.add(53)
+
+    with pytest.raises(DuplicateCardError):
+        hand.add(1)
+
+    hand = BitHand([1, 2, 3, 4, 5])
+    with pytest.raises(FullHandError):
+        hand.add(6)
+
+
+def test_remove():
+    hand: BitHand = BitHand()
+    with pytest.raises(CardNotInHandError, match=r"empty hand"):
+        hand.remove(1)
+
+    hand = BitHand([1, 2, 3, 4, 5])
+    hand.remove(1)
+    assert hand.to_list() == [2, 3, 4, 5]
+    assert hand._id == 40
+    hand.remove(5)
+    assert hand._id == 31
+
+    with pytest.raises(CardNotInHandError, match=r"not in hand"):
+        hand.remove(52)
+
+
+def test_reset():
+    hand: BitHand = BitHand([1, 2, 3, 4, 5])
+    hand.reset()
+    assert hand.is_empty
+    assert hand._mask == 0
+    assert len(hand) == 0
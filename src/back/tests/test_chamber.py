@@ -7,9 +7,14 @@ from ..game.chamber import (
     HandPointerNode,
     HandNodeDLList,
     HandNode,
+    HandAlreadyStoredError,
+    HandNotStoredError,
 )
+from ..game.bit_chamber import BitChamber
 from ..game.hand import CardNotInHandError, DuplicateCardError, FullHandError
 from ..game.utils import IterNodesDLList
+from itertools import combinations
+import random
 import pytest
 
 
@@ -504,6 +509,181 @@ def test_clear_hands():
     assert chamber._hands.size == 0
 
 
+def test_hand_index():
+    chamber: Chamber = Chamber(range(1, 21))
+    chamber.add_hand([1, 2])
+    chamber.add_hand([1, 2, 3])
+    chamber.add_hand([17, 5, 9, 13, 1])
+    assert chamber._num_hands == 3
+    assert chamber._hand_index[hash(Hand([2, 1]))].hand == Hand([1, 2])
+    assert [2, 1] in chamber
+    assert Hand([1, 5, 9, 13, 17]) in chamber
+    assert [1, 3] not in chamber
+    with pytest.raises(HandAlreadyStoredError):
+        chamber.add_hand([2, 1])
+
+    # removing a card removes the stored hands it is in
+    chamber.remove_card(3)
+    assert chamber._num_hands == 2
+    assert [1, 2, 3] not in chamber
+    chamber.clear_hands()
+    assert chamber._num_hands == 0
+    assert not chamber._hand_index
+
+
+def test_remove_hand():
+    chamber: Chamber = Chamber(range(1, 14))
+    chamber.add_hand([1, 2])
+    chamber.add_hand([1, 2, 3])
+    chamber.remove_hand([2, 1])
+    assert [1, 2] not in chamber
+    assert [1, 2, 3] in chamber
+    assert chamber._num_hands == 1
+    assert chamber.doubles.size == 0
+    assert chamber._cards[1].size == 1
+    assert chamber._cards[2].size == 1
+    with pytest.raises(HandNotStoredError):
+        chamber.remove_hand([1, 2])
+    # the cards stay in the chamber
+    assert 1 in chamber and 2 in chamber
+
+
+def test_combo_order():
+    chamber: Chamber = Chamber(range(1, 29))
+    # stored in arbitrary order, kept in order of strength
+    for hand in [[9, 10], [1, 2], [25, 26], [5, 8], [5, 6], [13, 14]]:
+        chamber.add_hand(hand)
+    doubles = [hand.to_list() for hand in chamber.doubles]
+    assert doubles == [[1, 2], [5, 6], [5, 8], [9, 10], [13, 14], [25, 26]]
+    assert chamber.doubles.first.value == Hand([1, 2])
+    assert chamber.doubles.last.value == Hand([25, 26])
+
+    chamber.remove_hand([5, 8])
+    chamber.remove_card(9)
+    doubles = [hand.to_list() for hand in chamber.doubles]
+    assert doubles == [[1, 2], [5, 6], [13, 14], [25, 26]]
+    assert chamber.doubles._nodes == list(chamber.doubles.iter_nodes())
+    assert chamber.doubles._sort_keys == sorted(chamber.doubles._sort_keys)
+
+
+def test_min_hand_beating():
+    chamber: Chamber = Chamber(range(1, 29))
+    chamber.add_hand([13, 14])
+    chamber.add_hand([1, 2])
+    chamber.add_hand([5, 6])
+    assert chamber.min_hand_beating(Hand([3, 4])) == Hand([5, 6])
+    assert chamber.min_hand_beating(Hand([5, 7])) == Hand([13, 14])
+    assert chamber.min_hand_beating(Hand([25, 26])) is None
+    assert chamber.min_hand_beating(Hand([1, 2, 3])) is None
+
+    # bombs beat anything when there is no stronger hand of the combo
+    chamber.add_hand([17, 18, 19, 20, 28])
+    chamber.add_hand([9, 10, 11, 12, 28])
+    assert chamber.min_hand_beating(Hand([3, 4])) == Hand([5, 6])
+    assert chamber.min_hand_beating(Hand([25, 26])) == Hand(
+        [9, 10, 11, 12, 28]
+    )
+    assert chamber.min_hand_beating(Hand([52])) == Hand([9, 10, 11, 12, 28])
+    assert chamber.min_hand_beating(Hand([9, 10, 11, 12, 28])) == Hand(
+        [17, 18, 19, 20, 28]
+    )
+    assert chamber.min_hand_beating(Hand([17, 18, 19, 20, 28])) is None
+
+    chamber.clear_hands()
+    assert chamber.min_hand_beating(Hand([3, 4])) is None
+
+
+def test_enumerate_combos():
+    random.seed(0)
+    for _ in range(20):
+        cards = random.sample(range(1, 53), 13)
+        chamber: Chamber = Chamber(cards)
+        expected = {
+            hand
+            for num_cards in range(2, 6)
+            for hand in combinations(sorted(cards), num_cards)
+            if Hand(list(hand)).is_valid
+        }
+        combos = chamber.enumerate_combos()
+        assert len(combos) == len(expected)
+        assert {tuple(hand) for hand in combos} == expected
+        assert chamber._num_hands == 0
+
+    chamber = Chamber([1, 2, 3, 4, 5, 6, 9, 13, 17])
+    chamber.add_hand([1, 2])
+    combos = chamber.enumerate_combos(store=True)
+    assert [hand.id_str for hand in combos][:6] == ["double"] * 6
+    assert chamber._num_hands == len(combos)
+    assert [1, 2, 3, 4, 5] in chamber
+    assert [1, 5, 9, 13, 17] in chamber
+
+
+@pytest.mark.parametrize("chamber_class", [Chamber, BitChamber])
+def test_enumerate_combos_selection(chamber_class):
+    chamber: Chamber = chamber_class([1, 2, 3, 4, 5, 6, 9, 13, 17])
+    chamber.select_cards([1, 5])
+    combos = chamber.enumerate_combos(store=True)
+    # only the combos with every selected card are stored
+    stored = [hand_node.hand for hand_node in chamber._hand_nodes]
+    assert stored == [hand for hand in combos if 1 in hand and 5 in hand]
+    assert [1, 5, 9, 13, 17] in chamber and [1, 2] not in chamber
+    # counting the selected cards in them; BitChambers derive the
+    # counts from the masks
+    def num_cards_selected():
+        return {
+            chamber._num_cards_selected(hand_node)
+            if isinstance(chamber, BitChamber)
+            else hand_node._num_cards_selected
+            for hand_node in chamber._hand_nodes
+        }
+
+    assert num_cards_selected() == {2}
+    chamber.deselect_card(5)
+    assert num_cards_selected() == {1}
+
+
+def test_snapshot_and_restore():
+    chamber: Chamber = Chamber(range(1, 14))
+    chamber.add_hand([5, 6, 7])
+    chamber.add_hand([1, 2])
+    chamber.select_cards([2, 3])
+    snapshot = chamber.snapshot()
+    assert snapshot.cards == 2 ** 13 - 1
+    assert snapshot.selected == 0b110
+    assert [hand.to_list() for hand in snapshot.hands] == [[1, 2], [5, 6, 7]]
+
+    chamber.remove_card(1)
+    chamber.deselect_selected()
+    chamber.add_hand([9, 10])
+    chamber.restore(snapshot)
+    assert chamber.snapshot() == snapshot
+    assert list(chamber) == list(range(1, 14))
+    assert chamber.hand.to_list() == [2, 3]
+    assert chamber._num_hands == 2
+    assert [9, 10] not in chamber
+    hand_nodes = list(chamber._hand_nodes)
+    assert [node._num_cards_selected for node in hand_nodes] == [1, 0]
+    # restored hand nodes are linked to their cards
+    chamber.remove_card(2)
+    assert [1, 2] not in chamber
+    assert [5, 6, 7] in chamber
+
+
+def test_clone():
+    chamber: Chamber = Chamber(range(1, 14))
+    chamber.add_hand([1, 2])
+    chamber.select_card(1)
+    clone: Chamber = chamber.clone()
+    assert isinstance(clone, Chamber)
+    assert clone.snapshot() == chamber.snapshot()
+    clone.remove_card(1)
+    clone.add_hand([3, 4])
+    assert 1 in chamber
+    assert chamber.hand.to_list() == [1]
+    assert [1, 2] in chamber
+    assert [3, 4] not in chamber
+
+
 def test_check_card_in():
     chamber: Chamber = Chamber(range(1, 14))
     assert chamber._check_card_in(1) is None
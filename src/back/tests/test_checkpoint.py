@@ -0,0 +1,87 @@
+from ..game.checkpoint import CheckpointError, EmittingGameCheckpoint
+from ..game.frozen_hand import FrozenHand
+from ..game.game import Game, base_hand
+from ..game.hand import Hand
+import pickle
+import pytest
+
+
+def make_checkpoint(game: Game, **kwargs) -> EmittingGameCheckpoint:
+    return EmittingGameCheckpoint(
+        **{
+            "game_id": "game",
+            "name": "gamé",
+            "turn_time": 10,
+            "reserve_time": 20,
+            "trading_time": 5,
+            "giving_time": 3,
+            "spot_sids": ((0, "sid0"), (2, "sid2")),
+            "user_ids": ("user0", None, "user2", None),
+            "dot_colors": ("red", "green", "red", "red"),
+            "running": True,
+            "snapshot": game.snapshot(),
+            "seed": game.seed,
+            # larger than 64 bits
+            "rng_state": (3 << 100 | 5, 7 << 70 | 1, True, 11),
+            "time": 12.5,
+            "actions_offset": 45,
+            "acks": (("sid0", (3, 1)), ("sid2", (1, 0))),
+            **kwargs,
+        }
+    )
+
+
+def test_round_trip():
+    game: Game = Game(turn_time=10)
+    game._set_up_testing_base(
+        deck=[range(1, 14), range(14, 27), range(27, 40), range(40, 53)]
+    )
+    chamber = game._chambers[0]
+    chamber.add_hand(Hand([1, 2]))
+    chamber.select_card(3)
+    checkpoint = make_checkpoint(game)
+    assert checkpoint.snapshot.hand_in_play is base_hand
+    # the running turn timer is paused in the snapshot
+    assert checkpoint.snapshot.paused_timers == (
+        ("turn", game._current_player),
+    )
+    assert 0 < checkpoint.snapshot.turn_times[game._current_player] <= 10
+    data: bytes = checkpoint.to_bytes()
+    assert EmittingGameCheckpoint.from_bytes(data) == checkpoint
+    assert len(data) < len(pickle.dumps(checkpoint))
+
+    (hand,) = (
+        EmittingGameCheckpoint.from_bytes(data).snapshot.chambers[0].hands
+    )
+    assert hand is FrozenHand([1, 2])
+
+
+def test_round_trip_trading():
+    game: Game = Game()
+    game._set_up_testing_base()
+    game._get_game_to_trading()
+    checkpoint = make_checkpoint(game, running=False)
+    restored = EmittingGameCheckpoint.from_bytes(checkpoint.to_bytes())
+    assert restored == checkpoint
+    assert restored.snapshot.trading and len(restored.snapshot.positions) == 4
+
+    game.restore(restored.snapshot)
+    assert game.snapshot() == checkpoint.snapshot
+
+
+def test_round_trip_reset():
+    game: Game = Game()
+    game._set_up_testing_base()
+    game.reset()
+    checkpoint = make_checkpoint(game, running=False)
+    assert checkpoint.snapshot.turn_times == (None,) * 4
+    restored = EmittingGameCheckpoint.from_bytes(checkpoint.to_bytes())
+    assert restored == checkpoint
+
+
+def test_version():
+    data: bytes = make_checkpoint(Game()).to_bytes()
+    with pytest.raises(CheckpointError, match="version 1"):
+        EmittingGameCheckpoint.from_bytes(b"\x01" + data[1:])
+    with pytest.raises(CheckpointError, match="version 0"):
+        EmittingGameCheckpoint.from_bytes(b"\x00" + data[1:])
@@ -0,0 +1,89 @@
+from ..utils.direct_agent import DirectAgent
+import asyncio
+
+
+async def echo(stream):
+    async for value in stream:
+        if value is None:
+            raise ValueError("no value")
+        if value < 0:
+            # not replied to
+            continue
+        yield value, stream.current_event.key, (
+            stream.current_event.message.partition
+        )
+
+
+def test_ask():
+    async def run():
+        agent = DirectAgent(echo)
+        agent.start()
+        assert await agent.ask(1, key="game") == (1, "game", 0)
+        results = await asyncio.gather(
+            *(agent.ask(value) for value in range(2, 6))
+        )
+        assert results == [(value, None, 0) for value in range(2, 6)]
+        # values the agent does not yield for are replied to with None
+        assert await agent.ask(-1) is None
+        agent.stop()
+
+    asyncio.run(run())
+
+
+def test_cast():
+    async def run():
+        handled = list()
+
+        async def record(stream):
+            async for value in stream:
+                handled.append(value)
+                yield value
+
+        agent = DirectAgent(record)
+        for value in range(3):
+            await agent.cast(value)
+        assert len(agent) == 3
+        agent.start()
+        # taken in the order they were sent
+        assert await agent.ask(3) == 3
+        assert handled == [0, 1, 2, 3]
+        assert not len(agent)
+        agent.stop()
+
+    asyncio.run(run())
+
+
+def test_concurrency():
+    async def run():
+        started = asyncio.Event()
+
+        async def wait(stream):
+            async for value in stream:
+                if value == "wait":
+                    await started.wait()
+                yield value
+
+        agent = DirectAgent(wait, concurrency=2)
+        agent.start()
+        waiting = asyncio.ensure_future(agent.ask("wait"))
+        # the other instance takes values meanwhile
+        assert await agent.ask("go") == "go"
+        assert not waiting.done()
+        started.set()
+        assert await waiting == "wait"
+        agent.stop()
+
+    asyncio.run(run())
+
+
+def test_crash():
+    async def run():
+        agent = DirectAgent(echo)
+        agent.start()
+        # the value that crashed the agent is replied to with None and
+        # the agent is restarted
+        assert await agent.ask(None) is None
+        assert await agent.ask(1) == (1, None, 0)
+        agent.stop()
+
+    asyncio.run(run())
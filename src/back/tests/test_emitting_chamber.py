@@ -0,0 +1,94 @@
+from ..game.emitting_chamber import EmittingChamber, EmittingBitChamber
+from ..game.outbox import Event, Outbox
+import pytest
+
+
+@pytest.mark.parametrize(
+    "chamber_class", [EmittingChamber, EmittingBitChamber]
+)
+def test_events(chamber_class):
+    outbox = Outbox()
+    chamber = chamber_class(outbox, 2)
+    chamber.add_cards([1, 2, 5])
+    chamber.add_hand([1, 2])
+    chamber.select_card(1)
+    chamber.select_card(2)
+    events = outbox.drain()
+    assert all(event.spot == 2 for event in events)
+    assert [event.name for event in events] == [
+        "add_card",
+        "add_card",
+        "add_card",
+        "store_hand",
+        "select_card",
+        "select_hand",  # first card of the stored hand selected
+        "update_current_hand_str",
+        "select_card",
+        "update_current_hand_str",
+    ]
+    hand_id = events[3].payload["id"]
+    assert events[3].payload["cards"] == [1, 2]
+    assert events[5].payload == {"id": hand_id}
+
+    chamber.deselect_cards([1, 2])
+    assert outbox.drain() == [
+        Event(2, "deselect_card", {"card": 1}),
+        Event(2, "deselect_card", {"card": 2}),
+        Event(2, "deselect_hand", {"id": hand_id}),
+        Event(2, "update_current_hand_str", {"str": str(chamber.hand)}),
+    ]
+
+    # identified as when it was stored, however it is given
+    chamber.remove_hand([2, 1])
+    assert outbox.drain() == [Event(2, "remove_hand", {"id": hand_id})]
+    assert not chamber._hand_index
+
+    chamber.remove_cards([1, 2])
+    assert [event.name for event in outbox.drain()] == [
+        "remove_card",
+        "remove_card",
+        "update_current_hand_str",
+    ]
+    assert not len(outbox)
+
+
+@pytest.mark.parametrize(
+    "chamber_class", [EmittingChamber, EmittingBitChamber]
+)
+def test_enumerate_combos(chamber_class):
+    outbox = Outbox()
+    chamber = chamber_class(outbox, 0, [1, 2, 3, 5, 6, 9, 13, 17])
+    chamber.add_hand([1, 2])
+    outbox.drain()
+    assert chamber.enumerate_combos() and not len(outbox)
+
+    combos = chamber.enumerate_combos(store=True)
+    # the already stored hand is not stored again
+    stored = [hand for hand in combos if hand.to_list() != [1, 2]]
+    assert outbox.drain() == [
+        Event(
+            0,
+            "store_hand",
+            {
+                "id": hash(hand),
+                "cards": hand.to_list(),
+                "id_desc": hand.id_desc,
+            },
+        )
+        for hand in stored
+    ]
+
+    # combos stored with selected cards in them are selected
+    chamber.clear_hands()
+    chamber.select_card(5)
+    outbox.drain()
+    combos = chamber.enumerate_combos(store=True)
+    events = outbox.drain()
+    with_five = [hash(hand) for hand in combos if 5 in hand]
+    assert [event.payload["id"] for event in events] == [
+        hand_hash for hand_hash in with_five for _ in range(2)
+    ]
+    assert [event.name for event in events] == [
+        "store_hand",
+        "select_hand",
+    ] * len(with_five)
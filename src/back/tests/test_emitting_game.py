@@ -0,0 +1,316 @@
+from ..game.action_log import ActionLog
+from ..game.checkpoint import CheckpointError, EmittingGameCheckpoint
+from ..game.emitting_game import EmittingGame
+from ..game.event_codec import decode_batch
+from ..game.game import base_hand
+from ..game.outbox import Event
+from ..utils import ActorClosedError
+import asyncio
+import pytest
+
+
+class Sio:
+    def __init__(self):
+        self.emitted = list()
+
+    async def emit(self, *args, **kwargs):
+        self.emitted.append((args, kwargs))
+
+
+async def store_nothing(game_id, data):
+    pass
+
+
+def make_game(**kwargs) -> EmittingGame:
+    game: EmittingGame = EmittingGame(
+        game_id="game",
+        name="game",
+        sio=Sio(),
+        agents=dict(),
+        turn_time=10,
+        **kwargs,
+    )
+    for i in range(4):
+        # by keyword, as game god adds players
+        game.add_player(name=f"player{i}", sid=f"sid{i}", user_id=f"user{i}")
+    game.start_round(setup=True)
+    game.drain_outbox()
+    return game
+
+
+def test_hand_off():
+    game: EmittingGame = make_game()
+    spot: int = game._current_player
+    checkpoint = EmittingGameCheckpoint.from_bytes(game.hand_off().to_bytes())
+    assert checkpoint.running
+    assert checkpoint.snapshot.paused_timers == (("turn", spot),)
+    assert checkpoint.snapshot.hand_in_play is base_hand
+
+    restored: EmittingGame = EmittingGame.from_checkpoint(
+        checkpoint, sio=None, agents=dict()
+    )
+    assert restored.game_id == "game" and restored.name == "game"
+    # only the time left on the restarted turn timer differs
+    untimed = dict(turn_times=(0,) * 4)
+    assert restored.snapshot()._replace(**untimed) == (
+        checkpoint.snapshot._replace(**untimed)
+    )
+    assert restored._spot_sid_bidict == game._spot_sid_bidict
+    assert restored._user_ids == game._user_ids
+    # the turn timer is restarted with the time that was remaining
+    assert not restored.is_paused
+    assert restored._turn_deadlines[spot] is not None
+    assert "set_deadline" in [event.name for event in restored.drain_outbox()]
+
+
+def test_hand_off_state():
+    game: EmittingGame = make_game(store_actions=store_nothing)
+    spot: int = game._current_player
+    sid: str = game._spot_sid_bidict[spot]
+    game.acked_handler(sid, 1, game.card_handler, card=1)
+    checkpoint = EmittingGameCheckpoint.from_bytes(game.hand_off().to_bytes())
+    assert checkpoint.acks == ((sid, (1, 1)),)
+    assert checkpoint.actions_offset == len(game.action_log)
+
+    restored: EmittingGame = EmittingGame.from_checkpoint(
+        checkpoint,
+        action_log=ActionLog.from_bytes(bytes(game.action_log)),
+        sio=None,
+        agents=dict(),
+        store_actions=store_nothing,
+    )
+    assert restored.seed == game.seed
+    # deals what the game would have dealt next
+    assert (restored._make_shuffled_deck() == game._make_shuffled_deck()).all()
+    # retries are not handled again
+    restored.acked_handler(sid, 1, restored.card_handler, card=1)
+    assert 1 in restored._chambers[spot].hand
+    # the game's time goes on from the checkpoint's
+    assert checkpoint.time <= restored._time() < checkpoint.time + 1
+    # and so does its action log
+    restored.lock(spot)
+    assert bytes(restored.action_log).startswith(bytes(game.action_log))
+    assert restored.action_log.num_actions == game.action_log.num_actions + 1
+
+
+def test_from_checkpoint_tail():
+    game: EmittingGame = make_game(store_actions=store_nothing)
+    checkpoint = EmittingGameCheckpoint.from_bytes(
+        game.checkpoint().to_bytes()
+    )
+    spot: int = game._current_player
+    # the 3 of clubs, unlock and play, logged after the checkpoint
+    game.actions_handler(game._spot_sid_bidict[spot], [1, -15, -17])
+    next_spot: int = game._current_player
+    assert next_spot != spot
+    log: bytes = bytes(game.action_log)
+
+    restored: EmittingGame = EmittingGame.from_checkpoint(
+        checkpoint,
+        action_log=ActionLog.from_bytes(log),
+        sio=None,
+        agents=dict(),
+        store_actions=store_nothing,
+    )
+    # the tail is taken again on top of the checkpoint; the running
+    # turn timer is restarted with the time it has left
+    untimed = dict(turn_times=(0,) * 4)
+    assert restored.snapshot()._replace(**untimed) == (
+        game.snapshot()._replace(**untimed)
+    )
+    assert (
+        abs(
+            restored._turn_deadlines[next_spot]
+            - game._turn_deadlines[next_spot]
+        )
+        < 1
+    )
+    # without logging it again or resending its events
+    assert bytes(restored.action_log) == log
+    assert [event.name for event in restored.drain_outbox()] == [
+        "set_time",
+        "set_deadline",
+    ]
+    assert restored._checkpoint_due
+
+    # e.g. a log only stored up to its header
+    cut_off: bytes = log[: len(ActionLog(game.seed, 0, 0, 0, 0))]
+    with pytest.raises(CheckpointError, match="cut off"):
+        EmittingGame.from_checkpoint(
+            checkpoint,
+            action_log=ActionLog.from_bytes(cut_off),
+            sio=None,
+            agents=dict(),
+            store_actions=store_nothing,
+        )
+
+
+def test_hand_off_paused():
+    game: EmittingGame = make_game()
+    game.pause()
+    checkpoint = game.hand_off()
+    assert not checkpoint.running
+    restored: EmittingGame = EmittingGame.from_checkpoint(
+        checkpoint, sio=None, agents=dict()
+    )
+    assert restored.is_paused
+    assert restored._paused_timers == game._paused_timers
+
+
+def test_checkpoint():
+    # stopped, so snapshots are taken with the same times remaining
+    game: EmittingGame = make_game(clock=lambda: 0)
+    spot: int = game._current_player
+    snapshot = game.snapshot()
+    checkpoint = game.checkpoint()
+    # the game is not changed
+    assert game.snapshot() == snapshot and not game.drain_outbox()
+    assert checkpoint.running and not game.is_paused
+    assert checkpoint.snapshot == snapshot
+    assert snapshot.paused_timers == (("turn", spot),)
+    assert snapshot.turn_times[spot] == 10
+
+
+def test_store_checkpoint():
+    stored = list()
+
+    async def store_checkpoint(game_id, checkpoint):
+        stored.append((game_id, checkpoint))
+
+    async def run():
+        game: EmittingGame = make_game(store_checkpoint=store_checkpoint)
+        # checkpointed once the round's events are sent
+        await game.flush()
+        ((game_id, checkpoint),) = stored
+        assert game_id == "game"
+        assert (
+            EmittingGameCheckpoint.from_bytes(checkpoint).snapshot.chambers
+            == game.snapshot().chambers
+        )
+        # nothing changed since
+        game.maybe_checkpoint()
+        await game.flush()
+        assert len(stored) == 1
+        game.pause()
+        game.maybe_checkpoint()
+        await game.flush()
+        assert len(stored) == 2
+
+    asyncio.run(run())
+
+
+def test_store_actions():
+    stored = list()
+
+    async def store_actions(game_id, actions):
+        stored.append(actions)
+
+    async def run():
+        game: EmittingGame = make_game(store_actions=store_actions)
+        await game.flush()
+        # nothing logged since
+        await game.flush()
+        assert len(stored) == 1
+        game.pause()
+        await game.flush()
+        # the 4 players added, the round started and the pause
+        assert ActionLog.from_bytes(b"".join(stored)).num_actions == 6
+        # clones are not logged
+        await game.clone().flush()
+        assert len(stored) == 2
+
+    asyncio.run(run())
+
+
+def test_flush():
+    async def run():
+        game: EmittingGame = make_game()
+        game.pause()
+        spot: int = game._current_player
+        game.add_or_remove_card(spot, game._chambers[spot]._get_min_card())
+        events = list(game._outbox)
+        game._sio.emitted.clear()
+        await game.flush()
+        sid: str = game._spot_sid_bidict[spot]
+        ((args, kwargs), (shared_args, shared_kwargs)) = game._sio.emitted
+        # the sid with events of its own gets all its events in order
+        assert kwargs == {"room": sid}
+        assert args[0] == "batch" and isinstance(args[1], bytes)
+        assert decode_batch(args[1]) == [
+            [event.name, event.payload]
+            for event in events
+            if event.spot in (None, spot)
+        ]
+        # and is skipped by the room, which gets the shared events
+        assert shared_kwargs["skip_sid"] == [sid]
+        assert decode_batch(shared_args[1]) == [
+            [event.name, event.payload]
+            for event in events
+            if event.spot is None
+        ]
+
+    asyncio.run(run())
+
+
+def test_actions_handler():
+    game: EmittingGame = make_game()
+    spot: int = game._current_player
+    sid: str = game._spot_sid_bidict[spot]
+    # the 3 of clubs, unlock and play
+    assert game.actions_handler(sid, [1, -15, -17]) == 3
+    assert game._hand_in_play.to_list() == [1]
+    game.drain_outbox()
+    spot = game._current_player
+    sid = game._spot_sid_bidict[spot]
+    card: int = game._chambers[spot]._get_min_card()
+    # stops at playing before unlocking; the card stays selected
+    assert game.actions_handler(sid, [card, -17, -15]) == 1
+    assert card in game._chambers[spot].hand
+    assert not game._unlocked[spot]
+    assert [event.name for event in game.drain_outbox()][-1] == "alert"
+
+
+def test_acked_handler():
+    game: EmittingGame = make_game()
+    spot: int = game._current_player
+    sid: str = game._spot_sid_bidict[spot]
+    game.acked_handler(sid, 1, game.card_handler, card=1)
+    assert 1 in game._chambers[spot].hand
+    events = game.drain_outbox()
+    assert events[-1] == Event(spot, "ack", {"seq": 1, "result": 1})
+    # retries are acked again without being handled again
+    game.acked_handler(sid, 1, game.card_handler, card=1)
+    assert 1 in game._chambers[spot].hand
+    assert game.drain_outbox() == [events[-1]]
+    game.acked_handler(sid, 3, game.actions_handler, actions=[-17, -15])
+    assert game.drain_outbox()[-1].payload == {"seq": 3, "result": 0}
+    # superseded retries are dropped
+    game.acked_handler(sid, 2, game.play_handler)
+    assert not game.drain_outbox()
+
+
+def test_close():
+    timers = list()
+
+    class Timer:
+        def __init__(self, *args):
+            self.args = args
+            self.cancelled = False
+            timers.append(self)
+
+        def cancel(self):
+            self.cancelled = True
+
+    async def run():
+        game: EmittingGame = make_game(timer=Timer)
+        timer = game._timers[game._current_player]
+        game.close()
+        assert timer.cancelled
+        # a timer going off anyway is dropped
+        _, tell, function, *args = timer.args
+        tell(function, *args)
+        assert game.actor._task is None and not len(game.actor)
+        with pytest.raises(ActorClosedError):
+            await game.actor.ask(game.lock, 0)
+
+    asyncio.run(run())
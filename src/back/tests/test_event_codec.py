@@ -0,0 +1,67 @@
+from ..game.event_codec import (
+    EVENTS,
+    EventCodecError,
+    decode_batch,
+    encode_batch,
+    encode_event,
+)
+from ..game.frozen_hand import FrozenHand
+from ..game.outbox import Event
+import json
+import pytest
+
+
+hand = FrozenHand([1, 2, 3, 51, 52])
+EXAMPLES = [
+    Event(0, "add_card", {"card": 52}),
+    Event(0, "clear_cards", {}),
+    Event(0, "update_current_hand_str", {"str": "3♣ 3♦"}),
+    Event(
+        0,
+        "store_hand",
+        {"id": hash(hand), "cards": hand.to_list(), "id_desc": hand.id_desc},
+    ),
+    Event(0, "select_hand", {"id": hash(hand)}),
+    Event(None, "set_names", {"names": ["a", "", "ç", "d"]}),
+    Event(None, "set_dot_color", {"spot": 3, "dot_color": "green"}),
+    Event(None, "set_cards_remaining", {"spot": 1, "cards_remaining": 13}),
+    Event(
+        None,
+        "set_hand_in_play",
+        {"hand_in_play": [1, 2], "hand_in_play_desc": "double"},
+    ),
+    Event(1, "set_unlocked", {"unlocked": True}),
+    Event(1, "set_giving_options", {"options": [40, 2], "highlight": False}),
+    Event(2, "set_asking_option", {"old_rank": None, "new_rank": 14}),
+    Event(None, "set_time", {"which": "trading", "time": 60000.0}),
+    Event(
+        None,
+        "set_deadline",
+        {"which": "turn", "spot": 2, "deadline": 1.6e12 + 0.5},
+    ),
+    Event(None, "message", {"message": "🎁 a gives b a card"}),
+    Event(2, "ack", {"seq": 70000, "result": 5}),
+    Event(0, "remove_hand", {"id": hash(hand)}),
+]
+
+
+def test_round_trip():
+    batch = encode_batch(map(encode_event, EXAMPLES))
+    decoded = decode_batch(batch)
+    # giving options are sets so decoded in ascending order
+    EXAMPLES[10].payload["options"].sort()
+    assert decoded == [[name, payload] for _, name, payload in EXAMPLES]
+    assert len(batch) < len(json.dumps(decoded).encode()) / 2
+
+
+def test_all_events():
+    names = [name for name, _ in EVENTS]
+    assert len(set(names)) == len(names) < 256
+    assert decode_batch(encode_batch([])) == []
+
+
+def test_version():
+    with pytest.raises(EventCodecError, match="version 0"):
+        decode_batch(b"\x00")
+    with pytest.raises(EventCodecError):
+        decode_batch(b"")
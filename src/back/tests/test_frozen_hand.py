@@ -0,0 +1,54 @@
+from ..game.frozen_hand import FrozenHand
+from ..game.bit_hand import BitHand
+from ..game.hand import Hand, NotPlayableOnError
+import pickle
+import pytest
+
+
+def test_interning():
+    hand: FrozenHand = FrozenHand([1, 2])
+    assert FrozenHand([2, 1]) is hand
+    assert FrozenHand([0, 0, 2, 1]) is hand
+    assert FrozenHand(Hand([1, 2])) is hand
+    assert FrozenHand(BitHand([1, 2])) is hand
+    assert FrozenHand(hand) is hand
+    assert FrozenHand.copy(hand) is hand
+    assert FrozenHand() is FrozenHand([])
+    assert FrozenHand([1, 2, 3]) is not hand
+
+
+def test_only_valid_hands():
+    with pytest.raises(AssertionError, match=r"only valid hands"):
+        FrozenHand([1, 5])
+
+
+def test_matches_hand():
+    for cards in [[], [52], [1, 2], [1, 2, 3], [1, 5, 9, 13, 17]]:
+        hand: Hand = Hand(cards)
+        frozen_hand: FrozenHand = FrozenHand(cards)
+        assert frozen_hand == hand
+        assert hand == frozen_hand
+        assert hash(frozen_hand) == hash(hand)
+        assert str(frozen_hand) == str(hand)
+        assert list(frozen_hand) == list(hand)
+        assert [frozen_hand[i] for i in range(5)] == list(hand._cards)
+        assert len(frozen_hand) == len(hand)
+        assert frozen_hand._id == hand._id
+        assert frozen_hand.strength == hand.strength
+        assert all(card in frozen_hand for card in cards)
+
+
+def test_comparisons():
+    double: FrozenHand = FrozenHand([1, 2])
+    assert double < FrozenHand([3, 4])
+    assert double < Hand([3, 4])
+    assert Hand([3, 4]) > double
+    assert double <= FrozenHand([1, 2])
+    with pytest.raises(NotPlayableOnError):
+        double < FrozenHand([5])
+    assert FrozenHand([1, 2, 3, 4, 52]) > double
+
+
+def test_pickle():
+    hand: FrozenHand = FrozenHand([1, 2])
+    assert pickle.loads(pickle.dumps(hand)) is hand
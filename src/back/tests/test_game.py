@@ -1,5 +1,6 @@
 from ..game.game import Game, PresidentsError, base_hand, NoopTimer
 from ..game.chamber import Chamber
+from ..game.outbox import Event
 from ..game.hand import NotPlayableOnError
 import numpy as np
 import pytest
@@ -31,8 +32,8 @@ def test_constructor():
     assert game._reserve_time == 0
     assert all(reserve_time == 0 for reserve_time in game._reserve_times)
     assert all(
-        reserve_time_use_start is None
-        for reserve_time_use_start in game._reserve_time_use_starts
+        reserve_deadline is None
+        for reserve_deadline in game._reserve_deadlines
     )
     # setup and ID related attributes
     assert game._open_spots == {0, 1, 2, 3}
@@ -79,8 +80,8 @@ def test_reset():
     assert game._reserve_time == 0
     assert all(reserve_time == 0 for reserve_time in game._reserve_times)
     assert all(
-        reserve_time_use_start is None
-        for reserve_time_use_start in game._reserve_time_use_starts
+        reserve_deadline is None
+        for reserve_deadline in game._reserve_deadlines
     )
     # setup and ID related attributes
     assert game._open_spots == {0, 1, 2, 3}
@@ -127,8 +128,8 @@ def test_reset():
     assert game._reserve_time == 0.05
     assert all(reserve_time == 0.05 for reserve_time in game._reserve_times)
     assert all(
-        reserve_time_use_start is None
-        for reserve_time_use_start in game._reserve_time_use_starts
+        reserve_deadline is None
+        for reserve_deadline in game._reserve_deadlines
     )
     # setup and ID related attributes
     assert game._open_spots == {0, 1, 2, 3}
@@ -342,6 +343,148 @@ def test_deal_cards():
     assert all(card in game._chambers[3] for card in range(40, 53))
 
 
+def test_snapshot_and_restore():
+    game: Game = Game()
+    game._set_up_testing_base()
+    snapshot = game.snapshot()
+    assert len(snapshot.chambers) == 4
+    assert snapshot.hand_in_play is base_hand
+    assert snapshot.open_spots == frozenset()
+
+    spot: int = game._current_player
+    game.add_or_remove_card(spot, 1)
+    game.maybe_unlock_play(spot)
+    game.maybe_play_current_hand(spot)
+    assert game._current_player != spot
+    game.restore(snapshot)
+    assert game.snapshot() == snapshot
+    # restored games are paused with the times that were remaining
+    assert game.is_paused
+    assert game._turn_deadlines[spot] is None
+    assert snapshot.paused_timers == (("turn", spot),)
+    assert game._current_player == spot
+    assert 1 in game._chambers[spot]
+    assert game._hand_in_play is base_hand
+    assert next(game._turn_manager) == (spot + 1) % 4
+
+
+def test_outbox():
+    game: Game = Game()
+    game._set_up_testing_base()
+    events = game.drain_outbox()
+    spot: int = game._current_player
+    assert Event(spot, "set_on_turn", {"on_turn": True}) in events
+    assert (
+        Event(None, "set_dot_color", {"spot": spot, "dot_color": "green"})
+        in events
+    )
+    assert not game.drain_outbox()
+
+    game.add_or_remove_card(spot, 1)
+    game.maybe_unlock_play(spot)
+    assert game.drain_outbox() == [
+        Event(spot, "set_unlocked", {"unlocked": True})
+    ]
+    game.maybe_play_current_hand(spot)
+    events = game.drain_outbox()
+    assert Event(spot, "set_on_turn", {"on_turn": False}) in events
+    assert Event(spot, "set_unlocked", {"unlocked": False}) in events
+    assert (
+        Event(
+            None, "set_cards_remaining", {"spot": spot, "cards_remaining": 12}
+        )
+        in events
+    )
+    (hand_in_play,) = [
+        event for event in events if event.name == "set_hand_in_play"
+    ]
+    assert hand_in_play.payload["hand_in_play"] == [1]
+
+    # alerts are the interface's business; failed actions queue nothing
+    with pytest.raises(PresidentsError):
+        game.maybe_pass_turn(spot)
+    assert not game.drain_outbox()
+
+
+def test_deadlines():
+    game: Game = Game(turn_time=10, reserve_time=20)
+    game._set_up_testing_base()
+    spot: int = game._current_player
+    # running timers are emitted once, as epoch deadlines in ms
+    (deadline,) = [
+        event for event in game.drain_outbox() if event.name == "set_deadline"
+    ]
+    assert deadline.spot is None
+    assert deadline.payload["which"] == "turn"
+    assert deadline.payload["spot"] == spot
+    assert 0 < deadline.payload["deadline"] - time.time() * 1000 <= 10000
+    assert game._turn_deadlines[spot] is not None
+
+    game.pause()
+    assert game._turn_deadlines[spot] is None
+    assert 0 < game._turn_times[spot] <= 10
+    assert game._paused_timers == [("turn", spot)]
+    assert [event.name for event in game.drain_outbox()] == [
+        "set_time",
+        "set_paused",
+    ]
+    game.resume()
+    assert [event.name for event in game.drain_outbox()] == [
+        "set_paused",
+        "set_deadline",
+    ]
+    assert not game.is_paused
+
+    # running out of turn time starts reserve time
+    game._handle_playing_timeout(spot)
+    assert game._is_using_reserve_time(spot)
+    assert [
+        (event.name, event.payload["which"])
+        for event in game.drain_outbox()
+        if event.name in ("set_time", "set_deadline")
+    ] == [("set_time", "turn"), ("set_deadline", "reserve")]
+    game._stop_timer("reserve", spot)
+    assert not game._is_using_reserve_time(spot)
+    assert 0 < game._reserve_times[spot] <= 20
+
+
+def test_playing_timeout():
+    game: Game = Game(turn_time=10, reserve_time=0)
+    game._set_up_testing_base()
+    spot: int = game._current_player
+    # without reserve time, running out of turn time auto plays the min
+    # card, i.e. the 3 of clubs
+    game._handle_playing_timeout(spot)
+    assert game._hand_in_play == Hand([1])
+    assert 1 not in game._chambers[spot]
+    assert not game._is_current_player(spot)
+    # and auto passes on hands in play
+    next_spot: int = game._current_player
+    game._handle_playing_timeout(next_spot)
+    assert game._hand_in_play == Hand([1])
+    assert game._num_consecutive_passes == 1
+    assert not game._is_current_player(next_spot)
+
+
+def test_clone():
+    # stopped, so snapshots are taken with the same times remaining
+    game: Game = Game(clock=lambda: 0)
+    game._set_up_testing_base()
+    game._get_game_to_trading()
+    clone: Game = game.clone()
+    snapshot = game.snapshot()
+    assert clone.snapshot() == snapshot
+    # the clone's timers are paused
+    assert clone.is_paused and not game.is_paused
+    assert clone._chambers[0] is not game._chambers[0]
+    assert clone._given[0] is not game._given[0]
+    # playing out the clone does not change the game
+    clone.reset()
+    clone._set_up_testing_base()
+    assert game.snapshot() == snapshot
+    assert game.trading
+
+
 def test_make_and_set_turn_manager():
     game: Game = Game()
     game._deal_cards()
@@ -414,12 +557,12 @@ def test_handle_timeout():
     assert game._hand_in_play is base_hand
     timer = game._timers[start_spot]
     assert isinstance(timer, GreenThread)
-    assert game._reserve_time_use_starts[start_spot] is None
+    assert game._reserve_deadlines[start_spot] is None
     game._handle_timeout(start_spot)  # should just start reserve time
     assert game._hand_in_play is base_hand
     game._timers[start_spot] is not timer
     assert isinstance(game._timers[start_spot], GreenThread)
-    assert game._reserve_time_use_starts[start_spot] is not None
+    assert game._reserve_deadlines[start_spot] is not None
     assert game._reserve_times[start_spot] == 0
 
     # 0 reserve time
@@ -428,7 +571,7 @@ def test_handle_timeout():
     assert not game._is_current_player(start_spot)
     assert game._hand_in_play == Hand([1])
     assert game._timers[start_spot] is None
-    assert game._reserve_time_use_starts[start_spot] is None
+    assert game._reserve_deadlines[start_spot] is None
     assert isinstance(game._timers[game._current_player], GreenThread)
 
 
@@ -542,13 +685,13 @@ def test_stop_timer():
     # during reserve time
     game._handle_timeout(spot)
     assert game._reserve_times[spot] == 0
-    assert game._reserve_time_use_starts[spot] is not None
+    assert game._reserve_deadlines[spot] is not None
     assert isinstance(game._timers[spot], GreenThread)
     time.sleep(0.01)
     game._stop_timer(spot)
     assert game._timers[spot] is None
     assert game._reserve_times[spot] < 10
-    assert game._reserve_time_use_starts[spot] is None
+    assert game._reserve_deadlines[spot] is None
 
     with pytest.raises(AssertionError, match=r"timer is none"):
         game.reset()
@@ -5,6 +5,15 @@ from ..game import (
     FullHandError,
     NotPlayableOnError,
 )
+from ..game.hand import key_hand_id
+from ..game.utils import (
+    hand_keys,
+    classify_hands,
+    HandTableMissingError,
+    HAND_TABLE_SIZE,
+)
+from ..game.utils import hand_hash_table
+from itertools import combinations
 from typing import Optional
 import numpy as np
 import pytest
@@ -123,8 +132,24 @@ def test__setitem__():
 
 
 def test__hash__():
-    # TODO
-    ...
+    # hashes are dense hand table keys, i.e. every hand of up to 5 cards
+    # has its own hash between 0 and the size of the table
+    assert hash(Hand()) == 0
+    assert hash(Hand([1])) == 1
+    assert hash(Hand([2, 1])) == hash(Hand([1, 2]))
+    assert hash(Hand([48, 49, 50, 51, 52])) == HAND_TABLE_SIZE - 1
+    hashes = {
+        hash(Hand(list(cards)))
+        for n in range(3)
+        for cards in combinations(range(1, 53), n)
+    }
+    assert len(hashes) == 1 + 52 + 1326
+    assert max(hashes) == len(hashes) - 1
+
+    hands = np.array([[0, 0, 0, 0, 0], [0, 0, 52, 1, 7], [1, 5, 9, 13, 17]])
+    assert hand_keys(hands).tolist() == [
+        hash(Hand(hand)) for hand in hands.tolist()
+    ]
 
 
 def test__contains__():
@@ -222,6 +247,23 @@ def test__gt__():
     assert hand2 > hand1
 
 
+def test_strength():
+    assert Hand().strength == 0
+    assert Hand([1, 5]).strength == 0
+    # decided by the last card, the triple and the quad respectively
+    assert Hand([1, 5, 9, 13, 17]).strength < Hand([2, 6, 10, 14, 18]).strength
+    assert Hand([1, 2, 3, 51, 52]).strength < Hand([5, 6, 7, 9, 10]).strength
+    assert Hand([1, 2, 3, 4, 52]).strength < Hand([1, 49, 50, 51, 52]).strength
+    # bombs dominate
+    assert Hand([1, 2, 3, 4, 5]).strength > Hand([52]).strength
+    hand: Hand = Hand([1, 2])
+    assert Hand.copy(hand).strength == hand.strength
+    hand.add(3)
+    assert hand.strength == Hand([1, 2, 3]).strength
+    hand.reset()
+    assert hand.strength == 0
+
+
 def test__le__():
     hand1: Hand = Hand([1, 2])
     hand2: Hand = Hand([1, 3])
@@ -321,8 +363,82 @@ def test_to_list():
 def test_identify():
     # tests testing constructor for identifying random sample of valid
     # hands
-    # TODO
-    ...
+    assert Hand([1, 2])._id == 21
+    assert Hand([1, 5])._id == 20
+    assert Hand([1, 2, 3])._id == 31
+    assert Hand([1, 2, 3, 4])._id == 40
+    assert Hand([1, 2, 3, 5, 6])._id == 51
+    assert Hand([1, 2, 5, 6, 7])._id == 51
+    assert Hand([1, 5, 9, 13, 17])._id == 52
+    assert Hand([33, 37, 41, 45, 49])._id == 52
+    assert Hand([37, 41, 45, 49, 52])._id == 50  # two 2s
+    assert Hand([1, 2, 3, 4, 52])._id == 53
+    assert Hand([1, 49, 50, 51, 52])._id == 53
+
+
+def test_key_hand_id():
+    for cards in [
+        [],
+        [1],
+        [1, 52],
+        [1, 2, 3],
+        [1, 2, 3, 4],
+        [1, 5, 9, 13, 17],
+    ]:
+        hand: Hand = Hand(cards)
+        assert key_hand_id(hash(hand)) == hand._id
+
+
+def test_classify_hands():
+    rng = np.random.default_rng(0)
+    hands = np.zeros(shape=(5000, 5), dtype=np.uint8)
+    for hand in hands:
+        num_cards = rng.integers(0, 6)
+        hand[5 - num_cards :] = np.sort(
+            rng.choice(np.arange(1, 53), num_cards, replace=False)
+        )
+    # every kind of hand
+    hands[:8] = [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 2],
+        [0, 0, 1, 2, 3],
+        [1, 2, 3, 5, 6],
+        [1, 5, 9, 13, 17],
+        [1, 2, 3, 4, 52],
+        [0, 0, 0, 0, 52],
+        [0, 1, 2, 3, 4],
+    ]
+    ids, strengths = classify_hands(hands)
+    for hand, id_, strength in zip(hands, ids, strengths):
+        hand = Hand(hand.tolist())
+        assert id_ == hand._id
+        assert (strength > 0) == hand.is_valid
+
+    # strengths order hands like the comparison operators do
+    ids, strengths = classify_hands(
+        [
+            [0, 0, 0, 1, 2],
+            [0, 0, 0, 3, 4],
+            [1, 2, 3, 51, 52],
+            [5, 6, 7, 9, 10],
+            [1, 2, 3, 4, 52],
+            [1, 49, 50, 51, 52],
+        ]
+    )
+    assert strengths[0] < strengths[1]
+    assert strengths[2] < strengths[3]
+    assert strengths[4] < strengths[5]
+    assert strengths[4] > strengths.max(initial=0, where=ids != 53)
+
+
+def test_load_hand_table_missing(monkeypatch, tmp_path):
+    path = tmp_path / "hand_table.npy"
+    monkeypatch.setattr(hand_hash_table, "HAND_TABLE_PATH", str(path))
+    # bypasses the per process cache
+    with pytest.raises(HandTableMissingError, match="generate it"):
+        hand_hash_table.load_hand_table.__wrapped__()
+    # never generated at runtime
+    assert not path.exists()
 
 
 def test_insertion_index():
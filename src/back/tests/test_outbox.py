@@ -0,0 +1,66 @@
+from ..game.outbox import Event, Outbox, batch, room_batch
+
+
+def test_drain():
+    outbox = Outbox()
+    outbox.emit("message", {"message": "hi"})
+    outbox.emit("set_unlocked", {"unlocked": True}, 2)
+    assert len(outbox) == 2
+    assert outbox.drain() == [
+        Event(None, "message", {"message": "hi"}),
+        Event(2, "set_unlocked", {"unlocked": True}),
+    ]
+    assert not len(outbox)
+    assert outbox.drain() == []
+
+
+def test_batch():
+    events = [
+        Event(None, "message", {"message": "hi"}),
+        Event(1, "remove_card", {"card": 1}),
+        Event(3, "alert", {"alert": "no"}),  # spot without a sid
+        Event(1, "set_unlocked", {"unlocked": False}),
+        Event(None, "set_dot_color", {"spot": 1, "dot_color": "blue"}),
+    ]
+    assert batch(events, {0: "a", 1: "b"}) == {
+        "a": [
+            ["message", {"message": "hi"}],
+            ["set_dot_color", {"spot": 1, "dot_color": "blue"}],
+        ],
+        "b": [
+            ["message", {"message": "hi"}],
+            ["remove_card", {"card": 1}],
+            ["set_unlocked", {"unlocked": False}],
+            ["set_dot_color", {"spot": 1, "dot_color": "blue"}],
+        ],
+    }
+    # recipients without events get no batch
+    assert batch(events[1:2], {0: "a", 1: "b"}) == {
+        "b": [["remove_card", {"card": 1}]]
+    }
+
+
+def test_room_batch():
+    events = [
+        Event(None, "message", {"message": "hi"}),
+        Event(1, "remove_card", {"card": 1}),
+        Event(3, "alert", {"alert": "no"}),  # spot without a sid
+        Event(None, "set_dot_color", {"spot": 1, "dot_color": "blue"}),
+    ]
+    shared, batches = room_batch(events, {0: "a", 1: "b", 2: "c"})
+    assert shared == [
+        ["message", {"message": "hi"}],
+        ["set_dot_color", {"spot": 1, "dot_color": "blue"}],
+    ]
+    # only b has events of its own so a and c get the room's batch
+    assert batches == {
+        "b": [
+            ["message", {"message": "hi"}],
+            ["remove_card", {"card": 1}],
+            ["set_dot_color", {"spot": 1, "dot_color": "blue"}],
+        ]
+    }
+    assert room_batch(events[1:2], {0: "a", 1: "b"}) == (
+        [],
+        {"b": [["remove_card", {"card": 1}]]},
+    )
@@ -0,0 +1,49 @@
+from ..game.utils import cards_mask
+from ..sim.self_play import Chunk, chunk_seed, play_chunk, self_play
+import numpy as np
+import os
+
+
+def test_play_chunk():
+    columns = play_chunk(Chunk(0, 20, chunk_seed(0, 0), "random"))
+    deals = columns["deals"]
+    assert deals.shape == (20, 4)
+    assert all(
+        int(np.bitwise_or.reduce(deal)) == cards_mask(range(1, 53))
+        for deal in deals
+    )
+    # no trading before the first round
+    assert not columns["trades"][0].any()
+    assert columns["trades"][1:].all()
+    assert all(
+        sorted(positions) == [0, 1, 2, 3] for positions in columns["positions"]
+    )
+    offsets = columns["move_offsets"]
+    assert offsets[0] == 0 and offsets[-1] == len(columns["moves"])
+    assert len(columns["move_spots"]) == len(columns["moves"])
+    # the first move of every round plays the 3 of clubs
+    assert all(columns["moves"][offsets[:-1]] & 1)
+
+
+def test_self_play(tmp_path):
+    num_moves = self_play(
+        25, str(tmp_path / "a"), seed=1, num_workers=2, chunk_size=10
+    )
+    assert sorted(os.listdir(tmp_path / "a")) == [
+        "rounds_00000.npz",
+        "rounds_00001.npz",
+        "rounds_00002.npz",
+    ]
+    chunks = [
+        np.load(tmp_path / "a" / name)
+        for name in sorted(os.listdir(tmp_path / "a"))
+    ]
+    assert [len(chunk["positions"]) for chunk in chunks] == [10, 10, 5]
+    assert sum(len(chunk["moves"]) for chunk in chunks) == num_moves
+    assert str(chunks[0]["policy"]) == "min"
+
+    # chunks do not depend on the number of workers
+    self_play(25, str(tmp_path / "b"), seed=1, num_workers=1, chunk_size=10)
+    for name in os.listdir(tmp_path / "a"):
+        a, b = np.load(tmp_path / "a" / name), np.load(tmp_path / "b" / name)
+        assert all(np.array_equal(a[key], b[key]) for key in a.files)
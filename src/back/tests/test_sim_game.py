@@ -0,0 +1,177 @@
+from ..game.chamber import Chamber
+from ..game.frozen_hand import FrozenHand
+from ..game.game import base_hand
+from ..game.utils import cards_mask
+from ..sim import SimGame, MinPolicy, Policy, RandomPolicy
+from ..sim.moves import Combos, combo_masks, min_beating, mask_hand
+import random
+import pytest
+
+
+# spot i is dealt cards 13i + 1 to 13i + 13
+DECK = [range(lower, lower + 13) for lower in range(1, 53, 13)]
+
+
+class RecordingPolicy(MinPolicy):
+    def __init__(self, moves):
+        self.moves = moves
+
+    def play(self, game, spot):
+        move = super().play(game, spot)
+        self.moves.append((spot, move))
+        return move
+
+
+def test_combo_masks():
+    random.seed(0)
+    for _ in range(20):
+        cards = random.sample(range(1, 53), 13)
+        combos = Chamber(cards).enumerate_combos()
+        masks = combo_masks(cards_mask(cards))
+        assert sorted(masks) == sorted(cards_mask(hand) for hand in combos)
+        # grouped by id in the same order
+        assert [mask_hand(mask)._id for mask in masks] == [
+            hand._id for hand in combos
+        ]
+
+
+def test_min_beating():
+    cards = cards_mask([2, 5, 6, 9, 13, 14, 15, 16, 30])
+    assert min_beating(cards, FrozenHand([1])) == cards_mask([2])
+    assert min_beating(cards, FrozenHand([3, 4])) == cards_mask([5, 6])
+    assert min_beating(cards, FrozenHand([49, 50])) == cards_mask(
+        [2, 13, 14, 15, 16]
+    )
+    assert min_beating(cards, FrozenHand([1, 2, 3])) == cards_mask(
+        [13, 14, 15]
+    )
+    assert min_beating(cards, FrozenHand([49, 50, 51])) == cards_mask(
+        [2, 13, 14, 15, 16]
+    )
+    assert min_beating(cards, FrozenHand([45, 49, 50, 51, 52])) == 0
+
+
+def test_combos():
+    random.seed(1)
+    for _ in range(20):
+        cards = cards_mask(random.sample(range(1, 53), 13))
+        combos = Combos(cards)
+        assert sorted(combos.all()) == sorted(
+            [1 << card for card in range(52) if cards >> card & 1]
+            + combo_masks(cards)
+        )
+        # kept as cards are played
+        while cards:
+            hand = mask_hand(random.choice(combos.all()))
+            assert sorted(combos.all()) == sorted(Combos(cards).all())
+            beating = [
+                mask
+                for mask in Combos(cards).all()
+                if (mask_hand(mask)._id == hand._id or mask_hand(mask).is_bomb)
+                and mask_hand(mask)._strength > hand._strength
+            ]
+            assert sorted(combos.beating(hand)) == sorted(beating)
+            played = cards_mask(hand)
+            combos.remove(played)
+            cards ^= played
+        assert not combos.all()
+
+
+def test_start_round():
+    game: SimGame = SimGame()
+    game.deal([DECK[1], DECK[0], DECK[2], DECK[3]])
+    game.start_round()
+    assert game.current_player == 1  # has the 3 of clubs
+    assert game.hand_in_play is base_hand
+    assert not game.can_pass
+    assert game.legal_plays(1) == [
+        mask for mask in game.legal_plays(1) if mask & 1
+    ]
+    with pytest.raises(AssertionError, match=r"cannot be played"):
+        game.play(1, cards_mask([2]))
+    with pytest.raises(AssertionError, match=r"cannot pass"):
+        game.pass_turn(1)
+    with pytest.raises(AssertionError, match=r"not spot 0's turn"):
+        game.play(0, cards_mask([14]))
+    game.play(1, cards_mask([1, 2]))
+    assert game.current_player == 2
+    assert game.hand_in_play is FrozenHand([1, 2])
+
+
+def test_passing():
+    game: SimGame = SimGame()
+    game.deal(DECK)
+    game.start_round()
+    game.play(0, cards_mask([1]))
+    for spot in [1, 2]:
+        game.pass_turn(spot)
+        assert game.hand_in_play is FrozenHand([1])
+    game.pass_turn(3)
+    # everyone else passed so spot 0 can play anyhand
+    assert game.current_player == 0
+    assert game.hand_in_play is None
+    assert not game.can_pass
+
+
+def test_play_round():
+    moves = list()
+    game: SimGame = SimGame([RecordingPolicy(moves) for _ in range(4)])
+    positions = game.play_round(DECK)
+    # spot 0 has the 3 of clubs and all the lowest cards
+    assert moves[0] == (0, 1)
+    assert sorted(positions) == [0, 1, 2, 3]
+    assert game.current_player is None
+    assert all(not game.cards[spot] for spot in positions[:3])
+    assert game.num_rounds == 1
+    assert game.num_turns == len(moves)
+
+
+def test_trade():
+    game: SimGame = SimGame()
+    game.deal(DECK)
+    game.positions = [3, 2, 1, 0]
+    game.trade()
+    # the president gives its 2 lowest cards and takes the lowest card
+    # of the 2 highest ranks the asshole has cards of, not counting the
+    # cards it gave
+    assert game.cards[3] == cards_mask([9, 13] + list(range(42, 53)))
+    assert game.cards[0] == cards_mask(
+        list(range(1, 9)) + [10, 11, 12, 40, 41]
+    )
+    # same for the vice president and vice asshole; the vice president
+    # gave away 27 so gets 25 (of the same rank) instead
+    assert game.cards[2] == cards_mask([25] + list(range(28, 40)))
+    assert game.cards[1] == cards_mask(list(range(14, 25)) + [26, 27])
+    assert sum(bin(cards).count("1") for cards in game.cards) == 52
+
+
+def test_run():
+    for policies in [
+        [MinPolicy() for _ in range(4)],
+        [RandomPolicy(seed) for seed in range(4)],
+    ]:
+        game: SimGame = SimGame(policies, seed=0)
+        game.run(50)
+        assert game.num_rounds == 50
+        assert sorted(game.positions) == [0, 1, 2, 3]
+
+
+def test_seed():
+    games = [SimGame(seed=0) for _ in range(2)]
+    for game in games:
+        game.run(10)
+    assert games[0].cards == games[1].cards
+    assert games[0].num_turns == games[1].num_turns
+
+
+def test_policy_interface():
+    with pytest.raises(TypeError):
+        Policy()
+
+    class PlayOnly(Policy):
+        def play(self, game, spot):
+            return 0
+
+    # every move must be implemented
+    with pytest.raises(TypeError):
+        PlayOnly()
@@ -0,0 +1,94 @@
+from ..utils.timing_wheel import (
+    NUM_SLOTS,
+    TimingWheel,
+    get_timing_wheel,
+    wheel_after,
+)
+import asyncio
+
+
+def test_timer():
+    async def run():
+        loop = asyncio.get_running_loop()
+        wheel = TimingWheel(loop, resolution=0.001)
+        fired = list()
+        wheel.timer(0.02, fired.append, 2)
+        wheel.timer(0.01, fired.append, 1)
+        cancelled = wheel.timer(0.005, fired.append, 0)
+        assert len(wheel) == 3
+        cancelled.cancel()
+        cancelled.cancel()
+        assert len(wheel) == 2
+        start = loop.time()
+        await asyncio.sleep(0.05)
+        assert fired == [1, 2]
+        assert not len(wheel)
+
+        # coroutine functions are run as tasks
+        async def append(value):
+            fired.append(value)
+
+        wheel.timer(0.01, append, 3)
+        await asyncio.sleep(0.03)
+        assert fired == [1, 2, 3]
+        assert loop.time() - start >= 0.03
+
+    asyncio.run(run())
+
+
+def test_cascade():
+    async def run():
+        loop = asyncio.get_running_loop()
+        wheel = TimingWheel(loop, resolution=0.0001)
+        fired = list()
+        # past the first level so it must be cascaded down
+        seconds = NUM_SLOTS * 2.5 * 0.0001
+        timer = wheel.timer(seconds, lambda: fired.append(loop.time()))
+        start = loop.time()
+        await asyncio.sleep(seconds + 0.05)
+        assert not timer.scheduled
+        assert len(fired) == 1 and fired[0] - start >= seconds - 0.001
+
+    asyncio.run(run())
+
+
+def test_pause_resume():
+    async def run():
+        loop = asyncio.get_running_loop()
+        wheel = TimingWheel(loop, resolution=0.001)
+        fired = list()
+        timer = wheel.timer(0.04, fired.append, 0)
+        await asyncio.sleep(0.01)
+        timer.pause()
+        assert timer.paused and not timer.scheduled
+        remaining = timer.remaining()
+        assert 0.02 < remaining <= 0.03
+        await asyncio.sleep(0.05)
+        assert not fired and timer.remaining() == remaining
+        timer.resume()
+        assert timer.scheduled
+        await asyncio.sleep(0.05)
+        assert fired == [0]
+        assert timer.remaining() == 0
+
+        # cancelling a paused timer drops it
+        timer = wheel.timer(0.01, fired.append, 1)
+        timer.pause()
+        timer.cancel()
+        timer.resume()
+        await asyncio.sleep(0.03)
+        assert fired == [0]
+
+    asyncio.run(run())
+
+
+def test_wheel_after():
+    async def run():
+        fired = list()
+        wheel_after(0.01, fired.append, 0)
+        wheel_after(0.01, fired.append, 1)
+        assert len(get_timing_wheel()) == 2
+        await asyncio.sleep(0.05)
+        assert fired == [0, 1]
+
+    asyncio.run(run())
@@ -1,2 +1,15 @@
+from .actor import Actor, ActorClosedError
+from .direct_agent import DirectAgent
 from .game import GAME_ACTION_DICT
-from .misc import spawn_after, NoopTimer, get_redis
+from .misc import (
+    spawn_after,
+    NoopTimer,
+    get_redis,
+    players_room,
+)
+from .timing_wheel import (
+    TimingWheel,
+    WheelTimer,
+    get_timing_wheel,
+    wheel_after,
+)
@@ -0,0 +1,224 @@
+"""
+Actors serialize the work on some state, e.g. a game, through a bounded
+mailbox drained by a single task; see Actor.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+MAILBOX_SIZE = 256
+# most messages handled per drain, i.e. between flushes
+MAX_BATCH = 64
+
+logger = logging.getLogger(__name__)
+
+# function, args, kwargs and the future for its result (None if no
+# result is waited for)
+Message = Tuple[Callable, tuple, Dict[str, Any], Optional[asyncio.Future]]
+# a message waiting for room in a mailbox and the future its sender
+# waits on (None if the sender does not wait)
+Sender = Tuple[Message, Optional[asyncio.Future]]
+
+
+class Actor:
+    """
+    Bounded mailbox of synchronous functions drained by a single task,
+    so the functions run strictly in the order they were sent and never
+    interleave. Every drain handles all queued messages (up to
+    max_batch) and then awaits flush once, e.g. a game's handlers queue
+    events and the flush sends them, so a burst of card clicks is sent
+    as one batch.
+
+    Sending is ordered too: messages are put in the mailbox before the
+    sender's first await unless the mailbox is full, in which case the
+    sender waits (backpressure) behind any senders already waiting.
+
+    Closed actors stay closed: messages told to them are dropped and
+    asking them raises ActorClosedError.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[], Awaitable[None]],
+        *,
+        maxsize: int = MAILBOX_SIZE,
+        max_batch: int = MAX_BATCH,
+    ) -> None:
+        self._flush: Callable[[], Awaitable[None]] = flush
+        self._maxsize: int = maxsize
+        self._max_batch: int = max_batch
+        self._mailbox: Deque[Message] = deque()
+        # in the order they were sent
+        self._senders: Deque[Sender] = deque()
+        # set while the drain task waits for messages
+        self._wakeup: Optional[asyncio.Future] = None
+        # started on first use so actors can be made outside of a loop
+        self._task: Optional[asyncio.Task] = None
+        self._closed: bool = False
+        # metrics
+        self.num_handled: int = 0
+        self.num_drains: int = 0
+        self.max_depth: int = 0
+        self.service_time: float = 0  # total seconds spent draining
+        self.max_service_time: float = 0
+
+    def __len__(self) -> int:
+        """
+        Queue depth, i.e. the number of messages waiting to be handled
+        (including those waiting for room in the mailbox).
+        """
+        return len(self._mailbox) + len(self._senders)
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "depth": len(self),
+            "max_depth": self.max_depth,
+            "handled": self.num_handled,
+            "drains": self.num_drains,
+            "mean_service_time": self.service_time / self.num_drains
+            if self.num_drains
+            else 0,
+            "max_service_time": self.max_service_time,
+        }
+
+    async def ask(self, function: Callable, *args, **kwargs) -> Any:
+        """
+        Sends function to be called with args and kwargs; returns its
+        result (or raises its exception) once the drain handling it has
+        been flushed. Raises ActorClosedError if the actor is closed
+        before handling it.
+        """
+        if self._closed:
+            raise ActorClosedError("actor is closed")
+        future = asyncio.get_event_loop().create_future()
+        message = (function, args, kwargs, future)
+        if not self._put_nowait(message):
+            room = asyncio.get_event_loop().create_future()
+            self._senders.append((message, room))
+            try:
+                await room
+            except asyncio.CancelledError:
+                if (message, room) in self._senders:
+                    self._senders.remove((message, room))
+                raise
+        return await future
+
+    def tell(self, function: Callable, *args, **kwargs) -> None:
+        """
+        Sends function to be called with args and kwargs without waiting
+        for it, e.g. from timer callbacks; if the mailbox is full, the
+        message still waits for room behind any other senders. Dropped
+        if the actor is closed, e.g. a timer going off after its game was
+        removed.
+        """
+        if self._closed:
+            logger.debug(f"closed actor dropped {function!r}")
+            return
+        message = (function, args, kwargs, None)
+        if not self._put_nowait(message):
+            self._senders.append((message, None))
+
+    def close(self) -> None:
+        """
+        Stops draining for good; messages left in the mailbox are dropped
+        and their senders get ActorClosedError.
+        """
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        # senders waiting for room fail while waiting for it
+        _fail_closed(
+            [future for *_, future in self._mailbox]
+            + [room for _, room in self._senders]
+        )
+        self._mailbox.clear()
+        self._senders.clear()
+
+    def _put_nowait(self, message: Message) -> bool:
+        if self._task is None:
+            self._task = asyncio.get_event_loop().create_task(self._drain())
+        # senders waiting for room go first
+        if self._senders or len(self._mailbox) >= self._maxsize:
+            return False
+        self._mailbox.append(message)
+        self.max_depth = max(self.max_depth, len(self._mailbox))
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+        return True
+
+    def _make_room(self) -> None:
+        while self._senders and len(self._mailbox) < self._maxsize:
+            message, room = self._senders.popleft()
+            self._mailbox.append(message)
+            if room is not None and not room.done():
+                room.set_result(None)
+        self.max_depth = max(self.max_depth, len(self._mailbox))
+
+    async def _drain(self) -> None:
+        mailbox = self._mailbox
+        while True:
+            if not mailbox:
+                self._wakeup = asyncio.get_event_loop().create_future()
+                await self._wakeup
+                self._wakeup = None
+            messages: List[Message] = [
+                mailbox.popleft()
+                for _ in range(min(len(mailbox), self._max_batch))
+            ]
+            self._make_room()
+            start = perf_counter()
+            results: List[Tuple[Any, Optional[BaseException]]] = list()
+            for function, args, kwargs, _ in messages:
+                try:
+                    results.append((function(*args, **kwargs), None))
+                except Exception as e:
+                    results.append((None, e))
+            try:
+                await self._flush()
+            except asyncio.CancelledError:
+                # closed while flushing
+                _fail_closed([future for *_, future in messages])
+                raise
+            except Exception:
+                logger.exception("actor flush failed")
+            self.service_time += (service_time := perf_counter() - start)
+            self.max_service_time = max(self.max_service_time, service_time)
+            self.num_handled += len(messages)
+            self.num_drains += 1
+            for (*_, future), (result, exception) in zip(messages, results):
+                if future is None:
+                    if exception is not None:
+                        logger.error(
+                            "actor message failed", exc_info=exception
+                        )
+                # the sender may have been cancelled
+                elif not future.done():
+                    if exception is None:
+                        future.set_result(result)
+                    else:
+                        future.set_exception(exception)
+
+
+class ActorClosedError(RuntimeError):
+    pass
+
+
+def _fail_closed(futures: List[Optional[asyncio.Future]]) -> None:
+    for future in futures:
+        if future is not None and not future.done():
+            future.set_exception(ActorClosedError("actor is closed"))
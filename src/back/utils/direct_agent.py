@@ -0,0 +1,109 @@
+"""
+In-process stand-ins for faust agents, so services can call each other
+directly instead of through Kafka, e.g. the game server and game god in
+one process; see DirectAgent.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable, List, NamedTuple, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class DirectMessage(NamedTuple):
+    # direct agents have a single partition
+    partition: int = 0
+
+
+class DirectEvent(NamedTuple):
+    key: Any
+    value: Any
+    message: DirectMessage = DirectMessage()
+
+
+class DirectStream:
+    """
+    Stream of the values sent to a direct agent, as taken by one of its
+    instances; like a faust stream, current_event is the event of the
+    value being handled.
+    """
+
+    def __init__(self, queue: asyncio.Queue) -> None:
+        self._queue: asyncio.Queue = queue
+        self.current_event: Optional[DirectEvent] = None
+        # future for the reply to the value being handled (None if its
+        # sender does not wait for one)
+        self._future: Optional[asyncio.Future] = None
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self
+
+    async def __anext__(self) -> Any:
+        # values the agent did not yield for are replied to with None
+        self.reply(None)
+        event, self._future = await self._queue.get()
+        self.current_event = event
+        return event.value
+
+    def reply(self, result: Any) -> None:
+        future, self._future = self._future, None
+        # the sender may have been cancelled
+        if future is not None and not future.done():
+            future.set_result(result)
+
+
+class DirectAgent:
+    """
+    Runs a faust agent's function (agent.fun) on values sent in process
+    rather than through the agent's topic. ask and cast put values in a
+    FIFO queue, without awaiting, drained by concurrency instances of the
+    function, like the agent's instances drain its partitions; each
+    instance replies to an ask with what it yields while handling the
+    value. So values are taken in the order they were sent, as from a
+    partition, and the function's code is the same as with Kafka.
+    """
+
+    def __init__(self, fun: Callable, *, concurrency: int = 1) -> None:
+        self.fun: Callable = fun
+        self.concurrency: int = concurrency
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = list()
+
+    def __len__(self) -> int:
+        """
+        Number of values waiting to be taken.
+        """
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.ensure_future(self._run()) for _ in range(self.concurrency)
+        ]
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = list()
+
+    async def ask(self, value: Any = None, *, key: Any = None) -> Any:
+        future = asyncio.get_event_loop().create_future()
+        self._queue.put_nowait((DirectEvent(key, value), future))
+        return await future
+
+    async def cast(self, value: Any = None, *, key: Any = None) -> None:
+        self._queue.put_nowait((DirectEvent(key, value), None))
+
+    async def _run(self) -> None:
+        while True:
+            stream = DirectStream(self._queue)
+            try:
+                async for result in self.fun(stream):
+                    stream.reply(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # restarted like crashed agents are
+                logger.exception(f"direct agent {self.fun} crashed")
+            stream.reply(None)
@@ -22,7 +22,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
     package="",
     syntax="proto3",
     serialized_options=None,
-    serialized_pb=b'\n\x11game_action.proto\x1a\x1fgoogle/protobuf/timestamp.proto"z\n\nGameAction\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x0e\n\x06\x61\x63tion\x18\x02 \x01(\x0f\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0b\n\x03sid\x18\x04 \x01(\t\x12\x0f\n\x07user_id\x18\x05 \x01(\tb\x06proto3',
+    serialized_pb=b'\n\x11game_action.proto\x1a\x1fgoogle/protobuf/timestamp.proto"\x98\x01\n\nGameAction\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x0e\n\x06action\x18\x02 \x01(\x0f\x12-\n\ttimestamp\x18\x03 \x01(\x0b2\x1a.google.protobuf.Timestamp\x12\x0b\n\x03sid\x18\x04 \x01(\t\x12\x0f\n\x07user_id\x18\x05 \x01(\t\x12\x0f\n\x07actions\x18\x06 \x03(\x11\x12\x0b\n\x03seq\x18\x07 \x01(\rb\x06proto3',
     dependencies=[google_dot_protobuf_dot_timestamp__pb2.DESCRIPTOR],
 )
 
@@ -124,6 +124,42 @@ _GAMEACTION = _descriptor.Descriptor(
             serialized_options=None,
             file=DESCRIPTOR,
         ),
+        _descriptor.FieldDescriptor(
+            name="actions",
+            full_name="GameAction.actions",
+            index=5,
+            number=6,
+            type=17,
+            cpp_type=1,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="seq",
+            full_name="GameAction.seq",
+            index=6,
+            number=7,
+            type=13,
+            cpp_type=3,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
     ],
     extensions=[],
     nested_types=[],
@@ -133,8 +169,8 @@ _GAMEACTION = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=54,
-    serialized_end=176,
+    serialized_start=55,
+    serialized_end=207,
 )
 
 _GAMEACTION.fields_by_name[
@@ -18,6 +18,13 @@ def spawn_after(seconds, function, *args, **kwargs):
     return create_task(task())
 
 
+def players_room(game_id: str) -> str:
+    """
+    Socket.IO room of a game's players' sids.
+    """
+    return f"{game_id}:players"
+
+
 class NoopTimer:
     """
     For games with no time limits.
@@ -0,0 +1,266 @@
+"""
+Hierarchical timing wheel: a single scheduler per event loop for game
+timers, instead of one sleeping task per timer (see spawn_after).
+
+Time is divided into ticks of resolution seconds. The wheel has
+NUM_LEVELS levels of NUM_SLOTS slots each; level k slots each span
+NUM_SLOTS ** k ticks. A timer is put in the slot of the lowest level
+whose range covers its deadline; when the lower levels wrap around, the
+next slot of the level above is cascaded down into them. Scheduling and
+cancelling are a dict insertion and deletion and the wheel only keeps a
+loop callback around (for the next tick) while it holds timers.
+"""
+
+import asyncio
+from inspect import isawaitable
+from math import ceil
+from typing import Any, Callable, Dict, List, Optional, Set
+from weakref import WeakKeyDictionary
+
+
+RESOLUTION = 0.01  # seconds per tick
+SLOT_BITS = 8
+NUM_SLOTS = 1 << SLOT_BITS
+SLOT_MASK = NUM_SLOTS - 1
+# 2 ** 32 ticks, i.e. over a year at the default resolution; timers
+# further away than that just go around the top level again
+NUM_LEVELS = 4
+
+
+class WheelTimer:
+    """
+    Handle of a timer scheduled on a TimingWheel; supports cancel (like
+    the task spawn_after returns) as well as remaining, pause and
+    resume.
+    """
+
+    __slots__ = (
+        "_wheel",
+        "_function",
+        "_args",
+        "_kwargs",
+        "_deadline",
+        "_tick",
+        "_slot",
+        "_remaining",
+    )
+
+    def __init__(
+        self,
+        wheel: "TimingWheel",
+        function: Callable,
+        args: tuple,
+        kwargs: Dict[str, Any],
+    ) -> None:
+        self._wheel: TimingWheel = wheel
+        # None once the timer has fired or been cancelled
+        self._function: Optional[Callable] = function
+        self._args: tuple = args
+        self._kwargs: Dict[str, Any] = kwargs
+        self._deadline: float = 0  # in loop time
+        self._tick: int = 0
+        # the wheel slot the timer is in; None unless scheduled
+        self._slot: Optional[Dict[WheelTimer, None]] = None
+        # the time remaining when paused; None unless paused
+        self._remaining: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"WheelTimer({self._function}, remaining={self.remaining()})"
+
+    @property
+    def scheduled(self) -> bool:
+        return self._slot is not None
+
+    @property
+    def paused(self) -> bool:
+        return self._remaining is not None
+
+    def cancel(self) -> None:
+        """
+        Cancelling a timer that has fired or been cancelled does nothing.
+        """
+        self._wheel._remove(self)
+        self._function = None
+        self._remaining = None
+
+    def remaining(self) -> float:
+        """
+        Seconds until the timer fires (as of pausing, if paused); 0 once
+        it has fired or been cancelled.
+        """
+        if self._slot is not None:
+            return max(0.0, self._deadline - self._wheel.time())
+        if self._remaining is not None:
+            return self._remaining
+        return 0.0
+
+    def pause(self) -> None:
+        if self._slot is None:
+            return
+        self._remaining = self.remaining()
+        self._wheel._remove(self)
+
+    def resume(self) -> None:
+        if self._remaining is None:
+            return
+        remaining, self._remaining = self._remaining, None
+        self._wheel._add(self, remaining)
+
+    def _fire(self) -> None:
+        function, self._function = self._function, None
+        result = function(*self._args, **self._kwargs)
+        # coroutine functions are run as tasks, like with spawn_after
+        if isawaitable(result):
+            self._wheel._spawn(result)
+
+
+class TimingWheel:
+    """
+    Schedules WheelTimers on loop; use get_timing_wheel to share one
+    wheel per loop and timer (or wheel_after) to schedule.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop = None,
+        resolution: float = RESOLUTION,
+    ) -> None:
+        self._loop: asyncio.AbstractEventLoop = (
+            loop or asyncio.get_event_loop()
+        )
+        self._resolution: float = resolution
+        self._start: float = self._loop.time()
+        self._tick: int = 0  # the last tick processed
+        self._levels: List[List[Dict[WheelTimer, None]]] = [
+            [dict() for _ in range(NUM_SLOTS)] for _ in range(NUM_LEVELS)
+        ]
+        self._len: int = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        # tasks running timers' coroutines, referenced until done
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def time(self) -> float:
+        return self._loop.time()
+
+    def timer(self, seconds: float, function: Callable, *args, **kwargs):
+        """
+        Calls function with args and kwargs after seconds, rounded up to
+        the wheel's resolution; if it is a coroutine function, the
+        coroutine is run as a task. Returns the timer's handle.
+        """
+        timer = WheelTimer(self, function, args, kwargs)
+        self._add(timer, seconds)
+        return timer
+
+    def _add(self, timer: WheelTimer, seconds: float) -> None:
+        now = self.time()
+        if not self._len:
+            # nothing is scheduled so the wheel can skip to the present
+            self._tick = max(self._tick, self._tick_at(now))
+        timer._deadline = now + seconds
+        timer._tick = max(
+            ceil((timer._deadline - self._start) / self._resolution),
+            self._tick + 1,
+        )
+        self._place(timer)
+        self._len += 1
+        if self._handle is None:
+            self._schedule()
+
+    def _remove(self, timer: WheelTimer) -> None:
+        if timer._slot is None:
+            return
+        del timer._slot[timer]
+        timer._slot = None
+        self._len -= 1
+
+    def _place(self, timer: WheelTimer) -> None:
+        delta = timer._tick - self._tick
+        level = 0
+        while level < NUM_LEVELS - 1 and delta >> (SLOT_BITS * (level + 1)):
+            level += 1
+        slot = self._levels[level][
+            (timer._tick >> (SLOT_BITS * level)) & SLOT_MASK
+        ]
+        slot[timer] = None
+        timer._slot = slot
+
+    def _tick_at(self, time: float) -> int:
+        # the epsilon keeps a callback scheduled at a tick's time from
+        # landing just short of it
+        return int((time - self._start) / self._resolution + 1e-9)
+
+    def _schedule(self) -> None:
+        self._handle = self._loop.call_at(
+            self._start + (self._tick + 1) * self._resolution, self._run
+        )
+
+    def _run(self) -> None:
+        self._handle = None
+        tick = self._tick_at(self.time())
+        while self._len and self._tick < tick:
+            self._advance()
+        if self._len:
+            self._schedule()
+
+    def _advance(self) -> None:
+        self._tick = tick = self._tick + 1
+        # cascade the slots of the levels whose lower levels wrapped
+        level = 1
+        while (
+            level < NUM_LEVELS
+            and not (tick >> (SLOT_BITS * (level - 1))) & SLOT_MASK
+        ):
+            slot_index = (tick >> (SLOT_BITS * level)) & SLOT_MASK
+            slot = self._levels[level][slot_index]
+            if slot:
+                self._levels[level][slot_index] = dict()
+                for timer in slot:
+                    self._place(timer)
+            level += 1
+        due = self._levels[0][tick & SLOT_MASK]
+        # timers firing can cancel others that are due
+        for timer in list(due):
+            if timer._slot is not due:
+                continue
+            self._remove(timer)
+            try:
+                timer._fire()
+            except Exception as e:
+                self._loop.call_exception_handler(
+                    {
+                        "message": "exception in timing wheel timer",
+                        "exception": e,
+                    }
+                )
+
+    def _spawn(self, coroutine) -> None:
+        task = self._loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# one timing wheel per event loop
+_timing_wheels: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def get_timing_wheel(loop: asyncio.AbstractEventLoop = None) -> TimingWheel:
+    """
+    The timing wheel of loop (by default, the current one).
+    """
+    loop = loop or asyncio.get_event_loop()
+    if (timing_wheel := _timing_wheels.get(loop)) is None:
+        timing_wheel = _timing_wheels[loop] = TimingWheel(loop)
+    return timing_wheel
+
+
+def wheel_after(seconds: float, function: Callable, *args, **kwargs):
+    """
+    Like spawn_after, i.e. can be passed as a Game's timer, but
+    schedules on the current loop's timing wheel and returns a
+    WheelTimer.
+    """
+    return get_timing_wheel().timer(seconds, function, *args, **kwargs)
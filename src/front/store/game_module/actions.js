@@ -1,6 +1,8 @@
 export default {
   emit_game_action (context, payload) {
-    context.state.socket.emit('game_action', payload)
+    // not waiting for a reply; acked by seq, see the ack mutation
+    context.commit('increment_seq')
+    context.state.socket.emit('game_action', {...payload, seq: context.state.seq})
   },
 
   disconnect_socket (context, payload) {
@@ -1,6 +1,32 @@
 // TODO: remove all array hacks after Vue 3 releases
 
+function set_timer(state, which, spot, time, running) {
+  switch (which) {
+    case "turn":
+      state.turn_times.splice(spot, 1, time);
+      state.turn_time_states.splice(spot, 1, running);
+      break;
+    case "reserve":
+      state.reserve_times.splice(spot, 1, time);
+      state.reserve_time_states.splice(spot, 1, running);
+      break;
+    case "trading":
+      // using reserve time var for trading time and just changing
+      // UI icon
+      for (let spot = 0; spot < 4; spot += 1) {
+        state.reserve_times.splice(spot, 1, time);
+        state.reserve_time_states.splice(spot, 1, running);
+      }
+      break;
+  }
+}
+
 export default {
+  ack(state, payload) {
+    // failed actions are also alerted
+    state.acked_seq = Math.max(state.acked_seq, payload.seq);
+  },
+
   add_card(state, payload) {
     state.cards.set(payload.card, false);
     state.cards_arr.push(payload.card);
@@ -39,6 +65,10 @@ export default {
     state.hand_just_played_count += 1
   },
 
+  increment_seq(state) {
+    state.seq += 1;
+  },
+
   message(state, payload) {
     state.messages.push(payload.message)
     if (state.messages.length > 20) {
@@ -94,6 +124,13 @@ export default {
     state.cards_remaining.splice(payload.spot, 1, payload.cards_remaining);
   },
   
+  // the timer is running until deadline (ms since the epoch); counted
+  // down locally
+  set_deadline(state, payload) {
+    const time = Math.max(0, payload.deadline - Date.now());
+    set_timer(state, payload.which, payload.spot, time, true);
+  },
+
   set_dot_color(state, payload) {
     state.dot_colors.splice(payload.spot, 1, payload.dot_color);
   },
@@ -153,31 +190,9 @@ export default {
     state.takes = payload.takes;
   },
 
+  // the timer is stopped with time (ms) remaining
   set_time(state, payload) {
-    var time
-    if (payload.timestamp) {
-      time = Math.max(0, payload.time - (Date.now() / 1000 - payload.timestamp)) || 0
-    } else {
-      time = payload.time || 0
-    }
-    switch (payload.which) {
-      case "turn":
-        state.turn_times.splice(payload.spot, 1, time);
-        state.turn_time_states.splice(payload.spot, 1, payload.start);
-        break;
-      case "reserve":
-        state.reserve_times.splice(payload.spot, 1, time);
-        state.reserve_time_states.splice(payload.spot, 1, payload.start);
-        break;
-      case "trading":
-        // using reserve time var for trading time and just changing
-        // UI icon
-        for (let spot = 0; spot < 4; spot += 1) {
-          state.reserve_times.splice(spot, 1, time);
-          state.reserve_time_states.splice(spot, 1, payload.start);
-        }
-        break;
-    }
+    set_timer(state, payload.which, payload.spot, payload.time || 0, false);
   },
 
   set_trading(state, payload) {
@@ -192,24 +207,6 @@ export default {
     state.unlocked = payload.unlocked;
   },
 
-  set_timer_state(state, payload) {
-    switch (payload.which) {
-      case "turn":
-        state.turn_time_states.splice(payload.spot, 1, payload.state);
-        break;
-      case "reserve":
-        state.reserve_time_states.splice(payload.spot, 1, payload.state);
-        break;
-      case "trading":
-        // using reserve time var for trading time and just changing
-        // UI icon
-        for (let spot = 0; spot < 4; spot += 1) {
-          state.reserve_time_states.splice(spot, 1, payload.state);
-        }
-        break;
-    }
-  },
-
   update_current_hand_str(state, payload) {
     state.current_hand_str = payload.str;
   }
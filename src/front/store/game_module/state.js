@@ -46,5 +46,9 @@ export default _ => {
     paused: false,
     hand_just_played: false,
     hand_just_played_count: 0,
+    // sequence number of the last game action sent and of the last one
+    // acked; actions are acked with their events
+    seq: 0,
+    acked_seq: 0,
   };
 };
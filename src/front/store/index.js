@@ -1,7 +1,7 @@
 import Vue from "vue";
 import Vuex from "vuex";
 import router from '../router'
-import { create_game_module, EVENTS } from '../utils'
+import { create_game_module, decode_batch, EVENTS } from '../utils'
 import axios from 'axios'
 import io from 'socket.io-client'
 
@@ -71,6 +71,15 @@ export default new Vuex.Store({
               commit(`${namespace}/${event}`, payload)
             })
           })
+          // the events of a game action are sent together, in order, as
+          // one binary batch
+          socket.on('batch', data => {
+            decode_batch(data).forEach(([event, payload]) => {
+              if (EVENTS.includes(event)) {
+                commit(`${namespace}/${event}`, payload)
+              }
+            })
+          })
 
           if (!payload.testing) {
             router.push({ name: 'presidents', params: { game_id } })
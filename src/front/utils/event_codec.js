@@ -0,0 +1,157 @@
+// decodes the binary event batches the game server sends; mirrors
+// back/game/event_codec.py, whose docstring describes the layout
+
+const VERSION = 1;
+const TIMERS = ["turn", "reserve", "trading"];
+const HAND_DESCS = {
+  0: "empty hand",
+  11: "single",
+  20: "invalid hand (2)",
+  21: "double",
+  30: "invalid hand (3)",
+  31: "triple",
+  40: "invalid hand (4)",
+  50: "invalid hand (5)",
+  51: "fullhouse",
+  52: "straight",
+  53: "bomb",
+};
+
+// in the order of their codes
+const EVENT_FIELDS = [
+  ["add_card", [["card", "uint8"]]],
+  ["remove_card", [["card", "uint8"]]],
+  ["select_card", [["card", "uint8"]]],
+  ["deselect_card", [["card", "uint8"]]],
+  ["clear_cards", []],
+  ["update_current_hand_str", [["str", "string"]]],
+  ["store_hand", [["id", "hand_id"], ["cards", "cards"], ["id_desc", "hand_desc"]]],
+  ["select_hand", [["id", "hand_id"]]],
+  ["deselect_hand", [["id", "hand_id"]]],
+  ["set_spot", [["spot", "uint8"]]],
+  ["set_names", [["names", "strings"]]],
+  ["set_dot_color", [["spot", "uint8"], ["dot_color", "string"]]],
+  ["set_cards_remaining", [["spot", "uint8"], ["cards_remaining", "uint8"]]],
+  ["set_hand_in_play", [["hand_in_play", "cards"], ["hand_in_play_desc", "hand_desc"]]],
+  ["clear_hand_in_play", []],
+  ["set_on_turn", [["on_turn", "bool"]]],
+  ["set_unlocked", [["unlocked", "bool"]]],
+  ["set_pass_unlocked", [["pass_unlocked", "bool"]]],
+  ["set_paused", [["paused", "bool"]]],
+  ["set_trading", [["trading", "bool"]]],
+  ["set_asker", [["asker", "bool"]]],
+  ["set_giver", [["giver", "bool"]]],
+  ["set_takes", [["takes", "uint8"]]],
+  ["set_gives", [["gives", "uint8"]]],
+  ["set_giving_options", [["options", "cards"], ["highlight", "bool"]]],
+  ["set_asking_option", [["old_rank", "rank"], ["new_rank", "rank"]]],
+  ["set_time", [["which", "which"], ["spot", "spot?"], ["time", "float"]]],
+  ["set_deadline", [["which", "which"], ["spot", "spot?"], ["deadline", "float"]]],
+  ["message", [["message", "string"]]],
+  ["alert", [["alert", "string"]]],
+  ["ack", [["seq", "uint32"], ["result", "uint32"]]],
+  ["remove_hand", [["id", "hand_id"]]],
+];
+
+const STRING_KINDS = ["string", "strings"];
+const decoder = new TextDecoder();
+
+function mask_cards(low, high) {
+  // cards of a card mask given as its low and high 32 bits, ascending
+  const cards = [];
+  for (let bit = 0; bit < 32; bit++) {
+    if ((low >>> bit) & 1) cards.push(bit + 1);
+  }
+  for (let bit = 0; bit < 20; bit++) {
+    if ((high >>> bit) & 1) cards.push(bit + 33);
+  }
+  return cards;
+}
+
+// returns the [event, payload] pairs of a batch, in order
+function decode_batch(buffer) {
+  const view = new DataView(buffer);
+  const version = view.byteLength ? view.getUint8(0) : null;
+  if (version !== VERSION) {
+    throw new Error(`cannot read event batch of version ${version}`);
+  }
+  const events = [];
+  let offset = 1;
+
+  function read_string() {
+    const length = view.getUint16(offset, true);
+    offset += 2;
+    const string = decoder.decode(new Uint8Array(buffer, offset, length));
+    offset += length;
+    return string;
+  }
+
+  while (offset < view.byteLength) {
+    const [event, fields] = EVENT_FIELDS[view.getUint8(offset)];
+    offset += 1;
+    const payload = {};
+    fields.filter(([, kind]) => !STRING_KINDS.includes(kind)).forEach(([key, kind]) => {
+      switch (kind) {
+        case "uint8":
+          payload[key] = view.getUint8(offset);
+          offset += 1;
+          break;
+        case "uint32":
+          payload[key] = view.getUint32(offset, true);
+          offset += 4;
+          break;
+        case "bool":
+          payload[key] = view.getUint8(offset) !== 0;
+          offset += 1;
+          break;
+        case "float":
+          payload[key] = view.getFloat64(offset, true);
+          offset += 8;
+          break;
+        case "hand_id":
+          payload[key] = view.getUint32(offset, true);
+          offset += 4;
+          break;
+        case "cards":
+          payload[key] = mask_cards(
+            view.getUint32(offset, true), view.getUint32(offset + 4, true)
+          );
+          offset += 8;
+          break;
+        case "hand_desc":
+          payload[key] = HAND_DESCS[view.getUint8(offset)];
+          offset += 1;
+          break;
+        case "which":
+          payload[key] = TIMERS[view.getUint8(offset)];
+          offset += 1;
+          break;
+        case "spot?": {
+          const spot = view.getInt8(offset);
+          if (spot !== -1) payload[key] = spot;
+          offset += 1;
+          break;
+        }
+        case "rank": {
+          const rank = view.getInt8(offset);
+          payload[key] = rank === -1 ? null : rank;
+          offset += 1;
+          break;
+        }
+      }
+    });
+    fields.filter(([, kind]) => STRING_KINDS.includes(kind)).forEach(([key, kind]) => {
+      if (kind === "string") {
+        payload[key] = read_string();
+      } else {
+        const count = view.getUint8(offset);
+        offset += 1;
+        payload[key] = Array.from({ length: count }, read_string);
+      }
+    });
+    events.push([event, payload]);
+  }
+  return events;
+}
+
+export { decode_batch };
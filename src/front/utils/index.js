@@ -2,6 +2,7 @@ import state from "../store/game_module/state";
 import mutations from "../store/game_module/mutations";
 import getters from "../store/game_module/getters";
 import actions from "../store/game_module/actions";
+import { decode_batch } from "./event_codec";
 
 
 function create_game_module() {
@@ -16,6 +17,7 @@ function create_game_module() {
 }
 
 const EVENTS = [
+  "ack",
   "add_card",
   "alert",
   "clear_cards",
@@ -29,6 +31,7 @@ const EVENTS = [
   "set_asker",
   "set_asking_option",
   "set_cards_remaining",
+  "set_deadline",
   "set_dot_color",
   "set_giver",
   "set_gives",
@@ -42,11 +45,10 @@ const EVENTS = [
   "set_spot",
   "set_takes",
   "set_time",
-  "set_timer_state",
   "set_trading",
   "set_unlocked",
   "update_alert_str",
   "update_current_hand_str",
 ];
 
-export { create_game_module, EVENTS };
+export { create_game_module, decode_batch, EVENTS };